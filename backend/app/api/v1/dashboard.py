@@ -0,0 +1,95 @@
+"""
+ダッシュボード関連のAPIエンドポイント
+工程表の作成時に更新される集計からステータス別のプロジェクト数を返す
+"""
+
+import logging
+from typing import Any
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.config import settings
+from app.database import get_supabase_service
+from app.services.supabase_service import SupabaseService
+from app.utils.responses import FastJSONResponse
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/api/v1/dashboard", tags=["dashboard"])
+
+# プロジェクトのステータス → 集計のキー
+STATUS_KEYS = {
+    "未着手": "not_started",
+    "進行中": "in_progress",
+    "完了": "completed",
+    "遅延": "delayed",
+}
+
+
+@router.get("/", response_model=dict[str, Any])
+async def get_dashboard(
+    service: SupabaseService = Depends(get_supabase_service),
+) -> FastJSONResponse:
+    """
+    ダッシュボードの集計を取得
+
+    Args:
+        service: データベースサービス（依存性注入）
+
+    Returns:
+        stats: 全プロジェクト数とステータス別のプロジェクト数
+        recent_projects: 最近のプロジェクト（ステータス・工程アイテム数付き）
+    """
+    try:
+        summary = await service.get_dashboard_summary(
+            settings.dashboard_recent_projects
+        )
+
+    except Exception as e:
+        logger.error(f"Error fetching dashboard: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error") from e
+
+    status_counts: dict[str, int] = summary["status_counts"]
+    stats = {"total": sum(status_counts.values())}
+    stats.update(
+        {key: status_counts.get(status, 0) for status, key in STATUS_KEYS.items()}
+    )
+
+    return FastJSONResponse(
+        {"stats": stats, "recent_projects": summary["recent_projects"]}
+    )
+
+
+@router.get("/projects/{project_id}", response_model=dict[str, Any])
+async def get_project_status(
+    project_id: UUID, service: SupabaseService = Depends(get_supabase_service)
+) -> FastJSONResponse:
+    """
+    プロジェクトの進捗集計を取得
+
+    Args:
+        project_id: プロジェクトID（UUID）
+        service: データベースサービス（依存性注入）
+
+    Returns:
+        ステータスと最新工程表のステータス別工程アイテム数
+
+    Raises:
+        HTTPException: プロジェクトが見つからない場合は404
+    """
+    try:
+        # キャッシュのキーは無効化時と同じ小文字の文字列にする
+        project_status = await service.get_project_status(str(project_id))
+
+        if not project_status:
+            raise HTTPException(
+                status_code=404, detail=f"Project {project_id} not found"
+            )
+
+        return FastJSONResponse(project_status)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching project status: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error") from e
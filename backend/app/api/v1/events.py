@@ -0,0 +1,140 @@
+"""
+変更通知のAPIエンドポイント
+工程表の作成をServer-Sent Eventsで配信し、クライアントのポーリングを置き換える
+"""
+
+import asyncio
+import json
+import logging
+from collections.abc import AsyncIterator
+from typing import Any
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+
+from app.config import settings
+from app.database import get_supabase_service
+from app.services.event_broker import ChangeEvent, EventBroker
+from app.services.supabase_service import SupabaseService
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/api/v1/events", tags=["events"])
+
+# プロキシによるバッファリング・キャッシュを無効化する
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def format_event(event: ChangeEvent) -> str:
+    """イベントをSSEのフレームに変換"""
+    data = json.dumps(
+        {"project_id": event.project_id, **event.data}, ensure_ascii=False
+    )
+    return f"id: {event.id}\nevent: {event.type}\ndata: {data}\n\n"
+
+
+async def stream_events(
+    broker: EventBroker, project_id: str | None
+) -> AsyncIterator[str]:
+    """
+    購読したイベントをSSEのフレームとして送信
+
+    イベントがない間は一定間隔でハートビート（コメント行）を送信する。
+    配信対象から外された場合は dropped イベントを送信して終了する
+    （クライアントは再接続して最新の工程表を取得し直す）
+
+    Args:
+        broker: イベント配信
+        project_id: 購読するプロジェクトID（Noneの場合は全プロジェクト）
+    """
+    subscription = broker.subscribe(project_id)
+    try:
+        # 接続直後にクライアントへ応答を返す
+        yield ": connected\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    subscription.get(), settings.events_heartbeat_interval
+                )
+            except TimeoutError:
+                yield ": heartbeat\n\n"
+                continue
+
+            if event is None:
+                if subscription.dropped:
+                    yield "event: dropped\ndata: {}\n\n"
+                return
+            yield format_event(event)
+    finally:
+        broker.unsubscribe(subscription)
+
+
+@router.get("/stats")
+async def get_event_stats(
+    service: SupabaseService = Depends(get_supabase_service),
+) -> dict[str, Any]:
+    """
+    変更通知の統計情報
+
+    Args:
+        service: データベースサービス（依存性注入）
+
+    Returns:
+        購読者数・種別ごとの発行数・配信数・配信対象から外した購読者数
+    """
+    return service.events.stats()
+
+
+@router.get("/")
+async def stream_all_events(
+    service: SupabaseService = Depends(get_supabase_service),
+) -> StreamingResponse:
+    """
+    全プロジェクトの変更通知を購読（Server-Sent Events）
+
+    Args:
+        service: データベースサービス（依存性注入）
+
+    Returns:
+        text/event-stream（schedule_created イベント・ハートビート）
+    """
+    return StreamingResponse(
+        stream_events(service.events, None),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
+@router.get("/projects/{project_id}")
+async def stream_project_events(
+    project_id: UUID, service: SupabaseService = Depends(get_supabase_service)
+) -> StreamingResponse:
+    """
+    プロジェクトの変更通知を購読（Server-Sent Events）
+
+    Args:
+        project_id: プロジェクトID（UUID）
+        service: データベースサービス（依存性注入）
+
+    Returns:
+        text/event-stream（schedule_created イベント・ハートビート）
+
+    Raises:
+        HTTPException: プロジェクトが見つからない場合は404
+    """
+    # イベントのプロジェクトIDは小文字の文字列のため、表記を揃えて購読する
+    project_key = str(project_id)
+    try:
+        project = await service.get_project(project_key)
+    except Exception as e:
+        logger.error(f"Error fetching project: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error") from e
+
+    if not project:
+        raise HTTPException(status_code=404, detail=f"Project {project_id} not found")
+
+    return StreamingResponse(
+        stream_events(service.events, project_key),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
@@ -0,0 +1,138 @@
+"""
+メトリクスのエンドポイント
+リクエスト数・処理時間・キャッシュサイズなどをPrometheusのテキスト形式で公開する
+"""
+
+from typing import Any
+
+from fastapi import APIRouter, Depends, Response
+
+from app import database
+from app.api.v1.pdf import pdf_service, pdf_single_flight
+from app.services.loop_monitor import loop_monitor
+from app.services.metrics import Labels, registry
+from app.services.pdf_worker import pending_tasks
+from app.services.single_flight import SingleFlight
+from app.utils.auth import require_admin
+
+router = APIRouter(tags=["metrics"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _cache_entries() -> dict[Labels, float]:
+    """キャッシュごとの保持件数（PDFのレイアウトキャッシュを含む）"""
+    entries: dict[Labels, float] = {}
+    service = database.supabase_service
+    if service is not None:
+        for name, stats in service.cache_stats().items():
+            entries[(name,)] = stats["size"]
+    if pdf_service.layout_cache is not None:
+        entries[("pdf_layouts",)] = len(pdf_service.layout_cache)
+    return entries
+
+
+def _schedule_write_queue() -> dict[Labels, float]:
+    """書き込み待ちの工程表の数（書き込みのまとめが有効な場合のみ）"""
+    service = database.supabase_service
+    if service is None or service.write_batcher is None:
+        return {}
+    return {(): service.write_batcher.stats()["pending"]}
+
+
+def _schedule_write_batches() -> dict[Labels, float]:
+    """実行中の一括書き込みの数（書き込みのまとめが有効な場合のみ）"""
+    service = database.supabase_service
+    if service is None or service.write_batcher is None:
+        return {}
+    return {(): service.write_batcher.stats()["in_flight"]}
+
+
+def _single_flight_in_flight() -> dict[Labels, float]:
+    """実行中の集約された処理（読み込み・PDFのデータ取得と生成）の数"""
+    groups: list[SingleFlight] = [pdf_single_flight]
+    service = database.supabase_service
+    if service is not None:
+        groups.append(service.single_flight)
+    return {
+        (group.name, operation): stats["in_flight"]
+        for group in groups
+        for operation, stats in group.stats().items()
+    }
+
+
+def _pdf_worker_pending() -> dict[Labels, float]:
+    """PyMuPDF専用スレッドで実行中・実行待ちの処理の数"""
+    return {(): pending_tasks()}
+
+
+def _event_subscribers() -> dict[Labels, float]:
+    """工程表の変更通知の購読者数"""
+    service = database.supabase_service
+    if service is None:
+        return {}
+    return {(): service.events.stats()["subscribers"]}
+
+
+registry.gauge_callback(
+    "cache_entries", "Entries held by each read cache", ("cache",), _cache_entries
+)
+registry.gauge_callback(
+    "schedule_write_queue_depth",
+    "Schedule writes waiting for the next batch",
+    (),
+    _schedule_write_queue,
+)
+registry.gauge_callback(
+    "schedule_write_batches_in_flight",
+    "Schedule write batches being written",
+    (),
+    _schedule_write_batches,
+)
+registry.gauge_callback(
+    "single_flight_in_flight",
+    "Coalesced operations in progress",
+    ("group", "operation"),
+    _single_flight_in_flight,
+)
+registry.gauge_callback(
+    "pdf_worker_pending",
+    "PDF parse/render tasks running or queued on the PyMuPDF worker thread",
+    (),
+    _pdf_worker_pending,
+)
+registry.gauge_callback(
+    "event_subscribers",
+    "Server-Sent Events subscribers",
+    (),
+    _event_subscribers,
+)
+
+
+@router.get("/metrics", include_in_schema=False, dependencies=[Depends(require_admin)])
+async def get_metrics() -> Response:
+    """
+    メトリクスをPrometheusのテキスト形式で返す（管理者トークンが必要）
+
+    Returns:
+        http_requests_total・http_request_duration_seconds（ルートごと）、
+        pdf_stage_duration_seconds（処理段階ごと）、db_call_duration_seconds
+        （データベース呼び出しごと）と、キャッシュサイズ・書き込み待ち・実行中の処理のゲージ
+    """
+    return Response(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@router.get(
+    "/metrics/event-loop",
+    include_in_schema=False,
+    dependencies=[Depends(require_admin)],
+)
+async def get_event_loop_stats() -> dict[str, Any]:
+    """
+    イベントループの停止の集計を返す（スタックを含むため管理者トークンが必要）
+
+    Returns:
+        最大遅延・しきい値を超えた停止の回数・直近の停止のスタックと、
+        ルートごとのリクエスト数・処理中に観測した最大停止時間（routes）
+    """
+    return {**loop_monitor.stats(), "routes": loop_monitor.route_stats()}
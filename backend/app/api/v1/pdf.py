@@ -4,39 +4,127 @@ PDF関連のAPIエンドポイント
 """
 
 import logging
+from datetime import UTC, datetime, time
+from typing import Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, Response, UploadFile
-from supabase import Client
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Form,
+    HTTPException,
+    Request,
+    Response,
+    UploadFile,
+)
 
-from app.database import get_db
+from app.config import settings
+from app.database import get_supabase_service
 from app.schemas.pdf import (
     PDFGenerationError,
+    PDFPreflightError,
     PDFScheduleData,
     PDFUploadError,
     PDFUploadResponse,
     ProjectInfoForPDF,
     ProjectNotFoundError,
-    ScheduleItemForPDF,
     ScheduleNotFoundError,
+    ScheduleRow,
+    TableEngine,
 )
+from app.services.layout_cache import LayoutCache
+from app.services.metrics import StageTimer
 from app.services.pdf_service import PDFGenerationService
+from app.services.pdf_worker import run_pdf_task
+from app.services.single_flight import SingleFlight
+from app.services.supabase_service import SupabaseService
+from app.utils.conditional import (
+    is_not_modified,
+    not_modified_response,
+    strong_etag,
+    to_datetime,
+    validator_headers,
+)
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/v1/pdf", tags=["pdf"])
 
 # PDF生成サービス（シングルトン）
-pdf_service = PDFGenerationService()
+pdf_service = PDFGenerationService(
+    layout_cache=(
+        LayoutCache(
+            max_size=settings.pdf_layout_cache_size,
+            path=settings.pdf_layout_cache_path or None,
+            save_delay=settings.pdf_layout_cache_save_delay,
+        )
+        if settings.pdf_layout_cache_size > 0
+        else None
+    )
+)
+
+# 同じ工程表への同時エクスポートは、データ取得・PDF生成をそれぞれ1回にまとめる
+pdf_single_flight = SingleFlight("pdf")
+
+
+async def get_schedule_for_pdf(
+    schedule_id: UUID, service: SupabaseService
+) -> PDFScheduleData:
+    """
+    PDF生成用のスケジュールデータ取得（同じ工程表の同時取得は1回にまとめる）
+
+    Args:
+        schedule_id: 工程表ID
+        service: データベースサービス
+
+    Returns:
+        PDF生成用スケジュールデータ（呼び出し元間で共有されるため変更しないこと）
+
+    Raises:
+        ScheduleNotFoundError: スケジュールが見つからない場合
+    """
+    return await pdf_single_flight.do(
+        "get_schedule_for_pdf",
+        schedule_id,
+        lambda: _load_schedule_for_pdf(schedule_id, service),
+    )
+
+
+async def generate_pdf_bytes(schedule_data: PDFScheduleData) -> bytes:
+    """
+    工程表PDFを生成（同じ工程表の同時生成は1回にまとめる）
+
+    工程表は作成後に変更されないため、工程表IDをキーにする。
+    生成はPyMuPDF専用のスレッドで行い、その間もイベントループは他のリクエストを処理する
+
+    Args:
+        schedule_data: PDF生成用スケジュールデータ
+
+    Returns:
+        PDFバイトデータ
+
+    Raises:
+        PDFGenerationError: PDF生成に失敗した場合
+    """
 
+    async def generate() -> bytes:
+        return await run_pdf_task(pdf_service.generate_pdf_bytes, schedule_data)
 
-async def get_schedule_for_pdf(schedule_id: UUID, db: Client) -> PDFScheduleData:
+    return await pdf_single_flight.do(
+        "generate_pdf_bytes", schedule_data.schedule_id, generate
+    )
+
+
+async def _load_schedule_for_pdf(
+    schedule_id: UUID, service: SupabaseService
+) -> PDFScheduleData:
     """
     PDF生成用のスケジュールデータ取得
     戦略文書に基づく効率的なJOIN取得
 
     Args:
         schedule_id: 工程表ID
-        db: Supabaseクライアント
+        service: データベースサービス
 
     Returns:
         PDF生成用スケジュールデータ
@@ -45,42 +133,13 @@ async def get_schedule_for_pdf(schedule_id: UUID, db: Client) -> PDFScheduleData
         ScheduleNotFoundError: スケジュールが見つからない場合
     """
     try:
-        # Supabaseクエリ（JOINを使用した効率的なデータ取得）
-        result = (
-            db.table("project_schedules")
-            .select(
-                """
-                id,
-                version,
-                created_at,
-                projects!inner(
-                    project_number,
-                    project_name,
-                    construction_location,
-                    construction_company
-                ),
-                schedule_items!inner(
-                    process_name,
-                    planned_start_date,
-                    planned_end_date,
-                    actual_start_date,
-                    actual_end_date,
-                    assignee,
-                    status,
-                    remarks,
-                    order_index
-                )
-            """
-            )
-            .eq("id", str(schedule_id))
-            .execute()
-        )
+        # プロジェクト情報・工程アイテムを埋め込んだ1回のクエリで取得
+        schedule_record = await service.get_schedule_with_details(str(schedule_id))
 
-        if not result.data:
+        if not schedule_record:
             logger.warning(f"Schedule not found: {schedule_id}")
             raise ScheduleNotFoundError(f"Schedule {schedule_id} not found")
 
-        schedule_record = result.data[0]
         project_data = schedule_record["projects"]
         items_data = schedule_record["schedule_items"]
 
@@ -92,29 +151,18 @@ async def get_schedule_for_pdf(schedule_id: UUID, db: Client) -> PDFScheduleData
             construction_company=project_data.get("construction_company"),
         )
 
-        # order_indexでソート後にPydanticモデル作成
-        sorted_items_data = sorted(items_data, key=lambda x: x.get("order_index", 0))
-
-        schedule_items = [
-            ScheduleItemForPDF(
-                process_name=item["process_name"],
-                planned_start_date=item.get("planned_start_date"),
-                planned_end_date=item.get("planned_end_date"),
-                actual_start_date=item.get("actual_start_date"),
-                actual_end_date=item.get("actual_end_date"),
-                assignee=item.get("assignee"),
-                status=item.get("status", "未着手"),
-                remarks=item.get("remarks"),
-                order_index=item.get("order_index", 0),
+        # 行ごとのPydanticモデルではなく軽量な行型に変換し、order_indexでソート
+        with StageTimer("schedule_rows"):
+            schedule_items = sorted(
+                map(ScheduleRow.from_record, items_data), key=lambda x: x.order_index
             )
-            for item in sorted_items_data
-        ]
 
         pdf_data = PDFScheduleData(
             schedule_id=schedule_id,
             version=schedule_record["version"],
             project_info=project_info,
             schedule_items=schedule_items,
+            created_at=to_datetime(schedule_record.get("created_at")),
         )
 
         logger.info(
@@ -134,17 +182,71 @@ async def get_schedule_for_pdf(schedule_id: UUID, db: Client) -> PDFScheduleData
         ) from e
 
 
+def pdf_etag(schedule_data: PDFScheduleData) -> str:
+    """
+    PDFのETag（描画の入力から作成し、PDFを生成せずに判定できるようにする）
+
+    工程表・工程アイテムは作成後に変更されないため、工程表IDと
+    PDFに描画されるプロジェクト情報・作成日が同じであれば同じPDFになる
+
+    Args:
+        schedule_data: PDF生成用スケジュールデータ
+
+    Returns:
+        ETag
+    """
+    project_info = schedule_data.project_info
+    return strong_etag(
+        "pdf",
+        schedule_data.schedule_id,
+        project_info.project_number,
+        project_info.project_name,
+        project_info.construction_location,
+        project_info.construction_company,
+        schedule_data.created_date.date(),
+    )
+
+
+def pdf_last_modified(schedule_data: PDFScheduleData) -> datetime:
+    """
+    PDFの最終更新日時
+
+    PDFには作成日（日付）が描画されるため、工程表の作成日時と
+    作成日の開始時刻のうち新しい方を最終更新日時とする
+
+    Args:
+        schedule_data: PDF生成用スケジュールデータ
+
+    Returns:
+        最終更新日時（UTC）
+    """
+    render_day = datetime.combine(schedule_data.created_date.date(), time.min)
+    render_day_start = render_day.astimezone(UTC)
+    if schedule_data.created_at is None:
+        return render_day_start
+    return max(schedule_data.created_at, render_day_start)
+
+
+@router.get("/export-pdf/{schedule_id}")
 @router.post("/export-pdf/{schedule_id}")
-async def export_pdf(schedule_id: UUID, db: Client = Depends(get_db)) -> Response:
+async def export_pdf(
+    schedule_id: UUID,
+    request: Request,
+    service: SupabaseService = Depends(get_supabase_service),
+) -> Response:
     """
     工程表PDF生成・エクスポート
 
+    GETの場合は条件付きリクエストに対応し、If-None-Match / If-Modified-Since が
+    一致すればPDFを生成せずに本文なしの304を返す
+
     Args:
         schedule_id: 工程表ID（UUID）
-        db: Supabaseクライアント（依存性注入）
+        request: リクエスト（条件付きリクエストの判定用）
+        service: データベースサービス（依存性注入）
 
     Returns:
-        PDFファイル（application/pdf）
+        PDFファイル（application/pdf、変更がない場合は304）
 
     Raises:
         HTTPException:
@@ -155,13 +257,25 @@ async def export_pdf(schedule_id: UUID, db: Client = Depends(get_db)) -> Respons
         logger.info(f"PDF export request for schedule: {schedule_id}")
 
         # スケジュールデータ取得
-        schedule_data = await get_schedule_for_pdf(schedule_id, db)
+        schedule_data = await get_schedule_for_pdf(schedule_id, service)
+
+        # 変更がなければPDFを生成せずに304を返す
+        last_modified = pdf_last_modified(schedule_data)
+        headers = validator_headers(
+            pdf_etag(schedule_data),
+            last_modified,
+            settings.http_cache_control_pdf_export,
+        )
+        if is_not_modified(request, headers["ETag"], last_modified):
+            logger.info(f"PDF export not modified: {schedule_id}")
+            return not_modified_response(headers)
 
         # PDF生成（メモリ上で処理）
-        pdf_bytes = pdf_service.generate_pdf_bytes(schedule_data)
+        pdf_bytes = await generate_pdf_bytes(schedule_data)
 
         # ファイル名生成
         filename = pdf_service.generate_filename(schedule_data)
+        headers["Content-Disposition"] = f"attachment; filename={filename}"
 
         logger.info(f"PDF export completed: {filename}, Size: {len(pdf_bytes)} bytes")
 
@@ -169,7 +283,7 @@ async def export_pdf(schedule_id: UUID, db: Client = Depends(get_db)) -> Respons
         return Response(
             content=pdf_bytes,
             media_type="application/pdf",
-            headers={"Content-Disposition": f"attachment; filename={filename}"},
+            headers=headers,
         )
 
     except ScheduleNotFoundError as e:
@@ -209,11 +323,26 @@ async def pdf_service_health() -> dict[str, str]:
         raise HTTPException(status_code=503, detail="PDF service unavailable") from e
 
 
+@router.get("/single-flight-stats")
+async def get_single_flight_stats() -> dict[str, dict[str, Any]]:
+    """
+    PDFエクスポートの集約の統計情報
+
+    Returns:
+        処理（get_schedule_for_pdf / generate_pdf_bytes）ごとの
+        実行回数・共有された回数・実行中の数
+    """
+    return pdf_single_flight.stats()
+
+
 @router.post("/upload-pdf")
 async def upload_pdf(
     pdf: UploadFile = File(..., description="工程表PDFファイル"),
     project_id: UUID = Form(..., description="プロジェクトID"),
-    db: Client = Depends(get_db),
+    table_engine: TableEngine | None = Form(
+        None, description="表検出エンジン（未指定時は設定値）"
+    ),
+    service: SupabaseService = Depends(get_supabase_service),
 ) -> PDFUploadResponse:
     """
     PDF工程表のアップロード・解析・データベース保存
@@ -221,12 +350,14 @@ async def upload_pdf(
     Args:
         pdf: アップロードされたPDFファイル
         project_id: 対象プロジェクトのID
-        db: Supabaseクライアント（依存性注入）
+        table_engine: 表検出エンジン（find_tables / grid / auto）
+        service: データベースサービス（依存性注入）
 
     Returns:
         PDFUploadResponse: アップロード結果
 
     Raises:
+        PDFPreflightError: 事前検査で解析不可と判定された（400、理由コード付き）
         HTTPException:
             - 400: ファイル形式が不正、またはPDF解析に失敗
             - 404: プロジェクトが見つからない
@@ -254,7 +385,8 @@ async def upload_pdf(
 
         # PDFファイル読み込み
         try:
-            pdf_content = await pdf.read()
+            with StageTimer("upload_read"):
+                pdf_content = await pdf.read()
         except Exception as e:
             logger.error(f"Failed to read PDF file: {e}")
             raise HTTPException(
@@ -262,8 +394,14 @@ async def upload_pdf(
             ) from e
 
         # PDF解析・データベース保存
+        # エンジンが明示された場合はレイアウトキャッシュを使わず、指定のエンジンで検出する
+        engine = table_engine or TableEngine(settings.pdf_table_engine)
         schedule_data = await pdf_service.extract_schedule_from_pdf(
-            pdf_content, project_id, db
+            pdf_content,
+            project_id,
+            service,
+            engine,
+            use_layout_cache=table_engine is None,
         )
 
         # レスポンス作成
@@ -283,8 +421,8 @@ async def upload_pdf(
 
         return response
 
-    except HTTPException:
-        # HTTPExceptionはそのまま再発生
+    except (HTTPException, PDFPreflightError):
+        # HTTPException・事前検査エラーはそのまま再発生（事前検査エラーはmain.pyで処理）
         raise
 
     except ProjectNotFoundError as e:
@@ -5,43 +5,231 @@
 
 import logging
 from typing import Any
+from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
-from supabase import Client
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 
-from app.database import get_db
+from app.config import settings
+from app.database import get_supabase_service
+from app.repositories.base import PROJECT_COLUMNS
+from app.schemas.project import BatchLookupRequest
 from app.services.supabase_service import SupabaseService
+from app.utils.conditional import (
+    is_not_modified,
+    not_modified_response,
+    strong_etag,
+    to_datetime,
+    validator_headers,
+)
+from app.utils.pagination import (
+    CURSOR_COLUMNS,
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+)
+from app.utils.responses import FastJSONResponse
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/v1/projects", tags=["projects"])
 
 
-@router.get("/{project_id}")
-async def get_project(project_id: str, db: Client = Depends(get_db)) -> dict[str, Any]:
+@router.get("/cache-stats")
+async def get_cache_stats(
+    service: SupabaseService = Depends(get_supabase_service),
+) -> dict[str, dict[str, Any]]:
+    """
+    読み取りキャッシュの統計情報
+
+    Args:
+        service: データベースサービス（依存性注入）
+
+    Returns:
+        キャッシュ名ごとのヒット数・ミス数・ヒット率・サイズ、
+        一括取得のクエリ回数・共有されたID数、
+        同時読み込みの実行回数・共有された回数（single_flight.キャッシュ名）
+    """
+    return {
+        **service.cache_stats(),
+        **service.batch_stats(),
+        **{
+            f"single_flight.{operation}": stats
+            for operation, stats in service.single_flight_stats().items()
+        },
+    }
+
+
+@router.get("/batch", response_model=dict[str, dict[str, Any] | None])
+async def get_projects_batch(
+    ids: str, service: SupabaseService = Depends(get_supabase_service)
+) -> FastJSONResponse:
+    """
+    複数のプロジェクトをまとめて取得
+
+    Args:
+        ids: プロジェクトID（カンマ区切り）
+        service: データベースサービス（依存性注入）
+
+    Returns:
+        プロジェクトID→プロジェクト情報（存在しない場合はnull）
+    """
+    return FastJSONResponse(await _lookup_projects(_parse_ids(ids.split(",")), service))
+
+
+@router.post("/batch", response_model=dict[str, dict[str, Any] | None])
+async def post_projects_batch(
+    request: BatchLookupRequest,
+    service: SupabaseService = Depends(get_supabase_service),
+) -> FastJSONResponse:
+    """
+    複数のプロジェクトをまとめて取得（IDが多くURLに収まらない場合用）
+
+    Args:
+        request: プロジェクトIDの一覧
+        service: データベースサービス（依存性注入）
+
+    Returns:
+        プロジェクトID→プロジェクト情報（存在しない場合はnull）
+    """
+    return FastJSONResponse(await _lookup_projects(_parse_ids(request.ids), service))
+
+
+@router.get("/schedules/batch", response_model=dict[str, dict[str, Any] | None])
+async def get_schedules_batch(
+    ids: str, service: SupabaseService = Depends(get_supabase_service)
+) -> FastJSONResponse:
+    """
+    複数の工程表を工程アイテム付きでまとめて取得
+
+    Args:
+        ids: 工程表ID（カンマ区切り）
+        service: データベースサービス（依存性注入）
+
+    Returns:
+        工程表ID→工程表（items 付き、存在しない場合はnull）
+    """
+    return FastJSONResponse(
+        await _lookup_schedules(_parse_ids(ids.split(",")), service)
+    )
+
+
+@router.post("/schedules/batch", response_model=dict[str, dict[str, Any] | None])
+async def post_schedules_batch(
+    request: BatchLookupRequest,
+    service: SupabaseService = Depends(get_supabase_service),
+) -> FastJSONResponse:
+    """
+    複数の工程表を工程アイテム付きでまとめて取得（IDが多くURLに収まらない場合用）
+
+    Args:
+        request: 工程表IDの一覧
+        service: データベースサービス（依存性注入）
+
+    Returns:
+        工程表ID→工程表（items 付き、存在しない場合はnull）
+    """
+    return FastJSONResponse(await _lookup_schedules(_parse_ids(request.ids), service))
+
+
+def _parse_ids(values: list[str] | list[UUID]) -> list[str]:
+    """
+    一括取得のIDを検証して正規化した文字列のリストに変換
+
+    Args:
+        values: ID（文字列またはUUID）
+
+    Returns:
+        重複を除いたIDのリスト
+
+    Raises:
+        HTTPException: 不正なID・件数超過の場合は400
+    """
+    try:
+        ids = list(
+            dict.fromkeys(
+                str(value if isinstance(value, UUID) else UUID(value.strip()))
+                for value in values
+                if isinstance(value, UUID) or value.strip()
+            )
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail="Invalid id") from e
+
+    if not ids:
+        raise HTTPException(status_code=400, detail="ids is required")
+    if len(ids) > settings.batch_max_ids:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many ids (max {settings.batch_max_ids})",
+        )
+    return ids
+
+
+async def _lookup_projects(
+    project_ids: list[str], service: SupabaseService
+) -> dict[str, dict[str, Any] | None]:
+    try:
+        return await service.get_projects_by_ids(project_ids)
+    except Exception as e:
+        logger.error(f"Error fetching projects batch: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error") from e
+
+
+async def _lookup_schedules(
+    schedule_ids: list[str], service: SupabaseService
+) -> dict[str, dict[str, Any] | None]:
+    try:
+        return await service.get_schedules_by_ids(schedule_ids)
+    except Exception as e:
+        logger.error(f"Error fetching schedules batch: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error") from e
+
+
+@router.get("/{project_id}", response_model=dict[str, Any])
+async def get_project(
+    project_id: UUID,
+    request: Request,
+    service: SupabaseService = Depends(get_supabase_service),
+) -> Response:
     """
     プロジェクト情報を取得
 
+    ETagは行のバージョン（id・updated_at）から作成し、
+    If-None-Match / If-Modified-Since が一致する場合は本文なしの304を返す。
+    フロントエンドはSupabaseでプロジェクトを直接更新し、このサービスのキャッシュは
+    無効化されないため、キャッシュの行ではなくデータベースの行からETagを作成する
+
     Args:
-        project_id: プロジェクトID
-        db: Supabaseクライアント（依存性注入）
+        project_id: プロジェクトID（UUID）
+        request: リクエスト（条件付きリクエストの判定用）
+        service: データベースサービス（依存性注入）
 
     Returns:
-        プロジェクト情報
+        プロジェクト情報（変更がない場合は304）
 
     Raises:
         HTTPException: プロジェクトが見つからない場合は404
     """
-    service = SupabaseService(db)
-
     try:
-        project = await service.get_project(project_id)
+        project = await service.get_project(str(project_id), use_cache=False)
 
         if not project:
             raise HTTPException(
                 status_code=404, detail=f"Project {project_id} not found"
             )
 
-        return project
+        # updated_at は更新時にトリガーで更新されるため、行のバージョンとして使う
+        last_modified = to_datetime(
+            project.get("updated_at") or project.get("created_at")
+        )
+        headers = validator_headers(
+            strong_etag("project", project["id"], project.get("updated_at")),
+            last_modified,
+            settings.http_cache_control_project,
+        )
+        if is_not_modified(request, headers["ETag"], last_modified):
+            return not_modified_response(headers)
+
+        return FastJSONResponse(project, headers=headers)
 
     except HTTPException:
         raise
@@ -50,74 +238,199 @@ async def get_project(project_id: str, db: Client = Depends(get_db)) -> dict[str
         raise HTTPException(status_code=500, detail="Internal server error") from e
 
 
-@router.get("/")
+@router.get("/", response_model=list[dict[str, Any]])
 async def list_projects(
-    limit: int = 100, offset: int = 0, db: Client = Depends(get_db)
-) -> list[dict[str, Any]]:
+    limit: int = Query(100, ge=1, le=settings.projects_max_page_size),
+    offset: int = Query(0, ge=0),
+    cursor: str | None = None,
+    fields: str | None = None,
+    service: SupabaseService = Depends(get_supabase_service),
+) -> FastJSONResponse:
     """
-    プロジェクト一覧を取得
+    プロジェクト一覧を取得（作成日時の降順）
+
+    次のページがある場合は X-Next-Cursor ヘッダーにカーソルを返す。
+    offset はページが深くなるほど遅くなるため、cursor の使用を推奨
 
     Args:
-        limit: 取得件数
-        offset: オフセット
-        db: Supabaseクライアント（依存性注入）
+        limit: 取得件数（上限 PROJECTS_MAX_PAGE_SIZE）
+        offset: オフセット（cursor と併用不可）
+        cursor: 前のレスポンスの X-Next-Cursor
+        fields: 取得する列（カンマ区切り、未指定時は全列）
+        service: データベースサービス（依存性注入）
 
     Returns:
         プロジェクト一覧
+
+    Raises:
+        HTTPException: パラメータが不正な場合は400
     """
-    service = SupabaseService(db)
+    if cursor is not None and offset:
+        raise HTTPException(
+            status_code=400, detail="cursor and offset cannot be used together"
+        )
 
     try:
-        projects = await service.list_projects(limit=limit, offset=offset)
-        return projects
+        page_cursor = decode_cursor(cursor) if cursor is not None else None
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from e
+
+    requested = _parse_fields(fields)
+    # 次ページのカーソル作成に id, created_at が必要なため常に取得する
+    columns = requested + tuple(
+        column for column in CURSOR_COLUMNS if column not in requested
+    )
+
+    try:
+        # 1件多く取得して次ページの有無を判定
+        projects = await service.list_projects(
+            limit=limit + 1, offset=offset, cursor=page_cursor, columns=columns
+        )
 
     except Exception as e:
         logger.error(f"Error listing projects: {e}")
         raise HTTPException(status_code=500, detail="Internal server error") from e
 
+    page = projects[:limit]
+    headers = {}
+    if len(projects) > limit:
+        headers["X-Next-Cursor"] = encode_cursor(page[-1])
+
+    if columns != requested:
+        # 返却値はキャッシュと共有されるため、新しいdictを作成する
+        page = [{column: project[column] for column in requested} for project in page]
+
+    return FastJSONResponse(page, headers=headers)
+
+
+def _parse_fields(fields: str | None) -> tuple[str, ...]:
+    """
+    fields パラメータを検証して列名のタプルに変換
+
+    Args:
+        fields: カンマ区切りの列名
 
-@router.get("/{project_id}/latest-schedule")
+    Returns:
+        列名のタプル（未指定時は全列）
+
+    Raises:
+        HTTPException: 未知の列名が含まれる場合は400
+    """
+    if not fields:
+        return PROJECT_COLUMNS
+
+    columns = tuple(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [column for column in columns if column not in PROJECT_COLUMNS]
+    if unknown or not columns:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. "
+            f"Available: {', '.join(PROJECT_COLUMNS)}",
+        )
+    return columns
+
+
+@router.get("/{project_id}/latest-schedule", response_model=dict[str, Any])
 async def get_latest_schedule(
-    project_id: str, db: Client = Depends(get_db)
-) -> dict[str, Any]:
+    project_id: UUID,
+    request: Request,
+    service: SupabaseService = Depends(get_supabase_service),
+) -> Response:
     """
     プロジェクトの最新工程表を取得
 
+    工程表は作成後に変更されないため、ETagは工程表IDから作成する。
+    If-None-Match / If-Modified-Since が一致する場合は本文なしの304を返す
+
     Args:
-        project_id: プロジェクトID
-        db: Supabaseクライアント（依存性注入）
+        project_id: プロジェクトID（UUID）
+        request: リクエスト（条件付きリクエストの判定用）
+        service: データベースサービス（依存性注入）
 
     Returns:
-        最新の工程表情報
+        最新の工程表情報（変更がない場合は304）
 
     Raises:
         HTTPException: 工程表が見つからない場合は404
     """
-    service = SupabaseService(db)
-
     try:
+        # プロジェクト・最新工程表・工程アイテムを1回のクエリで取得
+        # （キャッシュのキーは無効化時と同じ小文字の文字列にする）
+        result = await service.get_latest_schedule_with_items(str(project_id))
+
         # プロジェクト存在チェック
-        project = await service.get_project(project_id)
-        if not project:
+        if not result:
             raise HTTPException(
                 status_code=404, detail=f"Project {project_id} not found"
             )
 
-        schedule = await service.get_latest_schedule(project_id)
+        schedule: dict[str, Any] | None = result["schedule"]
 
         if not schedule:
             raise HTTPException(
                 status_code=404, detail=f"No schedule found for project {project_id}"
             )
 
-        # 工程アイテムも取得
-        items = await service.get_schedule_items(schedule["id"])
-        schedule["items"] = items
+        last_modified = to_datetime(schedule.get("created_at"))
+        headers = validator_headers(
+            strong_etag("schedule", schedule["id"]),
+            last_modified,
+            settings.http_cache_control_latest_schedule,
+        )
+        if is_not_modified(request, headers["ETag"], last_modified):
+            return not_modified_response(headers)
 
-        return schedule
+        return FastJSONResponse(schedule, headers=headers)
 
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error fetching latest schedule: {e}")
         raise HTTPException(status_code=500, detail="Internal server error") from e
+
+
+@router.get("/{project_id}/schedules/diff", response_model=dict[str, Any])
+async def get_schedule_diff(
+    project_id: UUID,
+    from_version: int = Query(..., ge=1),
+    to_version: int = Query(..., ge=1),
+    service: SupabaseService = Depends(get_supabase_service),
+) -> FastJSONResponse:
+    """
+    プロジェクトの2つのバージョンの工程表の差分を取得
+
+    Args:
+        project_id: プロジェクトID（UUID）
+        from_version: 比較元のバージョン
+        to_version: 比較先のバージョン
+        service: データベースサービス（依存性注入）
+
+    Returns:
+        summary: 追加・削除・変更・変更なしの件数
+        added / removed: 追加・削除された工程アイテム
+        modified: 変更された工程（変更された列ごとの変更前後の値）
+
+    Raises:
+        HTTPException: いずれかのバージョンが見つからない場合は404
+    """
+    try:
+        diff = await service.get_schedule_diff(
+            str(project_id), from_version, to_version
+        )
+
+        if not diff:
+            raise HTTPException(
+                status_code=404,
+                detail=(
+                    f"Schedule version {from_version} or {to_version} not found "
+                    f"for project {project_id}"
+                ),
+            )
+
+        return FastJSONResponse(diff)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching schedule diff: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error") from e
@@ -0,0 +1,317 @@
+"""
+オフライン一括処理CLI
+FastAPIアプリやSupabaseを起動せずに、ディレクトリ内の工程表PDFを
+まとめて解析（NDJSON出力）または再生成（PDF出力）する
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import sys
+import time
+import uuid
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from app.schemas.pdf import PDFScheduleData, ProjectInfoForPDF, TableEngine
+from app.services.layout_cache import LayoutCache
+from app.services.pdf_service import PDFGenerationService
+
+logger = logging.getLogger(__name__)
+
+MODE_NDJSON = "ndjson"
+MODE_PDF = "pdf"
+
+# ワーカープロセスごとのサービスインスタンス（フォント検索を1回で済ませる）
+_worker_service: PDFGenerationService | None = None
+
+
+def _init_worker(use_layout_cache: bool = True) -> None:
+    """
+    ワーカープロセスの初期化
+
+    Args:
+        use_layout_cache: レイアウトキャッシュを使うか（エンジンが明示された場合はFalse）
+    """
+    global _worker_service
+    logging.getLogger("app").setLevel(logging.WARNING)
+    _worker_service = PDFGenerationService(
+        layout_cache=LayoutCache() if use_layout_cache else None
+    )
+
+
+def _process_file(task: tuple[str, str, str, str, str]) -> dict[str, Any]:
+    """
+    1ファイル分の解析・再生成（ワーカープロセスで実行）
+
+    Args:
+        task: (モード, 表検出エンジン, 入力ファイルパス, 相対パス, 出力先パス)
+
+    Returns:
+        処理結果（NDJSONの1行分）
+    """
+    mode, engine, source_path, relative_path, output_path = task
+    assert _worker_service is not None
+
+    started = time.perf_counter()
+    record: dict[str, Any] = {"source": relative_path}
+
+    try:
+        pdf_content = Path(source_path).read_bytes()
+        schedule_items = _worker_service.parse_schedule_items(
+            pdf_content, TableEngine(engine)
+        )
+
+        if mode == MODE_PDF:
+            schedule_data = PDFScheduleData(
+                schedule_id=uuid.uuid5(uuid.NAMESPACE_URL, relative_path),
+                version=1,
+                project_info=ProjectInfoForPDF(
+                    project_number=0,
+                    project_name=Path(relative_path).stem,
+                    construction_location=None,
+                    construction_company=None,
+                ),
+                schedule_items=schedule_items,
+            )
+            pdf_bytes = _worker_service.generate_pdf_bytes(schedule_data)
+
+            # 書き込み途中のファイルを処理済みと誤認しないよう一時ファイル経由で保存
+            destination = Path(output_path)
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = destination.with_suffix(".pdf.part")
+            temp_path.write_bytes(pdf_bytes)
+            temp_path.replace(destination)
+        else:
+            record["items"] = [item.to_json() for item in schedule_items]
+
+        record["status"] = "ok"
+        record["items_count"] = len(schedule_items)
+
+    except Exception as e:
+        record["status"] = "error"
+        record["error"] = str(e)
+        record["items_count"] = 0
+
+    record["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return record
+
+
+def _find_pdfs(input_dir: Path, recursive: bool) -> list[Path]:
+    """入力ディレクトリ内のPDFファイルを列挙"""
+    pattern = "**/*" if recursive else "*"
+    return sorted(
+        path
+        for path in input_dir.glob(pattern)
+        if path.is_file() and path.suffix.lower() == ".pdf"
+    )
+
+
+def _load_processed_sources(ndjson_path: Path) -> set[str]:
+    """
+    既存のNDJSON出力から処理に成功したファイルの相対パスを取得
+
+    失敗したファイル（status が ok 以外）は再実行時に再処理し、結果の行を追記する
+    """
+    processed: set[str] = set()
+    if not ndjson_path.exists():
+        return processed
+
+    with ndjson_path.open(encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+                if record["status"] == "ok":
+                    processed.add(record["source"])
+            except (ValueError, KeyError, TypeError):
+                # 中断時に書きかけになった行は無視して再処理する
+                continue
+
+    return processed
+
+
+def _build_tasks(
+    mode: str, engine: str, input_dir: Path, output: Path, recursive: bool
+) -> tuple[list[tuple[str, str, str, str, str]], int]:
+    """
+    処理対象タスクを作成（処理済みファイルはスキップ）
+
+    Returns:
+        (タスク一覧, スキップしたファイル数)
+    """
+    pdf_paths = _find_pdfs(input_dir, recursive)
+    processed = _load_processed_sources(output) if mode == MODE_NDJSON else set()
+
+    tasks = []
+    skipped = 0
+    for path in pdf_paths:
+        relative_path = path.relative_to(input_dir).as_posix()
+        output_path = output / relative_path if mode == MODE_PDF else output
+
+        if relative_path in processed or (
+            mode == MODE_PDF and Path(output_path).exists()
+        ):
+            skipped += 1
+            continue
+
+        tasks.append((mode, engine, str(path), relative_path, str(output_path)))
+
+    return tasks, skipped
+
+
+def _report_progress(
+    done: int, total: int, items: int, errors: int, started: float, final: bool
+) -> None:
+    """進捗とスループットを標準エラー出力に表示"""
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    message = (
+        f"\r[{done}/{total}] "
+        f"{done / elapsed:.1f} files/s, {items / elapsed:.1f} items/s, "
+        f"errors={errors}, elapsed={elapsed:.1f}s"
+    )
+    sys.stderr.write(message + ("\n" if final else ""))
+    sys.stderr.flush()
+
+
+def _run_pool(
+    tasks: list[tuple[str, str, str, str, str]],
+    workers: int,
+    use_layout_cache: bool = True,
+) -> Iterator[dict[str, Any]]:
+    """マルチプロセスプールでタスクを実行し、完了順に結果を返す"""
+    if workers <= 1:
+        _init_worker(use_layout_cache)
+        yield from map(_process_file, tasks)
+        return
+
+    with multiprocessing.Pool(
+        processes=workers, initializer=_init_worker, initargs=(use_layout_cache,)
+    ) as pool:
+        yield from pool.imap_unordered(_process_file, tasks)
+
+
+def run(
+    mode: str,
+    input_dir: Path,
+    output: Path,
+    workers: int,
+    recursive: bool,
+    engine: str | None = None,
+) -> int:
+    """
+    一括処理を実行
+
+    Args:
+        mode: 出力モード（ndjson / pdf）
+        input_dir: 入力ディレクトリ
+        output: 出力先（ndjsonはファイル、pdfはディレクトリ）
+        workers: ワーカープロセス数
+        recursive: サブディレクトリも対象にするか
+        engine: 表検出エンジン（未指定時は find_tables とレイアウトキャッシュを使用）
+
+    Returns:
+        終了コード（エラーがあれば1）
+    """
+    tasks, skipped = _build_tasks(
+        mode, engine or TableEngine.FIND_TABLES.value, input_dir, output, recursive
+    )
+    total = len(tasks)
+    sys.stderr.write(f"{total} files to process, {skipped} already processed\n")
+
+    if total == 0:
+        return 0
+
+    ndjson_file = None
+    if mode == MODE_NDJSON:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        ndjson_file = output.open("a", encoding="utf-8")
+
+    started = time.perf_counter()
+    done = items = errors = 0
+    try:
+        for record in _run_pool(tasks, workers, use_layout_cache=engine is None):
+            done += 1
+            items += record["items_count"]
+            if record["status"] != "ok":
+                errors += 1
+                logger.warning(f"Failed: {record['source']}: {record['error']}")
+
+            if ndjson_file is not None:
+                # 1行ずつフラッシュして中断後の再開に備える
+                ndjson_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+                ndjson_file.flush()
+
+            _report_progress(done, total, items, errors, started, final=False)
+    finally:
+        if ndjson_file is not None:
+            ndjson_file.close()
+        _report_progress(done, total, items, errors, started, final=True)
+
+    return 1 if errors else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    """コンソールエントリーポイント"""
+    parser = argparse.ArgumentParser(
+        prog="homesync-pdf",
+        description="工程表PDFをオフラインで一括解析・再生成する",
+    )
+    parser.add_argument("input_dir", type=Path, help="PDFが格納されたディレクトリ")
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        required=True,
+        help="出力先（ndjson: 出力ファイル / pdf: 出力ディレクトリ）",
+    )
+    parser.add_argument(
+        "-m",
+        "--mode",
+        choices=[MODE_NDJSON, MODE_PDF],
+        default=MODE_NDJSON,
+        help="出力モード（デフォルト: ndjson）",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=multiprocessing.cpu_count(),
+        help="ワーカープロセス数（デフォルト: CPUコア数）",
+    )
+    parser.add_argument(
+        "-e",
+        "--engine",
+        choices=[engine.value for engine in TableEngine],
+        default=None,
+        help=(
+            "表検出エンジン（デフォルト: find_tables と学習済みレイアウトの再利用。"
+            "指定時は常にそのエンジンで検出）"
+        ),
+    )
+    parser.add_argument(
+        "-r", "--recursive", action="store_true", help="サブディレクトリも処理する"
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.WARNING,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+    if not args.input_dir.is_dir():
+        parser.error(f"入力ディレクトリが存在しません: {args.input_dir}")
+
+    return run(
+        args.mode,
+        args.input_dir,
+        args.output,
+        args.workers,
+        args.recursive,
+        args.engine,
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
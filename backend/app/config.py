@@ -13,6 +13,86 @@ class Settings(BaseSettings):
 
     # Database Settings
     database_url: str = os.getenv("DATABASE_URL", "")
+    # 接続方式（supabase: PostgREST経由 / postgres: DATABASE_URLに直接接続）
+    database_backend: str = os.getenv("DATABASE_BACKEND", "supabase")
+    db_pool_min_size: int = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+    db_pool_max_size: int = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+    # プリペアドステートメントのキャッシュ数（PgBouncer経由の場合は0）
+    db_statement_cache_size: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+    db_command_timeout: float = float(os.getenv("DB_COMMAND_TIMEOUT", "30"))  # 秒
+
+    # Read Cache Settings（TTLは秒、0で無効）
+    cache_max_entries: int = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+    cache_project_ttl: float = float(os.getenv("CACHE_PROJECT_TTL", "30"))
+    cache_project_list_ttl: float = float(os.getenv("CACHE_PROJECT_LIST_TTL", "30"))
+    cache_latest_schedule_ttl: float = float(
+        os.getenv("CACHE_LATEST_SCHEDULE_TTL", "60")
+    )
+    # 作成後に変更されない工程表（ID指定）の工程アイテム・PDF用データ
+    cache_schedule_ttl: float = float(os.getenv("CACHE_SCHEDULE_TTL", "600"))
+    # ダッシュボード集計（プロジェクト作成はフロントエンドから直接行われるため短め）
+    cache_dashboard_ttl: float = float(os.getenv("CACHE_DASHBOARD_TTL", "10"))
+
+    # Write Batch Settings（同時に届いた取り込みの工程表書き込みをまとめる）
+    write_batch_enabled: bool = (
+        os.getenv("WRITE_BATCH_ENABLED", "false").lower() == "true"
+    )
+    write_batch_window_ms: float = float(os.getenv("WRITE_BATCH_WINDOW_MS", "5"))
+    # 待機中の工程アイテム数がこの件数に達したら待たずに書き込む
+    write_batch_max_rows: int = int(os.getenv("WRITE_BATCH_MAX_ROWS", "2000"))
+
+    # Event Stream Settings（工程表の変更通知）
+    # 購読者ごとの未送信イベントの上限（超えたクライアントは切断する）
+    events_queue_size: int = int(os.getenv("EVENTS_QUEUE_SIZE", "100"))
+    events_heartbeat_interval: float = float(
+        os.getenv("EVENTS_HEARTBEAT_INTERVAL", "15")
+    )  # 秒
+
+    # 管理者トークン（/metrics・/metrics/event-loop、指定によるプロファイルに必要）
+    # X-Admin-Token または Authorization: Bearer で送る。空の場合はこれらを受け付けない
+    # （PROFILING_ADMIN_TOKEN は以前の設定名）
+    admin_token: str = os.getenv("ADMIN_TOKEN", os.getenv("PROFILING_ADMIN_TOKEN", ""))
+
+    # Metrics Settings（/metrics でPrometheus形式のメトリクスを公開）
+    metrics_enabled: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    # pdf・projects のレスポンスに処理段階ごとの所要時間（Server-Timing）を付与し、
+    # リクエストごとに1行のログを出力する
+    server_timing_enabled: bool = (
+        os.getenv("SERVER_TIMING_ENABLED", "true").lower() == "true"
+    )
+
+    # イベントループの停止の検出（ハートビートの遅延を計測し、しきい値を超えたらスタックを出力）
+    # 監視用のスレッド・タスクが常駐するため既定は無効
+    loop_monitor_enabled: bool = (
+        os.getenv("LOOP_MONITOR_ENABLED", "false").lower() == "true"
+    )
+    loop_monitor_interval_ms: float = float(os.getenv("LOOP_MONITOR_INTERVAL_MS", "50"))
+    loop_stall_threshold_ms: float = float(os.getenv("LOOP_STALL_THRESHOLD_MS", "100"))
+
+    # Profiling Settings（リクエスト単位のプロファイル、既定は無効）
+    profiling_enabled: bool = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+    # N件に1件のリクエストをプロファイル（0で無効）
+    profiling_sample_every: int = int(os.getenv("PROFILING_SAMPLE_EVERY", "0"))
+    profiling_mode: str = os.getenv("PROFILING_MODE", "sampling")  # sampling / cprofile
+    profiling_interval_ms: float = float(os.getenv("PROFILING_INTERVAL_MS", "5"))
+    profiling_output_path: str = os.getenv(
+        "PROFILING_OUTPUT_PATH", "/tmp/homesync_profiles"
+    )
+
+    # Supabase HTTP Connection Pool Settings
+    supabase_http_max_connections: int = int(
+        os.getenv("SUPABASE_HTTP_MAX_CONNECTIONS", "100")
+    )
+    supabase_http_max_keepalive: int = int(
+        os.getenv("SUPABASE_HTTP_MAX_KEEPALIVE", "20")
+    )
+    supabase_http_keepalive_expiry: float = float(
+        os.getenv("SUPABASE_HTTP_KEEPALIVE_EXPIRY", "30")
+    )  # 秒
+    supabase_http_timeout: float = float(os.getenv("SUPABASE_HTTP_TIMEOUT", "30"))
+    supabase_http_connect_timeout: float = float(
+        os.getenv("SUPABASE_HTTP_CONNECT_TIMEOUT", "5")
+    )
 
     # FastAPI Settings
     debug: bool = os.getenv("DEBUG", "false").lower() == "true"
@@ -27,6 +107,26 @@ class Settings(BaseSettings):
         """CORS許可オリジンをリストとして取得"""
         return [origin.strip() for origin in self.allowed_origins.split(",")]
 
+    # API Settings
+    # プロジェクト一覧の1ページあたりの最大件数
+    projects_max_page_size: int = int(os.getenv("PROJECTS_MAX_PAGE_SIZE", "200"))
+    # 一括取得で1回に指定できるIDの最大数
+    batch_max_ids: int = int(os.getenv("BATCH_MAX_IDS", "500"))
+    # ダッシュボードに表示する最近のプロジェクト数
+    dashboard_recent_projects: int = int(os.getenv("DASHBOARD_RECENT_PROJECTS", "5"))
+
+    # HTTP Cache Settings（エンドポイントごとの Cache-Control、空の場合は付与しない）
+    # 既定値は毎回 ETag で再検証させる（変更がなければ304のため本文の転送・生成を省ける）
+    http_cache_control_project: str = os.getenv(
+        "HTTP_CACHE_CONTROL_PROJECT", "private, no-cache"
+    )
+    http_cache_control_latest_schedule: str = os.getenv(
+        "HTTP_CACHE_CONTROL_LATEST_SCHEDULE", "private, no-cache"
+    )
+    http_cache_control_pdf_export: str = os.getenv(
+        "HTTP_CACHE_CONTROL_PDF_EXPORT", "private, no-cache"
+    )
+
     # File Upload Settings
     max_file_size: int = int(os.getenv("MAX_FILE_SIZE", "10485760"))  # 10MB
     allowed_file_types: str = os.getenv("ALLOWED_FILE_TYPES", "application/pdf")
@@ -39,6 +139,15 @@ class Settings(BaseSettings):
     # PDF Processing Settings
     pdf_output_path: str = os.getenv("PDF_OUTPUT_PATH", "/tmp/generated_pdfs")
     pdf_temp_path: str = os.getenv("PDF_TEMP_PATH", "/tmp/uploaded_pdfs")
+    # 表検出エンジン（find_tables / grid / auto）
+    pdf_table_engine: str = os.getenv("PDF_TABLE_ENGINE", "find_tables")
+    # レイアウトキャッシュ（サイズ0で無効、パス未指定時はメモリのみ）
+    pdf_layout_cache_size: int = int(os.getenv("PDF_LAYOUT_CACHE_SIZE", "256"))
+    pdf_layout_cache_path: str = os.getenv("PDF_LAYOUT_CACHE_PATH", "")
+    # 学習から永続化ファイルに書き込むまでの待ち時間（秒、終了時には必ず書き込む）
+    pdf_layout_cache_save_delay: float = float(
+        os.getenv("PDF_LAYOUT_CACHE_SAVE_DELAY", "5")
+    )
 
     # Environment
     environment: str = os.getenv("ENVIRONMENT", "development")
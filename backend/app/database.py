@@ -1,25 +1,58 @@
 import logging
 
-from supabase import Client, create_client
+import asyncpg
+import httpx
+from supabase import AsyncClient, AsyncClientOptions, acreate_client
 
 from app.config import settings
+from app.repositories.base import DatabaseBackend, ScheduleRepository
+from app.repositories.postgres import PostgresRepository, create_pool
+from app.repositories.supabase import SupabaseRepository
+from app.services.metrics import instrument_repository
+from app.services.supabase_service import SupabaseService
 
 logger = logging.getLogger(__name__)
 
 
-def get_supabase_client() -> Client:
+def create_http_client() -> httpx.AsyncClient:
     """
-    Supabaseクライアントを取得する
+    Supabase通信用の共有HTTPクライアント（コネクションプール）を作成する
 
     Returns:
-        Client: Supabaseクライアントインスタンス
+        httpx.AsyncClient: keep-alive・接続数上限・タイムアウト設定済みのクライアント
+    """
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=settings.supabase_http_max_connections,
+            max_keepalive_connections=settings.supabase_http_max_keepalive,
+            keepalive_expiry=settings.supabase_http_keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(
+            settings.supabase_http_timeout,
+            connect=settings.supabase_http_connect_timeout,
+        ),
+        follow_redirects=True,
+    )
+
+
+async def get_supabase_client(http_client: httpx.AsyncClient) -> AsyncClient:
+    """
+    非同期Supabaseクライアントを取得する
+
+    Args:
+        http_client: 共有HTTPクライアント
+
+    Returns:
+        AsyncClient: Supabaseクライアントインスタンス
 
     Raises:
         Exception: 接続に失敗した場合
     """
     try:
-        supabase: Client = create_client(
-            settings.supabase_url, settings.supabase_service_role_key
+        supabase: AsyncClient = await acreate_client(
+            settings.supabase_url,
+            settings.supabase_service_role_key,
+            options=AsyncClientOptions(httpx_client=http_client),
         )
         logger.info("Supabase client initialized successfully")
         return supabase
@@ -28,30 +61,83 @@ def get_supabase_client() -> Client:
         raise
 
 
-# グローバルクライアントインスタンス（依存性注入で使用）
-supabase_client: Client | None = None
+# グローバルインスタンス（依存性注入で使用）
+http_client: httpx.AsyncClient | None = None
+supabase_client: AsyncClient | None = None
+postgres_pool: asyncpg.Pool | None = None
+repository: ScheduleRepository | None = None
+supabase_service: SupabaseService | None = None
 
 
 async def init_database() -> None:
     """
-    データベース接続を初期化する
+    データベース接続を初期化する（DATABASE_BACKENDに応じて接続方式を選択）
     """
-    global supabase_client
+    global http_client, supabase_client, postgres_pool, repository, supabase_service
+    backend = DatabaseBackend(settings.database_backend)
     try:
-        supabase_client = get_supabase_client()
-        logger.info("Database initialized successfully")
+        if backend == DatabaseBackend.POSTGRES:
+            postgres_pool = await create_pool(
+                settings.database_url,
+                min_size=settings.db_pool_min_size,
+                max_size=settings.db_pool_max_size,
+                statement_cache_size=settings.db_statement_cache_size,
+                command_timeout=settings.db_command_timeout,
+            )
+            repository = PostgresRepository(postgres_pool)
+            logger.info(
+                "Database initialized successfully (backend=postgres, "
+                f"pool={settings.db_pool_min_size}-{settings.db_pool_max_size})"
+            )
+        else:
+            http_client = create_http_client()
+            supabase_client = await get_supabase_client(http_client)
+            repository = SupabaseRepository(supabase_client)
+            logger.info(
+                "Database initialized successfully (backend=supabase, "
+                f"max_connections={settings.supabase_http_max_connections}, "
+                f"max_keepalive={settings.supabase_http_max_keepalive})"
+            )
+        if settings.metrics_enabled or settings.server_timing_enabled:
+            # データベース呼び出しごとの所要時間を記録（メトリクス・Server-Timing）
+            repository = instrument_repository(repository)
+        supabase_service = SupabaseService(repository)
     except Exception as e:
         logger.error(f"Failed to initialize database: {e}")
+        await close_database()
         raise
 
 
-def get_db() -> Client:
+async def close_database() -> None:
+    """
+    データベース接続を終了し、コネクションプールを解放する
+    """
+    global http_client, supabase_client, postgres_pool, repository, supabase_service
+    if supabase_service is not None:
+        # 接続を閉じる前に書き込み待ちの工程表を書き込む
+        await supabase_service.close()
+    supabase_service = None
+    repository = None
+    supabase_client = None
+    if http_client is not None:
+        await http_client.aclose()
+        http_client = None
+        logger.info("Supabase connection pool closed")
+    if postgres_pool is not None:
+        await postgres_pool.close()
+        postgres_pool = None
+        logger.info("PostgreSQL connection pool closed")
+
+
+def get_supabase_service() -> SupabaseService:
     """
-    データベースクライアントを取得する（依存性注入用）
+    データベースサービスを取得する（依存性注入用）
+
+    読み取りキャッシュを共有するため、プロセス内で1つのインスタンスを使用する
 
     Returns:
-        Client: Supabaseクライアント
+        SupabaseService: キャッシュ付きデータベースサービス
     """
-    if supabase_client is None:
+    if supabase_service is None:
         raise Exception("Database not initialized")
-    return supabase_client
+    return supabase_service
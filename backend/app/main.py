@@ -5,11 +5,26 @@ from datetime import datetime
 
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
+from app.api.v1.dashboard import router as dashboard_router
+from app.api.v1.events import router as events_router
+from app.api.v1.metrics import router as metrics_router
+from app.api.v1.pdf import pdf_service
 from app.api.v1.pdf import router as pdf_router
 from app.api.v1.projects import router as projects_router
 from app.config import settings
-from app.database import init_database
+from app.database import close_database, init_database
+from app.schemas.pdf import PDFPreflightError
+from app.services.loop_monitor import loop_monitor
+from app.services.profiling import ProfilingMode, RequestProfiler
+from app.utils.middleware import (
+    LoopStallMiddleware,
+    MetricsMiddleware,
+    ProfilingMiddleware,
+    ServerTimingMiddleware,
+)
+from app.utils.responses import FastJSONResponse
 
 # ログ設定
 logging.basicConfig(
@@ -28,6 +43,8 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     logger.info("Starting HomeSync PDF Service...")
     try:
         await init_database()
+        if settings.loop_monitor_enabled:
+            loop_monitor.start()
         logger.info("Application started successfully")
     except Exception as e:
         logger.error(f"Failed to start application: {e}")
@@ -37,6 +54,11 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
 
     # 終了時の処理
     logger.info("Shutting down HomeSync PDF Service...")
+    if pdf_service.layout_cache is not None:
+        # 未保存の学習済みレイアウトを書き込む
+        pdf_service.layout_cache.flush()
+    await loop_monitor.stop()
+    await close_database()
 
 
 # FastAPIアプリケーション初期化
@@ -46,6 +68,9 @@ app = FastAPI(
     version="1.0.0",
     debug=settings.debug,
     lifespan=lifespan,
+    # 戻り値をorjsonでシリアライズする（大きな一覧・工程表を返すエンドポイントは
+    # FastJSONResponse を直接返して戻り値の検証・変換も省略する）
+    default_response_class=FastJSONResponse,
 )
 
 # CORS設定
@@ -55,10 +80,48 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+# ルートごとのリクエスト数・処理時間の記録
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+
+# pdf・projects のレスポンスへの処理段階ごとの所要時間（Server-Timing）の付与
+if settings.server_timing_enabled:
+    app.add_middleware(
+        ServerTimingMiddleware, timing_allow_origin=", ".join(settings.origins_list)
+    )
+
+# リクエスト中のイベントループの停止時間のルートごとの記録
+if settings.loop_monitor_enabled:
+    app.add_middleware(LoopStallMiddleware, monitor=loop_monitor)
+
+# 指定されたリクエスト・N件に1件のリクエストのプロファイル（既定は無効）
+if settings.profiling_enabled:
+    app.add_middleware(
+        ProfilingMiddleware,
+        profiler=RequestProfiler(
+            settings.profiling_output_path,
+            admin_token=settings.admin_token,
+            sample_every=settings.profiling_sample_every,
+            mode=ProfilingMode(settings.profiling_mode),
+            interval=settings.profiling_interval_ms / 1000,
+        ),
+    )
+
 
 # エラーハンドラー
+@app.exception_handler(PDFPreflightError)
+async def preflight_exception_handler(
+    request: Request, exc: PDFPreflightError
+) -> JSONResponse:
+    """事前検査で却下されたPDFは理由コード付きで返す"""
+    return JSONResponse(
+        status_code=400, content={"detail": str(exc), "code": exc.reason.value}
+    )
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception) -> HTTPException:
     logger.error(f"Unhandled exception: {exc}")
@@ -102,6 +165,10 @@ async def root() -> dict[str, str]:
 # APIルーターの登録
 app.include_router(projects_router)
 app.include_router(pdf_router)
+app.include_router(dashboard_router)
+app.include_router(events_router)
+if settings.metrics_enabled:
+    app.include_router(metrics_router)
 
 
 if __name__ == "__main__":
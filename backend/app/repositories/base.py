@@ -0,0 +1,260 @@
+"""
+リポジトリインターフェース
+データベースアクセスの実装（PostgREST経由 / PostgreSQL直接接続）を差し替え可能にする
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from enum import StrEnum
+from typing import Any, Protocol
+
+from app.schemas.pdf import ScheduleRow
+
+# プロジェクトの列（一覧取得で fields に指定できる列）
+PROJECT_COLUMNS = (
+    "id",
+    "project_number",
+    "project_name",
+    "construction_location",
+    "construction_company",
+    "created_at",
+    "updated_at",
+    "latest_schedule_id",
+)
+
+# create_schedule_version がプロジェクト未発見時に返すSQLSTATE（no_data_found）
+PROJECT_NOT_FOUND_SQLSTATE = "P0002"
+
+# 工程表（PDF生成用）取得時のプロジェクト列
+PROJECT_INFO_COLUMNS = (
+    "project_number",
+    "project_name",
+    "construction_location",
+    "construction_company",
+)
+
+
+def schedule_item_payload(items: list[ScheduleRow]) -> list[dict[str, Any]]:
+    """工程アイテムをJSON送信用のdictに変換"""
+    return [item.to_json() for item in items]
+
+
+def schedule_version_batch_payload(
+    writes: list[tuple[str, list[ScheduleRow]]],
+) -> list[dict[str, Any]]:
+    """工程表の一括作成（create_schedule_versions）の引数に変換"""
+    return [
+        {"project_id": project_id, "items": schedule_item_payload(items)}
+        for project_id, items in writes
+    ]
+
+
+def schedule_version_batch_results(
+    rows: list[dict[str, Any]], size: int
+) -> list[dict[str, Any]]:
+    """
+    create_schedule_versions の結果行を引数と同じ順序に並べ替える
+
+    Args:
+        rows: 結果行（idx, schedule_id, version, new_item_count,
+            error_code, error_message）
+        size: 引数の要素数
+
+    Returns:
+        成功: {id, version, new_item_count} / 失敗: {error_code, error_message}
+        （結果行がない要素は失敗として扱う）
+    """
+    results: list[dict[str, Any]] = [
+        {
+            "error_code": None,
+            "error_message": "create_schedule_versions returned no row",
+        }
+    ] * size
+    for row in rows:
+        if row["error_code"] is None:
+            results[row["idx"]] = {
+                "id": row["schedule_id"],
+                "version": row["version"],
+                "new_item_count": row["new_item_count"],
+            }
+        else:
+            results[row["idx"]] = {
+                "error_code": row["error_code"],
+                "error_message": row["error_message"],
+            }
+    return results
+
+
+def attach_schedule_items(
+    schedules: list[dict[str, Any]], items: list[dict[str, Any]]
+) -> list[dict[str, Any]]:
+    """
+    工程表ごとに工程アイテムを items として追加
+
+    Args:
+        schedules: 工程表の行
+        items: 工程アイテムの行（表示順）
+
+    Returns:
+        items を追加した工程表
+    """
+    grouped: dict[str, list[dict[str, Any]]] = {}
+    for item in items:
+        grouped.setdefault(str(item["schedule_id"]), []).append(item)
+    return [
+        {**schedule, "items": grouped.get(str(schedule["id"]), [])}
+        for schedule in schedules
+    ]
+
+
+@dataclass(frozen=True)
+class ProjectCursor:
+    """プロジェクト一覧のカーソル位置（この行より後を取得する）"""
+
+    created_at: datetime | None
+    id: str
+
+
+class DatabaseBackend(StrEnum):
+    """データベース接続方式"""
+
+    SUPABASE = "supabase"  # Supabase（PostgREST / HTTP）
+    POSTGRES = "postgres"  # PostgreSQL直接接続（DATABASE_URL）
+
+
+class ScheduleRepository(Protocol):
+    """プロジェクト・工程表データへのアクセスインターフェース"""
+
+    async def get_project(self, project_id: str) -> dict[str, Any] | None:
+        """プロジェクトを取得（存在しない場合はNone）"""
+        ...
+
+    async def list_projects(
+        self,
+        limit: int,
+        offset: int = 0,
+        cursor: ProjectCursor | None = None,
+        columns: tuple[str, ...] = PROJECT_COLUMNS,
+    ) -> list[dict[str, Any]]:
+        """
+        プロジェクト一覧を (created_at, id) の降順で取得
+
+        created_at が NULL の行は最後に並ぶ。cursor 指定時はその行より後を
+        キーセット条件で取得する（offset と併用しない）
+
+        Args:
+            limit: 取得件数
+            offset: オフセット（cursor 未指定時のみ）
+            cursor: 前ページ最後の行の位置
+            columns: 取得する列（PROJECT_COLUMNS の部分集合）
+        """
+        ...
+
+    async def get_projects_by_ids(self, project_ids: list[str]) -> list[dict[str, Any]]:
+        """IDの一覧に該当するプロジェクトを1回のクエリで取得（順不同）"""
+        ...
+
+    async def get_schedules_with_items_by_ids(
+        self, schedule_ids: list[str]
+    ) -> list[dict[str, Any]]:
+        """
+        IDの一覧に該当する工程表を工程アイテム付きで取得（順不同）
+
+        工程表・工程アイテムをそれぞれ1回のクエリで取得する
+
+        Returns:
+            {id, project_id, version, created_at, items: [...]} のリスト
+        """
+        ...
+
+    async def get_schedules_by_versions(
+        self, project_id: str, versions: list[int]
+    ) -> list[dict[str, Any]]:
+        """
+        プロジェクトの指定バージョンの工程表を取得（工程アイテムなし・順不同）
+
+        Returns:
+            {id, project_id, version, created_at} のリスト（存在するバージョンのみ）
+        """
+        ...
+
+    async def get_latest_schedule_with_items(
+        self, project_id: str
+    ) -> dict[str, Any] | None:
+        """
+        プロジェクトと最新工程表（工程アイテム付き）を1回のクエリで取得
+
+        Returns:
+            {project: {...}, schedule: {..., items: [...]} | None} の形式、
+            プロジェクトが存在しない場合はNone
+        """
+        ...
+
+    async def get_schedule_items(self, schedule_id: str) -> list[dict[str, Any]]:
+        """工程表のアイテムを表示順で取得"""
+        ...
+
+    async def get_dashboard_summary(self, recent_limit: int) -> dict[str, Any]:
+        """
+        ダッシュボードの集計を1回のクエリで取得
+
+        工程表の作成時に更新される集計テーブルを読むため、
+        プロジェクト数に関わらず一定のコストで取得できる
+
+        Returns:
+            {status_counts: {ステータス: プロジェクト数}, recent_projects: [...]}
+        """
+        ...
+
+    async def get_project_status(self, project_id: str) -> dict[str, Any] | None:
+        """プロジェクトの進捗集計を取得（存在しない場合はNone）"""
+        ...
+
+    async def get_schedule_with_details(
+        self, schedule_id: str
+    ) -> dict[str, Any] | None:
+        """
+        工程表をプロジェクト情報・工程アイテム付きで取得
+
+        Returns:
+            {id, version, created_at, projects: {...}, schedule_items: [...]}
+            の形式、存在しない場合はNone
+        """
+        ...
+
+    async def create_schedule_version(
+        self, project_id: str, items: list[ScheduleRow]
+    ) -> dict[str, Any]:
+        """
+        工程表の新バージョンを工程アイテムごと作成
+
+        次のバージョン番号の採番・工程表・工程アイテムの登録を
+        データベース側で1回の呼び出し・1トランザクションで行う
+        （並行した取り込みでもバージョン番号は重複しない）。
+        内容が既存のバージョンと同じ工程アイテムは行を共有し、新しい行のみ書き込む
+
+        Returns:
+            {id, version, new_item_count}（new_item_count は新たに書き込んだ行数）
+
+        Raises:
+            ProjectNotFoundError: プロジェクトが見つからない場合
+        """
+        ...
+
+    async def create_schedule_versions(
+        self, writes: list[tuple[str, list[ScheduleRow]]]
+    ) -> list[dict[str, Any]]:
+        """
+        複数の工程表の新バージョンを1回の呼び出しでまとめて作成
+
+        各要素はデータベース側で個別のサブトランザクションとして処理され、
+        1件の失敗が他の要素の書き込みに影響しない
+
+        Args:
+            writes: (プロジェクトID, 工程アイテム一覧) の一覧
+
+        Returns:
+            writes と同じ順序の結果一覧
+            （成功: {id, version, new_item_count} / 失敗: {error_code, error_message}）
+        """
+        ...
@@ -0,0 +1,275 @@
+"""
+PostgreSQL直接接続リポジトリ
+asyncpgのコネクションプールで DATABASE_URL に直接接続する
+
+各クエリは固定のSQL文として定義しており、asyncpgが接続ごとに
+プリペアドステートメントとしてキャッシュする（2回目以降は解析・計画を省略）
+"""
+
+import json
+import logging
+from functools import lru_cache
+from typing import Any
+
+import asyncpg
+
+from app.repositories.base import (
+    PROJECT_COLUMNS,
+    PROJECT_INFO_COLUMNS,
+    PROJECT_NOT_FOUND_SQLSTATE,
+    ProjectCursor,
+    attach_schedule_items,
+    schedule_item_payload,
+    schedule_version_batch_payload,
+    schedule_version_batch_results,
+)
+from app.schemas.pdf import ProjectNotFoundError, ScheduleRow
+
+logger = logging.getLogger(__name__)
+
+SQL_GET_PROJECT = "SELECT * FROM projects WHERE id = $1"
+
+# プロジェクト一覧（{columns} は PROJECT_COLUMNS で検証済みの列名のみ）
+LIST_PROJECTS_ORDER = "ORDER BY created_at DESC NULLS LAST, id DESC"
+SQL_LIST_PROJECTS = f"""
+SELECT {{columns}} FROM projects
+{LIST_PROJECTS_ORDER}
+LIMIT $1 OFFSET $2
+"""
+SQL_LIST_PROJECTS_AFTER = f"""
+SELECT {{columns}} FROM list_projects_after($2, $3, $1)
+{LIST_PROJECTS_ORDER}
+"""
+
+SQL_GET_PROJECTS_BY_IDS = "SELECT * FROM projects WHERE id = ANY($1::uuid[])"
+
+SQL_GET_SCHEDULES_BY_IDS = """
+SELECT * FROM project_schedules WHERE id = ANY($1::uuid[])
+"""
+
+SQL_GET_SCHEDULES_BY_VERSIONS = """
+SELECT * FROM project_schedules WHERE project_id = $1 AND version = ANY($2::int[])
+"""
+
+SQL_GET_SCHEDULE_ITEMS_BY_SCHEDULE_IDS = """
+SELECT * FROM schedule_items
+WHERE schedule_id = ANY($1::uuid[])
+ORDER BY schedule_id, order_index
+"""
+
+SQL_GET_LATEST_SCHEDULE_WITH_ITEMS = """
+SELECT get_latest_schedule_with_items($1)
+"""
+
+SQL_GET_DASHBOARD_SUMMARY = "SELECT get_dashboard_summary($1)"
+
+SQL_GET_PROJECT_STATUS = "SELECT * FROM project_status_summary WHERE project_id = $1"
+
+SQL_GET_SCHEDULE_ITEMS = """
+SELECT * FROM schedule_items
+WHERE schedule_id = $1
+ORDER BY order_index
+"""
+
+# PostgRESTの埋め込み取得（projects!inner / schedule_items!inner）と同じ形式で返す
+SQL_GET_SCHEDULE_WITH_DETAILS = f"""
+SELECT
+    s.id,
+    s.version,
+    s.created_at,
+    json_build_object(
+        {", ".join(f"'{column}', p.{column}" for column in PROJECT_INFO_COLUMNS)}
+    ) AS projects,
+    items.schedule_items
+FROM project_schedules s
+JOIN projects p ON p.id = s.project_id
+CROSS JOIN LATERAL (
+    SELECT json_agg(
+        json_build_object(
+            'process_name', i.process_name,
+            'planned_start_date', i.planned_start_date,
+            'planned_end_date', i.planned_end_date,
+            'actual_start_date', i.actual_start_date,
+            'actual_end_date', i.actual_end_date,
+            'assignee', i.assignee,
+            'status', i.status,
+            'remarks', i.remarks,
+            'order_index', i.order_index
+        )
+        ORDER BY i.order_index
+    ) AS schedule_items
+    FROM schedule_items i
+    WHERE i.schedule_id = s.id
+) items
+WHERE s.id = $1 AND items.schedule_items IS NOT NULL
+"""
+
+SQL_CREATE_SCHEDULE_VERSION = """
+SELECT schedule_id, version, new_item_count FROM create_schedule_version($1, $2)
+"""
+
+SQL_CREATE_SCHEDULE_VERSIONS = """
+SELECT idx, schedule_id, version, new_item_count, error_code, error_message
+FROM create_schedule_versions($1)
+"""
+
+
+@lru_cache(maxsize=256)
+def _list_projects_sql(template: str, columns: tuple[str, ...]) -> str:
+    """列の組み合わせごとに同じSQL文を返す（プリペアドステートメントを再利用するため）"""
+    return template.format(columns=", ".join(columns))
+
+
+async def init_connection(connection: asyncpg.Connection) -> None:
+    """プール内の各接続の初期化（json列をdict/listとして扱う）"""
+    for type_name in ("json", "jsonb"):
+        await connection.set_type_codec(
+            type_name, encoder=json.dumps, decoder=json.loads, schema="pg_catalog"
+        )
+
+
+async def create_pool(
+    dsn: str,
+    min_size: int,
+    max_size: int,
+    statement_cache_size: int,
+    command_timeout: float,
+) -> asyncpg.Pool:
+    """
+    コネクションプールを作成
+
+    Args:
+        dsn: 接続文字列（DATABASE_URL）
+        min_size: 最小接続数
+        max_size: 最大接続数
+        statement_cache_size: 接続ごとのプリペアドステートメントのキャッシュ数
+            （PgBouncerのトランザクションモード経由の場合は0）
+        command_timeout: クエリのタイムアウト（秒）
+
+    Returns:
+        コネクションプール
+    """
+    pool: asyncpg.Pool = await asyncpg.create_pool(
+        dsn,
+        min_size=min_size,
+        max_size=max_size,
+        statement_cache_size=statement_cache_size,
+        command_timeout=command_timeout,
+        init=init_connection,
+    )
+    return pool
+
+
+def _to_dict(record: asyncpg.Record | None) -> dict[str, Any] | None:
+    return dict(record) if record is not None else None
+
+
+class PostgresRepository:
+    """asyncpgによるPostgreSQL直接接続のリポジトリ実装"""
+
+    def __init__(self, pool: asyncpg.Pool):
+        """
+        Args:
+            pool: asyncpgのコネクションプール
+        """
+        self.pool = pool
+
+    async def get_project(self, project_id: str) -> dict[str, Any] | None:
+        return _to_dict(await self.pool.fetchrow(SQL_GET_PROJECT, project_id))
+
+    async def list_projects(
+        self,
+        limit: int,
+        offset: int = 0,
+        cursor: ProjectCursor | None = None,
+        columns: tuple[str, ...] = PROJECT_COLUMNS,
+    ) -> list[dict[str, Any]]:
+        if cursor is None:
+            sql = _list_projects_sql(SQL_LIST_PROJECTS, columns)
+            records = await self.pool.fetch(sql, limit, offset)
+        else:
+            sql = _list_projects_sql(SQL_LIST_PROJECTS_AFTER, columns)
+            records = await self.pool.fetch(sql, limit, cursor.created_at, cursor.id)
+        return [dict(record) for record in records]
+
+    async def get_projects_by_ids(self, project_ids: list[str]) -> list[dict[str, Any]]:
+        records = await self.pool.fetch(SQL_GET_PROJECTS_BY_IDS, project_ids)
+        return [dict(record) for record in records]
+
+    async def get_schedules_with_items_by_ids(
+        self, schedule_ids: list[str]
+    ) -> list[dict[str, Any]]:
+        async with self.pool.acquire() as connection:
+            schedules = await connection.fetch(SQL_GET_SCHEDULES_BY_IDS, schedule_ids)
+            if not schedules:
+                return []
+            items = await connection.fetch(
+                SQL_GET_SCHEDULE_ITEMS_BY_SCHEDULE_IDS,
+                [record["id"] for record in schedules],
+            )
+        return attach_schedule_items(
+            [dict(record) for record in schedules], [dict(record) for record in items]
+        )
+
+    async def get_schedules_by_versions(
+        self, project_id: str, versions: list[int]
+    ) -> list[dict[str, Any]]:
+        records = await self.pool.fetch(
+            SQL_GET_SCHEDULES_BY_VERSIONS, project_id, versions
+        )
+        return [dict(record) for record in records]
+
+    async def get_latest_schedule_with_items(
+        self, project_id: str
+    ) -> dict[str, Any] | None:
+        result: dict[str, Any] | None = await self.pool.fetchval(
+            SQL_GET_LATEST_SCHEDULE_WITH_ITEMS, project_id
+        )
+        return result
+
+    async def get_schedule_items(self, schedule_id: str) -> list[dict[str, Any]]:
+        records = await self.pool.fetch(SQL_GET_SCHEDULE_ITEMS, schedule_id)
+        return [dict(record) for record in records]
+
+    async def get_dashboard_summary(self, recent_limit: int) -> dict[str, Any]:
+        result: dict[str, Any] = await self.pool.fetchval(
+            SQL_GET_DASHBOARD_SUMMARY, recent_limit
+        )
+        return result
+
+    async def get_project_status(self, project_id: str) -> dict[str, Any] | None:
+        return _to_dict(await self.pool.fetchrow(SQL_GET_PROJECT_STATUS, project_id))
+
+    async def get_schedule_with_details(
+        self, schedule_id: str
+    ) -> dict[str, Any] | None:
+        return _to_dict(
+            await self.pool.fetchrow(SQL_GET_SCHEDULE_WITH_DETAILS, schedule_id)
+        )
+
+    async def create_schedule_version(
+        self, project_id: str, items: list[ScheduleRow]
+    ) -> dict[str, Any]:
+        try:
+            record = await self.pool.fetchrow(
+                SQL_CREATE_SCHEDULE_VERSION, project_id, schedule_item_payload(items)
+            )
+        except asyncpg.PostgresError as e:
+            if e.sqlstate == PROJECT_NOT_FOUND_SQLSTATE:
+                raise ProjectNotFoundError(f"Project {project_id} not found") from e
+            raise
+        return {
+            "id": record["schedule_id"],
+            "version": record["version"],
+            "new_item_count": record["new_item_count"],
+        }
+
+    async def create_schedule_versions(
+        self, writes: list[tuple[str, list[ScheduleRow]]]
+    ) -> list[dict[str, Any]]:
+        records = await self.pool.fetch(
+            SQL_CREATE_SCHEDULE_VERSIONS, schedule_version_batch_payload(writes)
+        )
+        return schedule_version_batch_results(
+            [dict(record) for record in records], len(writes)
+        )
@@ -0,0 +1,244 @@
+"""
+Supabase（PostgREST）リポジトリ
+非同期Supabaseクライアント経由でデータベースにアクセスする
+"""
+
+import asyncio
+import logging
+from typing import Any, cast
+
+from postgrest import APIError, APIResponse
+from supabase import AsyncClient
+
+from app.repositories.base import (
+    PROJECT_COLUMNS,
+    PROJECT_INFO_COLUMNS,
+    PROJECT_NOT_FOUND_SQLSTATE,
+    ProjectCursor,
+    attach_schedule_items,
+    schedule_item_payload,
+    schedule_version_batch_payload,
+    schedule_version_batch_results,
+)
+from app.schemas.pdf import ProjectNotFoundError, ScheduleRow
+
+logger = logging.getLogger(__name__)
+
+# 工程表（PDF生成用）の埋め込み取得クエリ
+SCHEDULE_DETAILS_SELECT = f"""
+    id,
+    version,
+    created_at,
+    projects!inner({", ".join(PROJECT_INFO_COLUMNS)}),
+    schedule_items!inner(
+        process_name,
+        planned_start_date,
+        planned_end_date,
+        actual_start_date,
+        actual_end_date,
+        assignee,
+        status,
+        remarks,
+        order_index
+    )
+"""
+
+
+# in フィルタ1回あたりのID数（URLの長さ制限を超えないよう分割する）
+IN_FILTER_CHUNK_SIZE = 100
+
+
+def _chunks(values: list[str]) -> list[list[str]]:
+    """in フィルタ用にIDを分割"""
+    return [
+        values[start : start + IN_FILTER_CHUNK_SIZE]
+        for start in range(0, len(values), IN_FILTER_CHUNK_SIZE)
+    ]
+
+
+def _rows(result: APIResponse) -> list[dict[str, Any]]:
+    """レスポンスの行データを取得"""
+    return cast(list[dict[str, Any]], result.data or [])
+
+
+def _first(result: APIResponse) -> dict[str, Any] | None:
+    """レスポンスの先頭行を取得（0件の場合はNone）"""
+    rows = _rows(result)
+    return rows[0] if rows else None
+
+
+class SupabaseRepository:
+    """PostgREST経由のリポジトリ実装"""
+
+    def __init__(self, client: AsyncClient):
+        """
+        Args:
+            client: 非同期Supabaseクライアント
+        """
+        self.client = client
+
+    async def get_project(self, project_id: str) -> dict[str, Any] | None:
+        result = (
+            await self.client.table("projects")
+            .select("*")
+            .eq("id", project_id)
+            .limit(1)
+            .execute()
+        )
+        return _first(result)
+
+    async def list_projects(
+        self,
+        limit: int,
+        offset: int = 0,
+        cursor: ProjectCursor | None = None,
+        columns: tuple[str, ...] = PROJECT_COLUMNS,
+    ) -> list[dict[str, Any]]:
+        if cursor is None:
+            result = (
+                await self.client.table("projects")
+                .select(",".join(columns))
+                .order("created_at", desc=True, nullsfirst=False)
+                .order("id", desc=True)
+                .limit(limit)
+                .offset(offset)
+                .execute()
+            )
+        else:
+            # ORの条件ではインデックスの範囲検索が使えないため関数で取得する
+            result = await (
+                self.client.rpc(
+                    "list_projects_after",
+                    {
+                        "p_created_at": (
+                            cursor.created_at.isoformat() if cursor.created_at else None
+                        ),
+                        "p_id": cursor.id,
+                        "p_limit": limit,
+                    },
+                )
+                .select(",".join(columns))
+                .order("created_at", desc=True, nullsfirst=False)
+                .order("id", desc=True)
+                .execute()
+            )
+
+        return _rows(result)
+
+    async def _select_in(
+        self, table: str, column: str, values: list[str], order: str | None = None
+    ) -> list[dict[str, Any]]:
+        """column が values のいずれかに一致する行を取得（分割した場合は並行実行）"""
+
+        async def select_chunk(chunk: list[str]) -> list[dict[str, Any]]:
+            query = self.client.table(table).select("*").in_(column, chunk)
+            if order is not None:
+                query = query.order(order)
+            return _rows(await query.execute())
+
+        results = await asyncio.gather(
+            *(select_chunk(chunk) for chunk in _chunks(values))
+        )
+        return [row for rows in results for row in rows]
+
+    async def get_projects_by_ids(self, project_ids: list[str]) -> list[dict[str, Any]]:
+        return await self._select_in("projects", "id", project_ids)
+
+    async def get_schedules_with_items_by_ids(
+        self, schedule_ids: list[str]
+    ) -> list[dict[str, Any]]:
+        # 工程アイテムは工程表IDで直接絞り込めるため、工程表と並行して取得する
+        schedules, items = await asyncio.gather(
+            self._select_in("project_schedules", "id", schedule_ids),
+            self._select_in(
+                "schedule_items", "schedule_id", schedule_ids, order="order_index"
+            ),
+        )
+        return attach_schedule_items(schedules, items)
+
+    async def get_schedules_by_versions(
+        self, project_id: str, versions: list[int]
+    ) -> list[dict[str, Any]]:
+        result = (
+            await self.client.table("project_schedules")
+            .select("*")
+            .eq("project_id", project_id)
+            .in_("version", versions)
+            .execute()
+        )
+        return _rows(result)
+
+    async def get_latest_schedule_with_items(
+        self, project_id: str
+    ) -> dict[str, Any] | None:
+        result = await self.client.rpc(
+            "get_latest_schedule_with_items", {"p_project_id": project_id}
+        ).execute()
+        return cast(dict[str, Any] | None, result.data)
+
+    async def get_schedule_items(self, schedule_id: str) -> list[dict[str, Any]]:
+        result = (
+            await self.client.table("schedule_items")
+            .select("*")
+            .eq("schedule_id", schedule_id)
+            .order("order_index")
+            .execute()
+        )
+        return _rows(result)
+
+    async def get_dashboard_summary(self, recent_limit: int) -> dict[str, Any]:
+        result = await self.client.rpc(
+            "get_dashboard_summary", {"p_recent_limit": recent_limit}
+        ).execute()
+        return cast(dict[str, Any], result.data)
+
+    async def get_project_status(self, project_id: str) -> dict[str, Any] | None:
+        result = (
+            await self.client.table("project_status_summary")
+            .select("*")
+            .eq("project_id", project_id)
+            .limit(1)
+            .execute()
+        )
+        return _first(result)
+
+    async def get_schedule_with_details(
+        self, schedule_id: str
+    ) -> dict[str, Any] | None:
+        result = (
+            await self.client.table("project_schedules")
+            .select(SCHEDULE_DETAILS_SELECT)
+            .eq("id", schedule_id)
+            .execute()
+        )
+        return _first(result)
+
+    async def create_schedule_version(
+        self, project_id: str, items: list[ScheduleRow]
+    ) -> dict[str, Any]:
+        try:
+            result = await self.client.rpc(
+                "create_schedule_version",
+                {"p_project_id": project_id, "p_items": schedule_item_payload(items)},
+            ).execute()
+        except APIError as e:
+            if e.code == PROJECT_NOT_FOUND_SQLSTATE:
+                raise ProjectNotFoundError(f"Project {project_id} not found") from e
+            raise
+        created = _first(result)
+        if created is None:
+            raise RuntimeError("create_schedule_version returned no rows")
+        return {
+            "id": created["schedule_id"],
+            "version": created["version"],
+            "new_item_count": created["new_item_count"],
+        }
+
+    async def create_schedule_versions(
+        self, writes: list[tuple[str, list[ScheduleRow]]]
+    ) -> list[dict[str, Any]]:
+        result = await self.client.rpc(
+            "create_schedule_versions",
+            {"p_batch": schedule_version_batch_payload(writes)},
+        ).execute()
+        return schedule_version_batch_results(_rows(result), len(writes))
@@ -2,12 +2,34 @@
 PDF関連のPydanticスキーマ定義
 """
 
+from dataclasses import dataclass, field
 from datetime import date, datetime
+from enum import StrEnum
+from functools import lru_cache
+from typing import Any, NamedTuple
 from uuid import UUID
 
 from pydantic import BaseModel, Field
 
 
+class TableEngine(StrEnum):
+    """PDF解析時の表検出エンジン"""
+
+    FIND_TABLES = "find_tables"  # PyMuPDF標準の表検出
+    GRID = "grid"  # 罫線（ベクター描画）からのグリッド検出
+    AUTO = "auto"  # 罫線検出を試し、失敗時はfind_tablesで検出
+
+
+class PreflightReason(StrEnum):
+    """PDF事前検査の却下理由コード"""
+
+    UNREADABLE = "unreadable"  # PDFとして開けない
+    ENCRYPTED = "encrypted"  # パスワード保護されている
+    NO_PAGES = "no_pages"  # ページが含まれていない
+    IMAGE_ONLY = "image_only"  # スキャン画像のみ（テキストレイヤーなし）
+    NO_TEXT_LAYER = "no_text_layer"  # テキストが含まれていない
+
+
 class ScheduleItemForPDF(BaseModel):
     """PDF生成用工程アイテム"""
 
@@ -22,6 +44,68 @@ class ScheduleItemForPDF(BaseModel):
     order_index: int = Field(default=0, description="表示順序")
 
 
+class ScheduleRow(NamedTuple):
+    """
+    工程アイテムの行（サービス内部の表現）
+
+    ScheduleItemForPDFと同じ列を持つ軽量な行型。PDF解析・データベース保存・PDF描画では
+    行ごとのPydanticモデルを生成・検証せずにこの型を使い、検証はAPIの境界でのみ行う
+    """
+
+    process_name: str
+    planned_start_date: date | None = None
+    planned_end_date: date | None = None
+    actual_start_date: date | None = None
+    actual_end_date: date | None = None
+    assignee: str | None = None
+    status: str = "未着手"
+    remarks: str | None = None
+    order_index: int = 0
+
+    @classmethod
+    def from_record(cls, record: dict[str, Any]) -> "ScheduleRow":
+        """
+        データベースの工程アイテム（schedule_items の行）から作成
+
+        Args:
+            record: 工程アイテムの行（日付はdateまたはISO形式の文字列）
+
+        Returns:
+            工程アイテムの行
+        """
+        return cls(
+            record["process_name"],
+            _to_date(record.get("planned_start_date")),
+            _to_date(record.get("planned_end_date")),
+            _to_date(record.get("actual_start_date")),
+            _to_date(record.get("actual_end_date")),
+            record.get("assignee"),
+            record.get("status") or "未着手",
+            record.get("remarks"),
+            record.get("order_index") or 0,
+        )
+
+    def to_json(self) -> dict[str, Any]:
+        """JSON送信用のdictに変換（日付はISO形式の文字列）"""
+        return {
+            name: value.isoformat() if isinstance(value, date) else value
+            for name, value in zip(self._fields, self, strict=True)
+        }
+
+
+def _to_date(value: date | str | None) -> date | None:
+    """ISO形式の日付文字列をdateに変換（dateとNoneはそのまま返す）"""
+    if isinstance(value, str):
+        return _parse_iso_date(value) if value else None
+    return value
+
+
+@lru_cache(maxsize=4096)
+def _parse_iso_date(value: str) -> date:
+    """ISO形式の日付文字列を解析（工程表では同じ日付が繰り返し現れるため、同じdateを共有する）"""
+    return date.fromisoformat(value)
+
+
 class ProjectInfoForPDF(BaseModel):
     """PDF生成用プロジェクト情報"""
 
@@ -31,21 +115,20 @@ class ProjectInfoForPDF(BaseModel):
     construction_company: str | None = Field(None, description="施工会社")
 
 
-class PDFScheduleData(BaseModel):
-    """PDF生成用の完全なスケジュールデータ"""
+@dataclass(slots=True)
+class PDFScheduleData:
+    """
+    PDF生成用の完全なスケジュールデータ（サービス内部の表現）
 
-    schedule_id: UUID = Field(..., description="工程表ID")
-    version: int = Field(..., description="バージョン")
-    project_info: ProjectInfoForPDF = Field(..., description="プロジェクト情報")
-    schedule_items: list[ScheduleItemForPDF] = Field(
-        ..., description="工程アイテム一覧"
-    )
-    created_date: datetime = Field(
-        default_factory=datetime.now, description="PDF作成日"
-    )
+    工程アイテムは行ごとに検証しないScheduleRowで保持する
+    """
 
-    class Config:
-        from_attributes = True
+    schedule_id: UUID  # 工程表ID
+    version: int  # バージョン
+    project_info: ProjectInfoForPDF  # プロジェクト情報
+    schedule_items: list[ScheduleRow]  # 工程アイテム一覧
+    created_date: datetime = field(default_factory=datetime.now)  # PDF作成日
+    created_at: datetime | None = None  # 工程表の作成日時（UTC）
 
 
 class PDFGenerationResponse(BaseModel):
@@ -89,6 +172,14 @@ class PDFUploadError(Exception):
     pass
 
 
+class PDFPreflightError(PDFUploadError):
+    """PDF事前検査で解析不可と判定されたエラー"""
+
+    def __init__(self, reason: PreflightReason, message: str):
+        super().__init__(message)
+        self.reason = reason
+
+
 class ProjectNotFoundError(Exception):
     """プロジェクト未発見エラー"""
 
@@ -0,0 +1,13 @@
+"""
+プロジェクト関連のPydanticスキーマ定義
+"""
+
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class BatchLookupRequest(BaseModel):
+    """ID一覧による一括取得リクエスト"""
+
+    ids: list[UUID] = Field(..., min_length=1, description="取得するIDの一覧")
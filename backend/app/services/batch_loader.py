@@ -0,0 +1,102 @@
+"""
+IDによる一括読み込み
+同時に実行中のリクエスト間で同じIDの読み込みを共有し、未読み込みのIDだけを
+1回のクエリでまとめて取得する
+"""
+
+import asyncio
+import logging
+from collections import Counter
+from collections.abc import Awaitable, Callable, Iterable
+from functools import partial
+from typing import Any, Generic, TypeVar
+
+logger = logging.getLogger(__name__)
+
+V = TypeVar("V")
+
+
+class BatchLoader(Generic[V]):
+    """IDの一覧をまとめて読み込むローダー
+
+    読み込み中のIDに対する別リクエストからの要求は、新たなクエリを発行せず
+    実行中の読み込み結果を待つ。
+    読み込みは独立したタスクとして実行するため、読み込みを開始したリクエストが
+    キャンセルされても、結果を待つ他のリクエストがいる間は継続する
+    """
+
+    def __init__(self, name: str, load: Callable[[list[str]], Awaitable[dict[str, V]]]):
+        """
+        Args:
+            name: ローダー名（統計表示用）
+            load: IDの一覧を受け取り、ID→値のdictを返す関数（該当なしのIDは含めない）
+        """
+        self.name = name
+        self._load = load
+        self._pending: dict[str, asyncio.Task[dict[str, V]]] = {}
+        self._waiters: Counter[asyncio.Task[dict[str, V]]] = Counter()
+        self.batches = 0
+        self.keys_loaded = 0
+        self.keys_coalesced = 0
+
+    async def load_many(self, keys: Iterable[str]) -> dict[str, V | None]:
+        """
+        IDの一覧を読み込む
+
+        Args:
+            keys: 読み込むID（重複は1回にまとめる）
+
+        Returns:
+            ID→値のdict（該当なしの場合はNone）
+        """
+        batches: dict[str, asyncio.Task[dict[str, V]]] = {}
+        owned: list[str] = []
+
+        for key in dict.fromkeys(keys):
+            batch = self._pending.get(key)
+            if batch is None:
+                owned.append(key)
+            else:
+                self.keys_coalesced += 1
+                batches[key] = batch
+
+        if owned:
+            batch = asyncio.ensure_future(self._load(owned))
+            self.batches += 1
+            self.keys_loaded += len(owned)
+            for key in owned:
+                self._pending[key] = batch
+                batches[key] = batch
+            batch.add_done_callback(partial(self._finish, owned))
+
+        waiting = set(batches.values())
+        self._waiters.update(waiting)
+        try:
+            results = {batch: await asyncio.shield(batch) for batch in waiting}
+        finally:
+            for batch in waiting:
+                self._waiters[batch] -= 1
+                if self._waiters[batch] <= 0:
+                    del self._waiters[batch]
+                    # 結果を待つリクエストがいなくなった読み込みは中止する
+                    batch.cancel()
+
+        return {key: results[batch].get(key) for key, batch in batches.items()}
+
+    def _finish(self, keys: list[str], batch: asyncio.Task[dict[str, V]]) -> None:
+        """完了した読み込みを読み込み中の一覧から削除"""
+        for key in keys:
+            if self._pending.get(key) is batch:
+                del self._pending[key]
+        if not batch.cancelled():
+            # 待機者がすべてキャンセルされた場合の未取得警告を抑止
+            batch.exception()
+
+    def stats(self) -> dict[str, Any]:
+        """クエリ回数・共有されたID数などの統計情報"""
+        return {
+            "batches": self.batches,
+            "keys_loaded": self.keys_loaded,
+            "keys_coalesced": self.keys_coalesced,
+            "in_flight": len(self._pending),
+        }
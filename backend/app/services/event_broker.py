@@ -0,0 +1,152 @@
+"""
+変更イベントのプロセス内配信（Pub/Sub）
+プロジェクトごとのトピックに発行されたイベントを購読者ごとのキューに配信する
+"""
+
+import asyncio
+import itertools
+import logging
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """変更イベント"""
+
+    id: int
+    type: str
+    project_id: str
+    data: dict[str, Any]
+
+
+@dataclass(eq=False)
+class Subscription:
+    """購読（購読者ごとの上限付きキュー）
+
+    キューが満杯になった購読者（処理の遅いクライアント）は配信対象から外し、
+    dropped を True にして以降のイベントを受け取らない
+    """
+
+    project_id: str | None
+    queue: asyncio.Queue[ChangeEvent | None]
+    dropped: bool = False
+
+    async def get(self) -> ChangeEvent | None:
+        """
+        次のイベントを待つ
+
+        Returns:
+            イベント（配信対象から外された・配信が終了した場合はNone）
+        """
+        return await self.queue.get()
+
+
+class EventBroker:
+    """プロジェクトごとのトピックを持つプロセス内のイベント配信
+
+    発行は購読者のキューへの追加のみで待機しないため、書き込み処理を遅らせない。
+    プロセス内の配信のため、複数ワーカーで起動した場合は同じワーカーで
+    発生した変更のみが配信される
+    """
+
+    def __init__(self, queue_size: int):
+        """
+        Args:
+            queue_size: 購読者ごとに保持する未送信イベントの上限
+        """
+        self.queue_size = queue_size
+        # プロジェクトID → 購読（None は全プロジェクトの購読）
+        self._topics: dict[str | None, set[Subscription]] = {}
+        self._ids = itertools.count(1)
+        self.published: Counter[str] = Counter()
+        self.delivered = 0
+        self.dropped_subscribers = 0
+
+    def subscribe(self, project_id: str | None = None) -> Subscription:
+        """
+        購読を開始
+
+        Args:
+            project_id: 購読するプロジェクトID（Noneの場合は全プロジェクト）
+
+        Returns:
+            購読（終了時は unsubscribe を呼ぶこと）
+        """
+        subscription = Subscription(project_id, asyncio.Queue(self.queue_size + 1))
+        self._topics.setdefault(project_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """
+        購読を終了
+
+        Args:
+            subscription: 購読
+        """
+        subscribers = self._topics.get(subscription.project_id)
+        if subscribers is None:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del self._topics[subscription.project_id]
+
+    def publish(
+        self, event_type: str, project_id: str, data: dict[str, Any]
+    ) -> ChangeEvent:
+        """
+        プロジェクトのトピックと全プロジェクトの購読者にイベントを配信
+
+        Args:
+            event_type: イベント種別
+            project_id: プロジェクトID
+            data: イベントの内容（JSONに変換可能な値）
+
+        Returns:
+            発行したイベント
+        """
+        event = ChangeEvent(next(self._ids), event_type, project_id, data)
+        self.published[event_type] += 1
+
+        for topic in (project_id, None):
+            for subscription in list(self._topics.get(topic, ())):
+                if subscription.queue.qsize() >= self.queue_size:
+                    self._drop(subscription)
+                else:
+                    subscription.queue.put_nowait(event)
+                    self.delivered += 1
+        return event
+
+    def _drop(self, subscription: Subscription) -> None:
+        """未送信イベントが上限に達した購読者を配信対象から外す"""
+        logger.warning(
+            f"Dropping slow event subscriber (project={subscription.project_id}, "
+            f"pending={subscription.queue.qsize()})"
+        )
+        self.unsubscribe(subscription)
+        subscription.dropped = True
+        self.dropped_subscribers += 1
+        # 上限より1件多い容量を確保しているため、終了の通知は必ず追加できる
+        subscription.queue.put_nowait(None)
+
+    def close(self) -> None:
+        """すべての購読者に配信の終了を通知（終了時）"""
+        for subscribers in list(self._topics.values()):
+            for subscription in subscribers:
+                subscription.queue.put_nowait(None)
+        self._topics.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """購読者数・発行数・配信数・配信対象から外した購読者数"""
+        return {
+            "subscribers": sum(
+                len(subscribers) for subscribers in self._topics.values()
+            ),
+            "topics": len(self._topics),
+            "published": dict(self.published),
+            "delivered": self.delivered,
+            "dropped_subscribers": self.dropped_subscribers,
+        }
@@ -0,0 +1,265 @@
+"""
+レイアウトフィンガープリントキャッシュ
+施工会社ごとに固定された工程表レイアウトを記憶し、同じレイアウトのPDFでは
+表検出を省略して、学習済みの列境界で切り出したテキストから表を復元する
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+
+import fitz  # PyMuPDF
+import numpy as np
+
+from app.services.table_grid import (
+    SNAP_TOLERANCE,
+    DetectedTable,
+    cluster_lines,
+    collect_segments,
+    extract_cells,
+)
+
+logger = logging.getLogger(__name__)
+
+# グリッドシグネチャの座標の丸め単位（pt）
+SIGNATURE_GRID = 2.0
+
+
+@dataclass
+class LayoutTemplate:
+    """学習済みの表レイアウト"""
+
+    bbox: tuple[float, float, float, float]  # 初回検出時の表の矩形
+    column_bounds: list[float]  # 列境界のx座標（昇順）
+    header: list[str]  # ヘッダー行のテキスト
+
+
+@dataclass(eq=False)
+class PageFingerprint:
+    """ページのレイアウトフィンガープリント"""
+
+    key: str  # ページサイズ + 罫線グリッドのシグネチャ
+    segments: tuple[np.ndarray, np.ndarray] = field(repr=False)  # 抽出済みの線分
+
+
+def _normalize_cell(text: str | None) -> str:
+    """比較用にセルの空白・制御文字を正規化"""
+    printable = "".join(ch for ch in (text or "") if ch.isprintable() or ch.isspace())
+    return " ".join(printable.split())
+
+
+def compute_fingerprint(page: fitz.Page) -> PageFingerprint:
+    """
+    ページのレイアウトフィンガープリントを計算
+
+    ページサイズと垂直罫線のx座標（行数に依存しない列構造）から算出する
+
+    Args:
+        page: 対象ページ
+
+    Returns:
+        フィンガープリント（抽出した線分は表検出で再利用できる）
+    """
+    segments = collect_segments(page.get_drawings())
+    vertical = segments[1]
+
+    column_signature = np.unique(np.round(vertical[:, 0] / SIGNATURE_GRID)).astype(int)
+    raw_key = (
+        f"{round(page.rect.width)}x{round(page.rect.height)}:"
+        f"{','.join(map(str, column_signature))}"
+    )
+    key = hashlib.sha1(raw_key.encode()).hexdigest()
+
+    return PageFingerprint(key=key, segments=segments)
+
+
+def extract_with_template(
+    page: fitz.Page, template: LayoutTemplate, horizontal: np.ndarray
+) -> list[list[str]] | None:
+    """
+    学習済みの列境界で表領域のテキストを切り出して表データを復元
+
+    列構造の解析は行わず、行境界には表の幅いっぱいの水平罫線のみを使う
+
+    Args:
+        page: 対象ページ
+        template: 学習済みレイアウト
+        horizontal: ページの水平線分 [y, x0, x1]
+
+    Returns:
+        表データ（ヘッダー行を含む）、レイアウトが一致しない場合はNone
+    """
+    if len(horizontal) < 2:
+        return None
+
+    left, top, right, _ = template.bbox
+
+    # 表の幅いっぱいの水平罫線を行境界とする（行数はPDFごとに異なる）
+    positions, starts, ends, _ = cluster_lines(horizontal)
+    spans_table = (
+        (starts <= left + SNAP_TOLERANCE)
+        & (ends >= right - SNAP_TOLERANCE)
+        & (positions >= top - SNAP_TOLERANCE)
+    )
+    row_bounds = positions[spans_table]
+    if len(row_bounds) < 3:  # ヘッダー + 最低1行
+        return None
+
+    rows = extract_cells(page, row_bounds, np.asarray(template.column_bounds))
+
+    # ヘッダーが一致しない場合は別レイアウトとみなす
+    if [_normalize_cell(cell) for cell in rows[0]] != template.header:
+        return None
+
+    return rows
+
+
+class LayoutCache:
+    """
+    フィンガープリント → 表レイアウトのLRUキャッシュ
+
+    永続化ファイルへの書き込みは学習のたびには行わず、最初の学習から save_delay 秒後に
+    別スレッドでまとめて行う（終了時は flush() で未保存の学習結果を書き込む）
+    """
+
+    def __init__(
+        self, max_size: int = 256, path: str | None = None, save_delay: float = 5.0
+    ):
+        """
+        Args:
+            max_size: 保持するレイアウト数の上限
+            path: 永続化先のJSONファイル（Noneの場合はメモリのみ）
+            save_delay: 学習から永続化ファイルに書き込むまでの待ち時間（秒）
+        """
+        self.max_size = max_size
+        self.path = path
+        self.save_delay = save_delay
+        self.hits = 0
+        self.misses = 0
+        self._templates: OrderedDict[str, LayoutTemplate] = OrderedDict()
+        self._lock = threading.Lock()
+        # 書き込みの直列化（古い内容で新しい内容を上書きしないよう、取得から書き込みまで保持）
+        self._save_lock = threading.Lock()
+        self._dirty = False
+        self._save_timer: threading.Timer | None = None
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+    def _load(self) -> None:
+        """永続化ファイルから学習済みレイアウトを読み込む"""
+        if not self.path or not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                stored = json.load(f)
+            for key, value in list(stored.items())[-self.max_size :]:
+                self._templates[key] = LayoutTemplate(
+                    bbox=tuple(value["bbox"]),
+                    column_bounds=value["column_bounds"],
+                    header=value["header"],
+                )
+            logger.info(f"Loaded {len(self._templates)} layout templates")
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Failed to load layout cache: {e}")
+
+    def _schedule_save(self) -> None:
+        """永続化ファイルへの書き込みを予約（ロック取得中に呼び出す）"""
+        self._dirty = True
+        if not self.path or self._save_timer is not None:
+            return
+        self._save_timer = threading.Timer(self.save_delay, self.flush)
+        self._save_timer.daemon = True
+        self._save_timer.start()
+
+    def flush(self) -> None:
+        """未保存の学習済みレイアウトを永続化ファイルに書き込む"""
+        if not self.path:
+            return
+
+        with self._save_lock:
+            with self._lock:
+                if self._save_timer is not None:
+                    self._save_timer.cancel()
+                    self._save_timer = None
+                if not self._dirty:
+                    return
+                snapshot = {
+                    key: asdict(value) for key, value in self._templates.items()
+                }
+                self._dirty = False
+
+            try:
+                temp_path = f"{self.path}.tmp"
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    json.dump(snapshot, f, ensure_ascii=False)
+                os.replace(temp_path, self.path)
+            except OSError as e:
+                logger.warning(f"Failed to save layout cache: {e}")
+                with self._lock:
+                    # 次回の flush() で再度書き込む
+                    self._dirty = True
+
+    def extract(
+        self, page: fitz.Page, fingerprint: PageFingerprint
+    ) -> list[list[str]] | None:
+        """
+        学習済みレイアウトで表データを抽出（表検出を省略）
+
+        Args:
+            page: 対象ページ
+            fingerprint: ページのフィンガープリント
+
+        Returns:
+            表データ、未学習またはレイアウト不一致の場合はNone
+        """
+        with self._lock:
+            template = self._templates.get(fingerprint.key)
+            if template is not None:
+                self._templates.move_to_end(fingerprint.key)
+
+        table_data = None
+        if template is not None:
+            table_data = extract_with_template(page, template, fingerprint.segments[0])
+
+        with self._lock:
+            if table_data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if table_data is not None:
+            logger.info(f"Layout cache hit: {fingerprint.key[:12]}")
+        return table_data
+
+    def learn(self, fingerprint: PageFingerprint, table: DetectedTable) -> None:
+        """
+        表検出に成功したレイアウトを記憶
+
+        Args:
+            fingerprint: ページのフィンガープリント
+            table: 検出された表
+        """
+        if self.max_size <= 0 or not table.data:
+            return
+
+        template = LayoutTemplate(
+            bbox=table.bbox,
+            column_bounds=table.column_bounds,
+            header=[_normalize_cell(cell) for cell in table.data[0]],
+        )
+
+        with self._lock:
+            self._templates[fingerprint.key] = template
+            self._templates.move_to_end(fingerprint.key)
+            while len(self._templates) > self.max_size:
+                self._templates.popitem(last=False)
+            self._schedule_save()
+
+        logger.info(f"Layout template learned: {fingerprint.key[:12]}")
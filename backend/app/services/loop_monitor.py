@@ -0,0 +1,255 @@
+"""
+イベントループの停止（ブロッキング）の検出
+同期I/O（Supabaseクライアント）やPDF処理がイベントループを止めた時間を常時計測し、
+メトリクスとリクエストのルートごとの最大停止時間に記録する
+
+- ハートビート: 一定間隔で asyncio.sleep し、予定より遅れて再開した時間を遅延として記録
+- ウォッチドッグ: 別スレッドからハートビートの遅れを監視し、しきい値を超えた時点で
+  イベントループのスレッドのスタック（ブロックしている処理）をログに出力
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import traceback
+from collections import deque
+from time import perf_counter
+from typing import Any
+
+from app.config import settings
+from app.services.metrics import STAGE_BUCKETS, registry
+
+logger = logging.getLogger(__name__)
+
+LOOP_LAG_SECONDS = registry.histogram(
+    "event_loop_lag_seconds",
+    "Delay of the event loop heartbeat (time the loop was blocked)",
+    (),
+    STAGE_BUCKETS,
+)
+LOOP_STALLS = registry.counter(
+    "event_loop_stalls_total", "Event loop stalls longer than the threshold"
+)
+REQUEST_LOOP_STALL_SECONDS = registry.histogram(
+    "http_request_loop_stall_seconds",
+    "Longest event loop stall observed while each request was in progress",
+    ("method", "route"),
+    STAGE_BUCKETS,
+)
+
+
+class RequestWatch:
+    """処理中の1リクエストの間に観測したイベントループの最大停止時間"""
+
+    __slots__ = ("label", "started", "max_stall")
+
+    def __init__(self, label: str, started: float):
+        self.label = label
+        self.started = started
+        self.max_stall = 0.0
+
+
+class LoopMonitor:
+    """
+    イベントループの遅延の計測と停止の検出
+
+    使用例（ルートごとに「X ms を超える停止がない」ことを確認する）:
+        monitor.reset()
+        ... リクエストを送る ...
+        assert monitor.route_stats()["GET /api/v1/projects/{project_id}"]["max_stall_ms"] < 50
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.05,
+        stall_threshold: float = 0.1,
+        max_reports: int = 20,
+    ):
+        """
+        Args:
+            interval: ハートビートの間隔（秒）
+            stall_threshold: 停止としてスタックを出力するしきい値（秒）
+            max_reports: 保持する直近の停止の報告数
+        """
+        self.interval = interval
+        self.stall_threshold = stall_threshold
+        self.reports: deque[dict[str, Any]] = deque(maxlen=max_reports)
+        self._requests: set[RequestWatch] = set()
+        self._routes: dict[str, dict[str, float]] = {}
+        self._task: asyncio.Task[None] | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._loop_thread_id = 0
+        # 次のハートビートの予定時刻（起動前・停止後はNone）
+        self._expected: float | None = None
+        self._dumped_for: float | None = None
+        self.max_lag = 0.0
+        self.stalls = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self) -> None:
+        """実行中のイベントループ上で計測を開始"""
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._expected = perf_counter() + self.interval
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._stop.clear()
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-watchdog", daemon=True
+        )
+        self._watchdog.start()
+        logger.info(
+            f"Event loop monitor started: interval_ms={self.interval * 1000:.0f} "
+            f"stall_threshold_ms={self.stall_threshold * 1000:.0f}"
+        )
+
+    async def stop(self) -> None:
+        """計測を停止"""
+        if self._task is None:
+            return
+        self._stop.set()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._expected = None
+        if self._watchdog is not None:
+            await asyncio.to_thread(self._watchdog.join)
+            self._watchdog = None
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            now = perf_counter()
+            expected = self._expected if self._expected is not None else now
+            self._record(max(0.0, now - expected), now)
+            self._expected = now + self.interval
+
+    def _record(self, lag: float, now: float) -> None:
+        """ハートビートの遅延を記録し、処理中のリクエストに停止時間として反映"""
+        LOOP_LAG_SECONDS.observe(lag)
+        self.max_lag = max(self.max_lag, lag)
+        for watch in self._requests:
+            # リクエストの開始前から続いていた停止は含めない
+            watch.max_stall = max(watch.max_stall, min(lag, now - watch.started))
+        if lag >= self.stall_threshold:
+            self.stalls += 1
+            LOOP_STALLS.inc()
+            logger.warning(
+                f"Event loop stalled: lag_ms={lag * 1000:.2f} "
+                f"requests={self._in_flight_labels(since=now - lag)}"
+            )
+
+    def _watch(self) -> None:
+        """ウォッチドッグ（別スレッド）: 停止中のイベントループのスタックを出力"""
+        period = min(self.interval, self.stall_threshold / 2)
+        while not self._stop.wait(period):
+            expected = self._expected
+            if expected is None or expected == self._dumped_for:
+                continue
+            blocked = perf_counter() - expected
+            if blocked < self.stall_threshold:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            # 同じ停止についてはスタックを1回だけ出力
+            self._dumped_for = expected
+            stack = "".join(traceback.format_stack(frame))
+            requests = self._in_flight_labels()
+            self.reports.append(
+                {
+                    "blocked_ms": round(blocked * 1000, 2),
+                    "requests": requests,
+                    "stack": stack,
+                }
+            )
+            logger.warning(
+                f"Event loop blocked for {blocked * 1000:.0f} ms "
+                f"(requests={requests}), stack:\n{stack}"
+            )
+
+    def _in_flight_labels(self, since: float | None = None) -> list[str]:
+        """処理中のリクエスト（since 指定時はその時刻より前に開始したもののみ）"""
+        return sorted(
+            watch.label
+            for watch in list(self._requests)
+            if since is None or watch.started < since
+        )
+
+    def watch_request(self, label: str) -> RequestWatch:
+        """
+        リクエストの停止時間の記録を開始
+
+        Args:
+            label: ログ・停止の報告に出力するリクエストの表示（例: GET /api/v1/projects/...）
+        """
+        watch = RequestWatch(label, perf_counter())
+        self._requests.add(watch)
+        return watch
+
+    def finish_request(self, watch: RequestWatch, route: str) -> float:
+        """
+        リクエストの停止時間の記録を終了し、ルートごとの集計に追加
+
+        Args:
+            watch: watch_request() の戻り値
+            route: 集計に使うルート（例: GET /api/v1/projects/{project_id}）
+
+        Returns:
+            リクエスト中に観測したイベントループの最大停止時間（秒）
+        """
+        self._requests.discard(watch)
+        stall = watch.max_stall
+        if self._expected is not None:
+            # ハートビートがまだ再開していない停止（リクエストの開始以降の分）も含める
+            now = perf_counter()
+            stall = max(stall, now - max(self._expected, watch.started))
+
+        stats = self._routes.get(route)
+        if stats is None:
+            stats = self._routes[route] = {"requests": 0, "max_stall": 0.0}
+        stats["requests"] += 1
+        stats["max_stall"] = max(stats["max_stall"], stall)
+        return stall
+
+    def route_stats(self) -> dict[str, dict[str, float]]:
+        """ルート（メソッドとパステンプレート）ごとのリクエスト数・最大停止時間（ミリ秒）"""
+        return {
+            route: {
+                "requests": stats["requests"],
+                "max_stall_ms": round(stats["max_stall"] * 1000, 2),
+            }
+            for route, stats in sorted(self._routes.items())
+        }
+
+    def stats(self) -> dict[str, Any]:
+        """計測中か・最大遅延（ミリ秒）・しきい値を超えた停止の回数・直近の停止の報告"""
+        return {
+            "running": self.running,
+            "max_lag_ms": round(self.max_lag * 1000, 2),
+            "stalls": self.stalls,
+            "stall_threshold_ms": self.stall_threshold * 1000,
+            "reports": list(self.reports),
+        }
+
+    def reset(self) -> None:
+        """集計をリセット（エンドポイントごとに確認する場合など）"""
+        self._routes.clear()
+        self.reports.clear()
+        self.max_lag = 0.0
+        self.stalls = 0
+
+
+# プロセス内で共有する検出（LOOP_MONITOR_ENABLED=true の場合に起動時に開始）
+loop_monitor = LoopMonitor(
+    interval=settings.loop_monitor_interval_ms / 1000,
+    stall_threshold=settings.loop_stall_threshold_ms / 1000,
+)
@@ -0,0 +1,340 @@
+"""
+メトリクス（Prometheusのテキスト形式で公開）
+リクエスト数・処理時間のヒストグラム・ゲージをプロセス内で集計する
+
+記録はdictと整数の更新のみを行い（ロックなし）、
+キャッシュサイズなどのゲージは公開時にコールバックで取得するため、処理中の負荷はほぼない
+（PDFの処理段階は専用スレッドでも記録されるため、公開時は系列の一覧を複製してから出力する）
+"""
+
+import inspect
+import logging
+from bisect import bisect_left
+from collections.abc import Awaitable, Callable, Iterable
+from time import perf_counter
+from typing import Any, cast
+
+from app.repositories.base import ScheduleRepository
+from app.services.request_timing import record_timing
+
+logger = logging.getLogger(__name__)
+
+# HTTPリクエストの処理時間のバケット（秒）
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# 処理段階・データベース呼び出しの処理時間のバケット（秒）
+STAGE_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+)
+
+Labels = tuple[str, ...]
+
+
+class Counter:
+    """単調増加するカウンター"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Labels = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        """ラベルの値（labelnames の順）の系列に加算"""
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def samples(self) -> Iterable[tuple[str, Labels, Labels, float]]:
+        for labels, value in list(self._values.items()):
+            yield self.name, self.labelnames, labels, value
+
+
+class Gauge(Counter):
+    """増減する値"""
+
+    kind = "gauge"
+
+    def set(self, value: float, *labels: str) -> None:
+        self._values[labels] = value
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class GaugeCallback:
+    """公開時にコールバックで値を取得するゲージ（処理中には何も記録しない）"""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Labels,
+        callback: Callable[[], dict[Labels, float]],
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.callback = callback
+
+    def samples(self) -> Iterable[tuple[str, Labels, Labels, float]]:
+        try:
+            values = self.callback()
+        except Exception as e:
+            logger.warning(f"Metrics callback failed ({self.name}): {e}")
+            return
+        for labels, value in values.items():
+            yield self.name, self.labelnames, labels, value
+
+
+class _HistogramSeries:
+    """ヒストグラムの1系列（バケットごとの件数は公開時に累積する）"""
+
+    __slots__ = ("counts", "total")
+
+    def __init__(self, size: int):
+        self.counts = [0] * size
+        self.total = 0.0
+
+
+class Histogram:
+    """処理時間などの分布"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Labels = (),
+        buckets: tuple[float, ...] = REQUEST_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self._series: dict[Labels, _HistogramSeries] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        """ラベルの値（labelnames の順）の系列に1件記録"""
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = _HistogramSeries(len(self.buckets) + 1)
+        series.counts[bisect_left(self.buckets, value)] += 1
+        series.total += value
+
+    def samples(self) -> Iterable[tuple[str, Labels, Labels, float]]:
+        bucket_labelnames = (*self.labelnames, "le")
+        bounds = [_format_value(bound) for bound in self.buckets] + ["+Inf"]
+        for labels, series in list(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(bounds, series.counts, strict=True):
+                cumulative += count
+                yield (
+                    f"{self.name}_bucket",
+                    bucket_labelnames,
+                    (*labels, bound),
+                    cumulative,
+                )
+            yield f"{self.name}_sum", self.labelnames, labels, series.total
+            yield f"{self.name}_count", self.labelnames, labels, cumulative
+
+
+Metric = Counter | GaugeCallback | Histogram
+
+
+class MetricsRegistry:
+    """メトリクスの登録とPrometheusのテキスト形式での出力"""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Labels = ()
+    ) -> Counter:
+        counter = Counter(name, documentation, labelnames)
+        self.register(counter)
+        return counter
+
+    def gauge(self, name: str, documentation: str, labelnames: Labels = ()) -> Gauge:
+        gauge = Gauge(name, documentation, labelnames)
+        self.register(gauge)
+        return gauge
+
+    def gauge_callback(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Labels,
+        callback: Callable[[], dict[Labels, float]],
+    ) -> GaugeCallback:
+        gauge = GaugeCallback(name, documentation, labelnames, callback)
+        self.register(gauge)
+        return gauge
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Labels = (),
+        buckets: tuple[float, ...] = REQUEST_BUCKETS,
+    ) -> Histogram:
+        histogram = Histogram(name, documentation, labelnames, buckets)
+        self.register(histogram)
+        return histogram
+
+    def render(self) -> str:
+        """Prometheusのテキスト形式（text/plain; version=0.0.4）で出力"""
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labelnames, labels, value in metric.samples():
+                lines.append(
+                    f"{name}{_format_labels(labelnames, labels)} {_format_value(value)}"
+                )
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labelnames: Labels, labels: Labels) -> str:
+    if not labelnames:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(value)}"'
+        for name, value in zip(labelnames, labels, strict=True)
+    )
+    return f"{{{pairs}}}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+# プロセス内で共有するレジストリと標準のメトリクス
+registry = MetricsRegistry()
+
+HTTP_REQUESTS = registry.counter(
+    "http_requests_total", "HTTP requests by route", ("method", "route", "status")
+)
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route",
+    ("method", "route"),
+)
+HTTP_REQUESTS_IN_PROGRESS = registry.gauge(
+    "http_requests_in_progress", "HTTP requests being processed"
+)
+PDF_STAGE_SECONDS = registry.histogram(
+    "pdf_stage_duration_seconds",
+    "PDF processing stage latency (upload_read, preflight, pdf_open, "
+    "table_detection, row_normalization, schedule_rows, render, pdf_save)",
+    ("stage",),
+    STAGE_BUCKETS,
+)
+PDF_PREFLIGHT_RESULTS = registry.counter(
+    "pdf_preflight_total",
+    "PDF pre-flight results (ok, routed_text_strategy or the rejection reason code)",
+    ("result",),
+)
+DB_CALL_SECONDS = registry.histogram(
+    "db_call_duration_seconds",
+    "Database call latency by repository method",
+    ("operation",),
+    STAGE_BUCKETS,
+)
+
+
+class StageTimer:
+    """
+    処理段階の所要時間を計測するコンテキストマネージャー
+    （pdf_stage_duration_seconds と、処理中のリクエストの Server-Timing に記録）
+
+    使用例:
+        with StageTimer("pdf_open"):
+            doc = open_pdf(pdf_content)
+    """
+
+    __slots__ = ("stage", "started")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self.started = 0.0
+
+    def __enter__(self) -> "StageTimer":
+        self.started = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        elapsed = perf_counter() - self.started
+        PDF_STAGE_SECONDS.observe(elapsed, self.stage)
+        record_timing(self.stage, elapsed)
+
+
+class InstrumentedRepository:
+    """リポジトリの非同期メソッドの呼び出しごとの所要時間を記録するラッパー"""
+
+    def __init__(self, repository: ScheduleRepository):
+        self._repository = repository
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._repository, name)
+        if not inspect.iscoroutinefunction(attribute):
+            return attribute
+
+        timed = _timed_call(attribute, name)
+        # 次回からは __getattr__ を経由しない
+        setattr(self, name, timed)
+        return timed
+
+
+def instrument_repository(repository: ScheduleRepository) -> ScheduleRepository:
+    """
+    データベース呼び出しの所要時間を db_call_duration_seconds と
+    処理中のリクエストの Server-Timing（db.<メソッド名>）に記録する
+
+    Args:
+        repository: リポジトリ（Supabase / PostgreSQL）
+
+    Returns:
+        同じインターフェースのリポジトリ
+    """
+    return cast(ScheduleRepository, InstrumentedRepository(repository))
+
+
+def _timed_call(
+    method: Callable[..., Awaitable[Any]], operation: str
+) -> Callable[..., Awaitable[Any]]:
+    async def call(*args: Any, **kwargs: Any) -> Any:
+        started = perf_counter()
+        try:
+            return await method(*args, **kwargs)
+        finally:
+            elapsed = perf_counter() - started
+            DB_CALL_SECONDS.observe(elapsed, operation)
+            record_timing(f"db.{operation}", elapsed)
+
+    return call
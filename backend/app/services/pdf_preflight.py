@@ -0,0 +1,137 @@
+"""
+PDF事前検査（プリフライト）
+表検出などの重い処理の前に、暗号化・テキストレイヤー・罫線の有無を
+1ページ目だけで数ミリ秒で確認し、解析できないPDFを早期に却下する
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+
+import fitz  # PyMuPDF
+
+from app.schemas.pdf import PDFPreflightError, PreflightReason
+from app.services.metrics import PDF_PREFLIGHT_RESULTS
+
+logger = logging.getLogger(__name__)
+
+# 却下理由ごとのメッセージ
+REJECTION_MESSAGES = {
+    PreflightReason.UNREADABLE: "PDFファイルとして読み込めませんでした",
+    PreflightReason.ENCRYPTED: "パスワード保護されたPDFは解析できません",
+    PreflightReason.NO_PAGES: "PDFにページが含まれていません",
+    PreflightReason.IMAGE_ONLY: (
+        "スキャン画像のみのPDFは解析できません（テキストを含むPDFを使用してください）"
+    ),
+    PreflightReason.NO_TEXT_LAYER: "PDFにテキストが含まれていません",
+}
+
+
+@dataclass
+class PreflightResult:
+    """事前検査の結果"""
+
+    page_count: int
+    word_count: int  # 1ページ目の単語数
+    drawing_count: int  # 1ページ目のベクター描画数
+    image_count: int  # 1ページ目の画像数
+    elapsed_ms: float
+
+    @property
+    def has_ruling(self) -> bool:
+        """罫線（ベクター描画）があるか"""
+        return self.drawing_count > 0
+
+
+def _reject(reason: PreflightReason) -> PDFPreflightError:
+    """却下を記録（pdf_preflight_total）して例外を作成"""
+    PDF_PREFLIGHT_RESULTS.inc(reason.value)
+    logger.warning(f"PDF rejected by preflight: {reason.value}")
+    return PDFPreflightError(reason, REJECTION_MESSAGES[reason])
+
+
+def open_pdf(pdf_content: bytes) -> fitz.Document:
+    """
+    PDFを開く（開けない場合は事前検査エラー）
+
+    Args:
+        pdf_content: PDFファイルのバイトデータ
+
+    Returns:
+        PDFドキュメント
+
+    Raises:
+        PDFPreflightError: PDFとして開けない場合
+    """
+    try:
+        return fitz.open(stream=pdf_content, filetype="pdf")
+    except Exception as e:
+        logger.warning(f"Failed to open PDF: {e}")
+        raise _reject(PreflightReason.UNREADABLE) from e
+
+
+def inspect_document(doc: fitz.Document) -> PreflightResult:
+    """
+    PDFを事前検査し、解析できないものを却下
+
+    Args:
+        doc: PDFドキュメント
+
+    Returns:
+        事前検査の結果
+
+    Raises:
+        PDFPreflightError: 解析できないPDFの場合
+    """
+    started = time.perf_counter()
+
+    if doc.needs_pass:
+        raise _reject(PreflightReason.ENCRYPTED)
+
+    if doc.page_count == 0:
+        raise _reject(PreflightReason.NO_PAGES)
+
+    page = doc[0]
+    word_count = len(page.get_text("words"))
+    image_count = len(page.get_images())
+
+    if word_count == 0:
+        if image_count > 0:
+            raise _reject(PreflightReason.IMAGE_ONLY)
+        raise _reject(PreflightReason.NO_TEXT_LAYER)
+
+    result = PreflightResult(
+        page_count=doc.page_count,
+        word_count=word_count,
+        drawing_count=len(page.get_cdrawings()),
+        image_count=image_count,
+        elapsed_ms=(time.perf_counter() - started) * 1000,
+    )
+
+    PDF_PREFLIGHT_RESULTS.inc("ok" if result.has_ruling else "routed_text_strategy")
+    logger.info(
+        f"Preflight passed in {result.elapsed_ms:.1f}ms: "
+        f"pages={result.page_count}, words={result.word_count}, "
+        f"drawings={result.drawing_count}, images={result.image_count}"
+    )
+    return result
+
+
+def preflight_pdf(pdf_content: bytes) -> PreflightResult:
+    """
+    PDFを開いて事前検査する（データベースへの問い合わせなどの前に実行する）
+
+    Args:
+        pdf_content: PDFファイルのバイトデータ
+
+    Returns:
+        事前検査の結果
+
+    Raises:
+        PDFPreflightError: PDFとして開けない、または解析できないPDFの場合
+    """
+    doc = open_pdf(pdf_content)
+    try:
+        return inspect_document(doc)
+    finally:
+        doc.close()
@@ -13,7 +13,7 @@ from typing import Any
 from uuid import UUID
 
 import fitz  # PyMuPDF
-from supabase import Client
+import numpy as np
 
 from app.schemas.pdf import (
     PDFGenerationError,
@@ -21,11 +21,64 @@ from app.schemas.pdf import (
     PDFUploadError,
     ProjectInfoForPDF,
     ProjectNotFoundError,
-    ScheduleItemForPDF,
+    ScheduleRow,
+    TableEngine,
 )
+from app.services.layout_cache import LayoutCache, compute_fingerprint
+from app.services.metrics import StageTimer
+from app.services.pdf_preflight import (
+    PreflightResult,
+    inspect_document,
+    open_pdf,
+    preflight_pdf,
+)
+from app.services.pdf_worker import run_pdf_task
+from app.services.supabase_service import SupabaseService
+from app.services.table_grid import DetectedTable, detect_ruled_table
 
 logger = logging.getLogger(__name__)
 
+# 対応する日付フォーマット（YY/MM/DD, YYYY/MM/DD, YYYY-MM-DD）を1つのパターンで判定
+DATE_PATTERN = re.compile(r"^(\d{2}|\d{4})([/-])(\d{1,2})\2(\d{1,2})$")
+
+# 工程表PDFの列数（工程名〜備考）
+SCHEDULE_COLUMN_COUNT = 8
+
+
+@lru_cache(maxsize=4096)
+def parse_date_text(date_str: str) -> date | None:
+    """
+    日付文字列を解析してdateオブジェクトに変換（メモ化有効）
+
+    工程表では同じ日付が何度も現れるため、解析結果をキャッシュする
+
+    Args:
+        date_str: 前後の空白を除去済みの日付文字列
+
+    Returns:
+        dateオブジェクト、または解析失敗時はNone
+    """
+    match = DATE_PATTERN.match(date_str)
+    if not match:
+        return None
+
+    year_str, separator, month_str, day_str = match.groups()
+
+    # YY-MM-DD形式は非対応
+    if len(year_str) == 2 and separator != "/":
+        return None
+
+    try:
+        year = int(year_str)
+        if len(year_str) == 2:
+            # 2000年代として解釈
+            year = 2000 + year if year < 50 else 1900 + year
+        return date(year, int(month_str), int(day_str))
+
+    except ValueError as e:
+        logger.warning(f"Date parsing failed for '{date_str}': {e}")
+        return None
+
 
 class PDFGenerationService:
     """PDF生成サービスクラス"""
@@ -62,8 +115,35 @@ class PDFGenerationService:
     COLUMN_WIDTHS = [80, 50, 50, 50, 50, 60, 45, 120]  # 8列の幅設定
     ROW_HEIGHT = 40
 
-    def __init__(self):
-        """初期化"""
+    # ステータスマッピング（表記揺れの正規化）
+    STATUS_MAPPING = {
+        "未着手": "未着手",
+        "進行中": "進行中",
+        "完了": "完了",
+        "遅延": "遅延",
+        "中断": "中断",
+        # よくある表記揺れ
+        "着手前": "未着手",
+        "未開始": "未着手",
+        "実施中": "進行中",
+        "作業中": "進行中",
+        "終了": "完了",
+        "完成": "完了",
+        "済": "完了",
+        "済み": "完了",
+        "遅れ": "遅延",
+        "停止": "中断",
+        "保留": "中断",
+    }
+
+    def __init__(self, layout_cache: LayoutCache | None = None):
+        """
+        初期化
+
+        Args:
+            layout_cache: レイアウトフィンガープリントキャッシュ（Noneの場合は無効）
+        """
+        self.layout_cache = layout_cache
         self.font_path = self._get_available_font()
         logger.info(f"PDFGenerationService initialized with font: {self.font_path}")
 
@@ -116,7 +196,7 @@ class PDFGenerationService:
                 use_japanese_font = False
 
             # 現在の描画位置
-            y_pos = self.MARGIN_TOP
+            y_pos: float = self.MARGIN_TOP
 
             # タイトルセクション
             y_pos = self._draw_title_section(
@@ -185,7 +265,7 @@ class PDFGenerationService:
     def _draw_schedule_table(
         self,
         page: fitz.Page,
-        schedule_items: list[ScheduleItemForPDF],
+        schedule_items: list[ScheduleRow],
         start_y: float,
         font_name: str,
         use_japanese_font: bool,
@@ -316,11 +396,14 @@ class PDFGenerationService:
             )
 
             # PDF文書作成
-            doc = self._create_pdf_structure(schedule_data)
+            with StageTimer("render"):
+                doc = self._create_pdf_structure(schedule_data)
 
             # バイトストリームに出力
+            # （/ID を固定し、同じ入力からは同じバイト列を生成する。ETagの前提）
             pdf_stream = BytesIO()
-            doc.save(pdf_stream)
+            with StageTimer("pdf_save"):
+                doc.save(pdf_stream, no_new_id=True)
             doc.close()
 
             pdf_bytes = pdf_stream.getvalue()
@@ -356,160 +439,278 @@ class PDFGenerationService:
 
         return f"schedule_{project_number}_v{version}_{timestamp}.pdf"
 
-    def _parse_date(self, date_str: str) -> date | None:
-        """
-        日付文字列を解析してdateオブジェクトに変換
+    def _normalize_date_column(
+        self, column: tuple[str | None, ...]
+    ) -> list[date | None]:
+        """日付列を一括で解析（列内の重複した文字列は1回だけ解析）"""
+        parsed = {
+            value: (
+                parse_date_text(value.strip())
+                if value and isinstance(value, str)
+                else None
+            )
+            for value in set(column)
+        }
+        return [parsed[value] for value in column]
+
+    def _normalize_status_column(self, column: tuple[str | None, ...]) -> list[str]:
+        """ステータス列を一括で正規化"""
+        mapping = self.STATUS_MAPPING
+        return [
+            (
+                mapping.get(value.strip(), "未着手")
+                if value and isinstance(value, str)
+                else "未着手"
+            )
+            for value in column
+        ]
+
+    def _normalize_text_column(
+        self, column: tuple[str | None, ...]
+    ) -> list[str | None]:
+        """テキスト列（担当者・備考）を一括で正規化"""
+        return [value.strip() if value else None for value in column]
 
-        対応フォーマット:
-        - YY/MM/DD (例: 25/01/15)
-        - YYYY/MM/DD (例: 2025/01/15)
-        - YYYY-MM-DD (例: 2025-01-15)
+    def _detect_table(
+        self,
+        page: fitz.Page,
+        engine: TableEngine,
+        segments: tuple[np.ndarray, np.ndarray] | None = None,
+        strategy: str = "lines",
+    ) -> DetectedTable | None:
+        """
+        指定エンジンでページから工程表を検出
 
         Args:
-            date_str: 日付文字列
+            page: 対象ページ
+            engine: 表検出エンジン
+            segments: 抽出済みの罫線（grid/autoで再利用）
+            strategy: find_tablesの検出戦略（lines / text）
 
         Returns:
-            dateオブジェクト、または解析失敗時はNone
+            検出された表、検出できない場合はNone
         """
-        if not date_str or not isinstance(date_str, str):
-            return None
+        if engine in (TableEngine.GRID, TableEngine.AUTO):
+            detected = detect_ruled_table(page, segments)
+            if detected is not None or engine == TableEngine.GRID:
+                return detected
 
-        date_str = date_str.strip()
-        if not date_str:
+        tables = page.find_tables(strategy=strategy)
+        if not tables:
             return None
 
-        try:
-            # YY/MM/DD形式 (25/01/15)
-            if re.match(r"^\d{2}/\d{1,2}/\d{1,2}$", date_str):
-                parts = date_str.split("/")
-                year = int(parts[0])
-                # 2000年代として解釈
-                year = 2000 + year if year < 50 else 1900 + year
-                month = int(parts[1])
-                day = int(parts[2])
-                return date(year, month, day)
-
-            # YYYY/MM/DD形式 (2025/01/15)
-            if re.match(r"^\d{4}/\d{1,2}/\d{1,2}$", date_str):
-                parts = date_str.split("/")
-                year = int(parts[0])
-                month = int(parts[1])
-                day = int(parts[2])
-                return date(year, month, day)
-
-            # YYYY-MM-DD形式 (2025-01-15)
-            if re.match(r"^\d{4}-\d{1,2}-\d{1,2}$", date_str):
-                parts = date_str.split("-")
-                year = int(parts[0])
-                month = int(parts[1])
-                day = int(parts[2])
-                return date(year, month, day)
-
+        # 最大の表を取得（工程表として扱う）
+        main_table = max(tables, key=lambda t: len(t.extract()))
+        header_cells = [cell for cell in main_table.rows[0].cells if cell]
+        if not header_cells:
+            # ヘッダー行のセル位置が取れない表は列境界を決められないため、
+            # find_tables の指定時は罫線グリッド検出に切り替える（auto は検出済み）
+            if engine == TableEngine.FIND_TABLES:
+                return detect_ruled_table(page, segments)
             return None
 
-        except (ValueError, IndexError) as e:
-            logger.warning(f"Date parsing failed for '{date_str}': {e}")
-            return None
+        return DetectedTable(
+            data=main_table.extract(),
+            bbox=tuple(main_table.bbox),
+            column_bounds=[cell[0] for cell in header_cells] + [header_cells[-1][2]],
+        )
 
-    def _normalize_status(self, status_str: str) -> str:
+    def _find_table_data(
+        self,
+        page: fitz.Page,
+        engine: TableEngine,
+        has_ruling: bool,
+        use_layout_cache: bool = True,
+    ) -> tuple[list[list[str]] | None, str]:
         """
-        ステータス文字列を正規化
+        ページから工程表の生データを検出（レイアウトキャッシュ・表検出エンジン）
 
         Args:
-            status_str: 元のステータス文字列
+            page: 対象ページ
+            engine: 表検出エンジン
+            has_ruling: ページに罫線があるか（事前検査の結果）
+            use_layout_cache: レイアウトキャッシュを使うか（Falseの場合は必ず engine で検出）
 
         Returns:
-            正規化されたステータス
+            (表の生データ（検出できない場合はNone）, 検出方法)
         """
-        if not status_str or not isinstance(status_str, str):
-            return "未着手"
-
-        status_str = status_str.strip()
-
-        # ステータスマッピング
-        status_mapping = {
-            "未着手": "未着手",
-            "進行中": "進行中",
-            "完了": "完了",
-            "遅延": "遅延",
-            "中断": "中断",
-            # よくある表記揺れ
-            "着手前": "未着手",
-            "未開始": "未着手",
-            "実施中": "進行中",
-            "作業中": "進行中",
-            "終了": "完了",
-            "完成": "完了",
-            "済": "完了",
-            "済み": "完了",
-            "遅れ": "遅延",
-            "停止": "中断",
-            "保留": "中断",
-        }
+        table_data = None
+        fingerprint = None
+        source = engine.value
+
+        if not has_ruling:
+            # 罫線のないPDFはテキスト配置から表を検出
+            detected = self._detect_table(
+                page, TableEngine.FIND_TABLES, strategy="text"
+            )
+            table_data = detected.data if detected else None
+            source = "find_tables(text)"
 
-        return status_mapping.get(status_str, "未着手")
+        elif self.layout_cache is not None and use_layout_cache:
+            fingerprint = compute_fingerprint(page)
+            table_data = self.layout_cache.extract(page, fingerprint)
+            source = "layout_cache"
 
-    async def extract_schedule_from_pdf(
-        self, pdf_content: bytes, project_id: UUID, db: Client
-    ) -> PDFScheduleData:
+        if table_data is None and has_ruling:
+            detected = self._detect_table(
+                page, engine, fingerprint.segments if fingerprint else None
+            )
+            table_data = detected.data if detected else None
+            source = engine.value
+
+            if (
+                self.layout_cache is not None
+                and fingerprint is not None
+                and detected is not None
+                and len(detected.data) >= 2
+            ):
+                self.layout_cache.learn(fingerprint, detected)
+
+        return table_data, source
+
+    def extract_table_data(
+        self,
+        pdf_content: bytes,
+        engine: TableEngine = TableEngine.FIND_TABLES,
+        use_layout_cache: bool = True,
+        preflight: PreflightResult | None = None,
+    ) -> list[list[str]]:
         """
-        PDFから工程表データを抽出してデータベースに保存
+        PDFの1ページ目から工程表の生データを抽出
+
+        レイアウトキャッシュが有効な場合、既知のレイアウトでは表検出を省略する
 
         Args:
             pdf_content: PDFファイルのバイトデータ
-            project_id: プロジェクトID
-            db: Supabaseクライアント
+            engine: 表検出エンジン
+            use_layout_cache: レイアウトキャッシュを使うか（エンジンが明示された場合はFalse）
+            preflight: 実行済みの事前検査の結果（Noneの場合はここで検査する）
 
         Returns:
-            抽出・保存されたスケジュールデータ
+            表の生データ（ヘッダー行を含む）
 
         Raises:
-            PDFUploadError: PDF解析に失敗した場合
-            ProjectNotFoundError: プロジェクトが見つからない場合
+            PDFPreflightError: 事前検査で解析不可と判定された場合
+            PDFUploadError: 表構造が検出できない場合
         """
+        with StageTimer("pdf_open"):
+            doc = open_pdf(pdf_content)
         try:
-            logger.info(f"Starting PDF extraction for project: {project_id}")
-
-            # プロジェクト存在確認
-            project_info = await self._get_project_info(project_id, db)
-
-            # PDFファイルを開く
-            doc = fitz.open(stream=pdf_content, filetype="pdf")
-
-            if doc.page_count == 0:
-                raise PDFUploadError("PDFにページが含まれていません")
+            # 重い表検出の前に解析可能かを確認
+            if preflight is None:
+                preflight = inspect_document(doc)
 
             # 最初のページから表を抽出
-            page = doc[0]
-            tables = page.find_tables()
+            with StageTimer("table_detection"):
+                table_data, source = self._find_table_data(
+                    doc[0], engine, preflight.has_ruling, use_layout_cache
+                )
 
-            if not tables:
+            if not table_data:
                 raise PDFUploadError("PDFから表構造が検出できませんでした")
 
-            # 最大の表を取得（工程表として扱う）
-            main_table = max(tables, key=lambda t: len(t.extract()))
-            table_data = main_table.extract()
-
             if len(table_data) < 2:  # ヘッダー + 最低1行
                 raise PDFUploadError("抽出された表データが不足しています")
 
             logger.info(
-                f"Table extracted: {len(table_data)} rows, {len(table_data[0]) if table_data else 0} columns"
+                f"Table extracted ({source}): {len(table_data)} rows, "
+                f"{len(table_data[0]) if table_data else 0} columns"
             )
 
-            # 工程アイテムを抽出
+            return table_data
+
+        finally:
+            doc.close()
+
+    def _preflight(self, pdf_content: bytes) -> PreflightResult:
+        """PDFの事前検査（所要時間を preflight として記録）"""
+        with StageTimer("preflight"):
+            return preflight_pdf(pdf_content)
+
+    def parse_schedule_items(
+        self,
+        pdf_content: bytes,
+        engine: TableEngine = TableEngine.FIND_TABLES,
+        use_layout_cache: bool = True,
+        preflight: PreflightResult | None = None,
+    ) -> list[ScheduleRow]:
+        """
+        PDFから工程アイテムを抽出（データベースには保存しない）
+
+        Args:
+            pdf_content: PDFファイルのバイトデータ
+            engine: 表検出エンジン
+            use_layout_cache: レイアウトキャッシュを使うか（エンジンが明示された場合はFalse）
+            preflight: 実行済みの事前検査の結果（Noneの場合は抽出時に検査する）
+
+        Returns:
+            工程アイテムのリスト
+
+        Raises:
+            PDFUploadError: PDF解析に失敗した場合
+        """
+        table_data = self.extract_table_data(
+            pdf_content, engine, use_layout_cache, preflight
+        )
+
+        # 工程アイテムを抽出
+        with StageTimer("row_normalization"):
             schedule_items = self._extract_schedule_items(table_data)
 
-            if not schedule_items:
-                raise PDFUploadError("有効な工程データが見つかりませんでした")
+        if not schedule_items:
+            raise PDFUploadError("有効な工程データが見つかりませんでした")
+
+        return schedule_items
+
+    async def extract_schedule_from_pdf(
+        self,
+        pdf_content: bytes,
+        project_id: UUID,
+        db_service: SupabaseService,
+        engine: TableEngine = TableEngine.FIND_TABLES,
+        use_layout_cache: bool = True,
+    ) -> PDFScheduleData:
+        """
+        PDFから工程表データを抽出してデータベースに保存
+
+        Args:
+            pdf_content: PDFファイルのバイトデータ
+            project_id: プロジェクトID
+            db_service: データベースサービス
+            engine: 表検出エンジン
+            use_layout_cache: レイアウトキャッシュを使うか（エンジンが明示された場合はFalse）
+
+        Returns:
+            抽出・保存されたスケジュールデータ
+
+        Raises:
+            PDFUploadError: PDF解析に失敗した場合
+            ProjectNotFoundError: プロジェクトが見つからない場合
+        """
+        try:
+            logger.info(f"Starting PDF extraction for project: {project_id}")
+
+            # 解析できないPDFはデータベースに問い合わせる前に却下する
+            # （PyMuPDFの処理は専用スレッドで実行し、イベントループを止めない）
+            preflight = await run_pdf_task(self._preflight, pdf_content)
+
+            # プロジェクト存在確認
+            project_info = await self._get_project_info(project_id, db_service)
+
+            # PDFから工程アイテムを抽出
+            schedule_items = await run_pdf_task(
+                self.parse_schedule_items,
+                pdf_content,
+                engine,
+                use_layout_cache,
+                preflight,
+            )
 
             # データベースに保存
             schedule_data = await self._save_schedule_to_db(
-                project_id, project_info, schedule_items, db
+                project_id, project_info, schedule_items, db_service
             )
 
-            doc.close()
-
             logger.info(
                 f"PDF extraction completed: {len(schedule_items)} items extracted, "
                 f"schedule_id: {schedule_data.schedule_id}"
@@ -524,14 +725,14 @@ class PDFGenerationService:
             raise PDFUploadError(f"PDF解析中にエラーが発生しました: {str(e)}")
 
     async def _get_project_info(
-        self, project_id: UUID, db: Client
+        self, project_id: UUID, db_service: SupabaseService
     ) -> ProjectInfoForPDF:
         """
         プロジェクト情報を取得
 
         Args:
             project_id: プロジェクトID
-            db: Supabaseクライアント
+            db_service: データベースサービス
 
         Returns:
             プロジェクト情報
@@ -540,21 +741,13 @@ class PDFGenerationService:
             ProjectNotFoundError: プロジェクトが見つからない場合
         """
         try:
-            result = (
-                db.table("projects")
-                .select(
-                    "project_number, project_name, construction_location, construction_company"
-                )
-                .eq("id", str(project_id))
-                .execute()
-            )
+            project_data = await db_service.get_project(str(project_id))
 
-            if not result.data:
+            if not project_data:
                 raise ProjectNotFoundError(
                     f"プロジェクトが見つかりません: {project_id}"
                 )
 
-            project_data = result.data[0]
             return ProjectInfoForPDF(
                 project_number=project_data["project_number"],
                 project_name=project_data["project_name"],
@@ -568,9 +761,7 @@ class PDFGenerationService:
             logger.error(f"Error fetching project info: {e}")
             raise PDFUploadError(f"プロジェクト情報の取得に失敗しました: {str(e)}")
 
-    def _extract_schedule_items(
-        self, table_data: list[list[str]]
-    ) -> list[ScheduleItemForPDF]:
+    def _extract_schedule_items(self, table_data: list[list[str]]) -> list[ScheduleRow]:
         """
         表データから工程アイテムを抽出
 
@@ -583,43 +774,56 @@ class PDFGenerationService:
         Returns:
             工程アイテムのリスト
         """
-        schedule_items = []
-
         # ヘッダー行をスキップ（1行目）
         data_rows = table_data[1:] if len(table_data) > 1 else []
 
+        # 工程名がある行のみ対象（空行・不完全な行をスキップ）
+        order_indexes = []
+        padded_rows = []
+        padding = [None] * SCHEDULE_COLUMN_COUNT
         for index, row in enumerate(data_rows):
-            # 空行や不完全な行をスキップ
-            if not row or len([cell for cell in row if cell and cell.strip()]) < 1:
-                continue
-
-            # 最低限工程名があることを確認
-            process_name = row[0].strip() if len(row) > 0 and row[0] else ""
-            if not process_name:
+            if not row or not row[0] or not row[0].strip():
                 continue
-
-            # 各列の値を安全に取得
-            planned_start = self._parse_date(row[1]) if len(row) > 1 else None
-            planned_end = self._parse_date(row[2]) if len(row) > 2 else None
-            actual_start = self._parse_date(row[3]) if len(row) > 3 else None
-            actual_end = self._parse_date(row[4]) if len(row) > 4 else None
-            assignee = row[5].strip() if len(row) > 5 and row[5] else None
-            status = self._normalize_status(row[6]) if len(row) > 6 else "未着手"
-            remarks = row[7].strip() if len(row) > 7 and row[7] else None
-
-            schedule_item = ScheduleItemForPDF(
-                process_name=process_name,
-                planned_start_date=planned_start,
-                planned_end_date=planned_end,
-                actual_start_date=actual_start,
-                actual_end_date=actual_end,
-                assignee=assignee,
-                status=status,
-                remarks=remarks,
-                order_index=index,
+            order_indexes.append(index)
+            padded_rows.append((list(row) + padding)[:SCHEDULE_COLUMN_COUNT])
+
+        if not padded_rows:
+            logger.info("Extracted 0 schedule items from PDF")
+            return []
+
+        # 列単位で正規化
+        (
+            names,
+            planned_starts,
+            planned_ends,
+            actual_starts,
+            actual_ends,
+            assignees,
+            statuses,
+            remarks_column,
+        ) = zip(*padded_rows, strict=True)
+
+        process_names = [name.strip() for name in names]
+        date_columns = [
+            self._normalize_date_column(column)
+            for column in (planned_starts, planned_ends, actual_starts, actual_ends)
+        ]
+        normalized_assignees = self._normalize_text_column(assignees)
+        normalized_statuses = self._normalize_status_column(statuses)
+        normalized_remarks = self._normalize_text_column(remarks_column)
+
+        # 正規化済みの列から行を組み立てる（値は正規化で型が揃っているため再検証しない）
+        schedule_items = list(
+            map(
+                ScheduleRow,
+                process_names,
+                *date_columns,
+                normalized_assignees,
+                normalized_statuses,
+                normalized_remarks,
+                order_indexes,
             )
-
-            schedule_items.append(schedule_item)
+        )
 
         logger.info(f"Extracted {len(schedule_items)} schedule items from PDF")
         return schedule_items
@@ -628,8 +832,8 @@ class PDFGenerationService:
         self,
         project_id: UUID,
         project_info: ProjectInfoForPDF,
-        schedule_items: list[ScheduleItemForPDF],
-        db: Client,
+        schedule_items: list[ScheduleRow],
+        db_service: SupabaseService,
     ) -> PDFScheduleData:
         """
         工程表データをデータベースに保存
@@ -638,97 +842,41 @@ class PDFGenerationService:
             project_id: プロジェクトID（UUID）
             project_info: プロジェクト情報
             schedule_items: 工程アイテムリスト
-            db: Supabaseクライアント
+            db_service: データベースサービス
 
         Returns:
             保存されたスケジュールデータ
+
+        Raises:
+            ProjectNotFoundError: 保存前にプロジェクトが削除された場合
         """
         try:
-            # 既存の最新バージョン番号を取得
-            existing_result = (
-                db.table("project_schedules")
-                .select("version")
-                .eq("project_id", str(project_id))  # 正しくproject_id（UUID）を使用
-                .order("version", desc=True)
-                .limit(1)
-                .execute()
+            # バージョン採番・工程表・工程アイテムの登録をDB側で一括実行
+            # （工程アイテムは行の内容のハッシュで前のバージョンと比較し、変更行のみ書き込む）
+            created = await db_service.create_schedule_version(
+                str(project_id), schedule_items
             )
-
-            next_version = 1
-            if existing_result.data:
-                next_version = existing_result.data[0]["version"] + 1
-
-            # 新しい工程表レコードを作成
-            schedule_result = (
-                db.table("project_schedules")
-                .insert(
-                    {
-                        "project_id": str(project_id),  # 正しくproject_id（UUID）を使用
-                        "version": next_version,
-                    }
-                )
-                .execute()
-            )
-
-            if not schedule_result.data:
-                raise PDFUploadError("工程表の作成に失敗しました")
-
-            schedule_id = schedule_result.data[0]["id"]
-
-            # 工程アイテムを保存
-            items_data = []
-            for item in schedule_items:
-                item_data = {
-                    "schedule_id": schedule_id,
-                    "process_name": item.process_name,
-                    "planned_start_date": (
-                        item.planned_start_date.isoformat()
-                        if item.planned_start_date
-                        else None
-                    ),
-                    "planned_end_date": (
-                        item.planned_end_date.isoformat()
-                        if item.planned_end_date
-                        else None
-                    ),
-                    "actual_start_date": (
-                        item.actual_start_date.isoformat()
-                        if item.actual_start_date
-                        else None
-                    ),
-                    "actual_end_date": (
-                        item.actual_end_date.isoformat()
-                        if item.actual_end_date
-                        else None
-                    ),
-                    "assignee": item.assignee,
-                    "status": item.status,
-                    "remarks": item.remarks,
-                    "order_index": item.order_index,
-                }
-                items_data.append(item_data)
-
-            items_result = db.table("schedule_items").insert(items_data).execute()
-
-            if not items_result.data:
-                raise PDFUploadError("工程アイテムの保存に失敗しました")
+            schedule_id = created["id"]
+            next_version = created["version"]
 
             # PDFScheduleDataを構築して返却
             schedule_data = PDFScheduleData(
-                schedule_id=schedule_id,
+                schedule_id=UUID(str(schedule_id)),
                 version=next_version,
                 project_info=project_info,
                 schedule_items=schedule_items,
             )
 
+            # 内容が前のバージョンと同じ工程アイテムは書き込まずに共有される
             logger.info(
                 f"Schedule saved successfully: schedule_id={schedule_id}, "
-                f"version={next_version}, items={len(schedule_items)}"
+                f"version={next_version}, items={len(schedule_items)}, "
+                f"new_rows={created['new_item_count']}"
             )
 
             return schedule_data
 
-        except PDFUploadError:
+        except (PDFUploadError, ProjectNotFoundError):
             raise
         except Exception as e:
             logger.error(f"Error saving schedule to database: {e}")
@@ -0,0 +1,67 @@
+"""
+PyMuPDFの処理を実行する専用スレッド
+PDFの事前検査・解析・生成はCPU負荷が高く、イベントループ上で実行すると
+その間は他のリクエストのデータベースI/Oも止まるため、専用スレッドで実行する
+
+PyMuPDFはスレッドセーフではないため、スレッドは1つだけにして処理を順に実行し、
+ドキュメントは処理ごとに開いてスレッド間で共有しない
+（スレッドはプロセス終了時に concurrent.futures が終了を待つ）
+"""
+
+import asyncio
+import contextvars
+import functools
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import ParamSpec, TypeVar
+
+from app.services.profiling import current_profile
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pdf-worker")
+
+# 実行中・実行待ちの処理の数
+_pending = 0
+
+
+async def run_pdf_task(func: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+    """
+    PyMuPDFを使う処理を専用スレッドで実行
+
+    コンテキスト変数（処理段階の所要時間の集計・プロファイルなど）は呼び出し元のものを引き継ぐ
+
+    Args:
+        func: 実行する処理
+        *args: 処理の引数
+        **kwargs: 処理のキーワード引数
+
+    Returns:
+        処理の戻り値
+    """
+    global _pending
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    task = functools.partial(func, *args, **kwargs)
+    call = functools.partial(context.run, _run_profiled, task)
+
+    _pending += 1
+    try:
+        return await loop.run_in_executor(_executor, call)
+    finally:
+        _pending -= 1
+
+
+def _run_profiled(task: Callable[[], T]) -> T:
+    """専用スレッドで処理を実行（依頼したリクエストがプロファイル中の場合はこのスレッドも対象）"""
+    profile = current_profile.get()
+    if profile is None:
+        return task()
+    with profile.in_current_thread():
+        return task()
+
+
+def pending_tasks() -> int:
+    """実行中・実行待ちの処理の数"""
+    return _pending
@@ -0,0 +1,309 @@
+"""
+リクエスト単位のプロファイリング（オプトイン）
+指定されたリクエスト、またはN件に1件のリクエストの処理全体をプロファイルし、
+リクエストIDをファイル名にしてローカルのディレクトリに保存する
+
+- sampling: イベントループのスレッドのスタックを一定間隔で採取し、
+  フレームグラフ用の folded 形式（speedscope・flamegraph.pl・inferno で開ける）で保存
+- cprofile: cProfile の統計を .prof 形式（snakeviz・flameprof で開ける）で保存
+
+プロファイルはイベントループのスレッド全体が対象のため、同時に処理された
+他のリクエストの処理も含まれる。同時にプロファイルするのは1リクエストのみ。
+PyMuPDF専用スレッドで実行するPDFの抽出・描画は、プロファイル中のリクエストから
+依頼された処理の実行中のみ、そのスレッドも対象にする（current_profile で引き継ぐ）
+"""
+
+import cProfile
+import logging
+import pstats
+import re
+import sys
+import threading
+import uuid
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import StrEnum
+from pathlib import Path
+from types import FrameType
+from urllib.parse import parse_qs
+
+from app.utils.auth import is_admin
+
+logger = logging.getLogger(__name__)
+
+# 外部から指定されたリクエストIDとして受け付ける形式（ファイル名に使うため制限する）
+REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+class ProfilingMode(StrEnum):
+    """プロファイルの取得方法"""
+
+    SAMPLING = "sampling"  # スタックの定期採取（folded 形式）
+    CPROFILE = "cprofile"  # cProfile（.prof 形式）
+
+
+class StackSampler:
+    """指定スレッドのスタックを一定間隔で採取する統計的プロファイラー"""
+
+    def __init__(self, thread_id: int, interval: float):
+        """
+        Args:
+            thread_id: 対象スレッドのID
+            interval: 採取間隔（秒）
+        """
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        # 対象スレッドのIDとスタックの先頭に付けるスレッド名
+        self._threads: dict[int, str] = {thread_id: _thread_name(thread_id)}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="stack-sampler", daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def add_thread(self, thread_id: int) -> None:
+        """対象のスレッドを追加（PyMuPDF専用スレッドでの処理の開始時）"""
+        with self._lock:
+            self._threads[thread_id] = _thread_name(thread_id)
+
+    def remove_thread(self, thread_id: int) -> None:
+        """対象のスレッドを除外（PyMuPDF専用スレッドでの処理の終了時）"""
+        with self._lock:
+            self._threads.pop(thread_id, None)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            with self._lock:
+                threads = list(self._threads.items())
+            frames = sys._current_frames()
+            for thread_id, name in threads:
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    self.stacks[f"{name};{_fold(frame)}"] += 1
+
+    def write(self, path: Path) -> None:
+        """folded 形式（1行 = スレッド名・呼び出し元から順に ; 区切りのスタックと採取回数）で保存"""
+        path.write_text(
+            "".join(f"{stack} {count}\n" for stack, count in self.stacks.items())
+        )
+
+
+def _thread_name(thread_id: int) -> str:
+    """スレッドIDのスレッド名（folded 形式のスタックの先頭に付ける）"""
+    for thread in threading.enumerate():
+        if thread.ident == thread_id:
+            return thread.name
+    return f"thread-{thread_id}"
+
+
+def _fold(frame: FrameType) -> str:
+    """フレームから呼び出し元を順にたどり、folded 形式の1スタックにする"""
+    names = []
+    current: FrameType | None = frame
+    while current is not None:
+        code = current.f_code
+        names.append(f"{code.co_qualname} ({code.co_filename}:{current.f_lineno})")
+        current = current.f_back
+    return ";".join(reversed(names))
+
+
+class RequestProfile:
+    """1リクエスト分のプロファイル"""
+
+    def __init__(self, mode: ProfilingMode, interval: float):
+        self.mode = mode
+        self._profiler: cProfile.Profile | None = None
+        self._sampler: StackSampler | None = None
+        # 別スレッドで実行した処理のプロファイル（cprofile のみ、保存時に統合する）
+        self._thread_profilers: list[cProfile.Profile] = []
+        if mode == ProfilingMode.CPROFILE:
+            self._profiler = cProfile.Profile()
+        else:
+            self._sampler = StackSampler(threading.get_ident(), interval)
+
+    @property
+    def suffix(self) -> str:
+        return ".prof" if self.mode == ProfilingMode.CPROFILE else ".folded"
+
+    def start(self) -> None:
+        if self._profiler is not None:
+            self._profiler.enable()
+        if self._sampler is not None:
+            self._sampler.start()
+
+    def stop(self) -> None:
+        if self._profiler is not None:
+            self._profiler.disable()
+        if self._sampler is not None:
+            self._sampler.stop()
+
+    @contextmanager
+    def in_current_thread(self) -> Iterator[None]:
+        """
+        別スレッド（PyMuPDF専用スレッド）で実行する処理をプロファイルの対象にする
+
+        cProfile はスレッドごとに有効にするため、処理ごとにプロファイラーを作成して
+        保存時に統合する。sampling は処理の実行中のみスレッドを採取の対象に加える
+        """
+        thread_id = threading.get_ident()
+        if self._sampler is not None:
+            self._sampler.add_thread(thread_id)
+            try:
+                yield
+            finally:
+                self._sampler.remove_thread(thread_id)
+            return
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            self._thread_profilers.append(profiler)
+
+    def write(self, path: Path) -> None:
+        if self._profiler is not None:
+            stats = pstats.Stats(self._profiler)
+            for profiler in self._thread_profilers:
+                stats.add(profiler)
+            stats.dump_stats(path)
+        if self._sampler is not None:
+            self._sampler.write(path)
+
+
+# プロファイル中のリクエストのプロファイル（PyMuPDF専用スレッドでの処理に引き継ぐ）
+current_profile: ContextVar[RequestProfile | None] = ContextVar(
+    "current_profile", default=None
+)
+
+
+class RequestProfiler:
+    """
+    プロファイルするリクエストの判定とプロファイルの保存
+
+    管理者トークン（X-Admin-Token）付きで X-Profile: 1 ヘッダーまたは ?profile=1 が
+    指定されたリクエストと、sample_every 件に1件のリクエストをプロファイルする
+    """
+
+    def __init__(
+        self,
+        output_path: str,
+        admin_token: str = "",
+        sample_every: int = 0,
+        mode: ProfilingMode = ProfilingMode.SAMPLING,
+        interval: float = 0.005,
+    ):
+        """
+        Args:
+            output_path: プロファイルの保存先ディレクトリ
+            admin_token: 指定によるプロファイルに必要な管理者トークン（空の場合は指定を受け付けない）
+            sample_every: N件に1件をプロファイル（0で無効）
+            mode: プロファイルの取得方法
+            interval: sampling の採取間隔（秒）
+        """
+        self.output_path = Path(output_path)
+        self.admin_token = admin_token
+        self.sample_every = sample_every
+        self.mode = mode
+        self.interval = interval
+        self.requests = 0
+        self.profiled = 0
+        self.skipped_busy = 0
+        self._active = False
+
+    def should_profile(
+        self, headers: dict[str, str], query_string: bytes
+    ) -> str | None:
+        """
+        リクエストをプロファイルするかを判定
+
+        Args:
+            headers: リクエストヘッダー（小文字のヘッダー名）
+            query_string: クエリ文字列
+
+        Returns:
+            プロファイルする理由（requested / sampled）、しない場合はNone
+        """
+        self.requests += 1
+        reason = None
+        if self._is_requested(headers, query_string):
+            reason = "requested"
+        elif self.sample_every > 0 and self.requests % self.sample_every == 0:
+            reason = "sampled"
+
+        if reason is not None and self._active:
+            # プロファイラーはスレッド全体が対象のため、同時には1リクエストのみ
+            self.skipped_busy += 1
+            return None
+        return reason
+
+    def _is_requested(self, headers: dict[str, str], query_string: bytes) -> bool:
+        """管理者トークン付きでプロファイルが指定されているか"""
+        flagged = headers.get("x-profile") == "1" or parse_qs(
+            query_string.decode("latin-1")
+        ).get("profile") == ["1"]
+        if not flagged or not self.admin_token:
+            return False
+        if not is_admin(headers, self.admin_token):
+            logger.warning("Profiling requested with an invalid admin token")
+            return False
+        return True
+
+    def start(self) -> RequestProfile:
+        """プロファイルを開始（呼び出したスレッドが対象）"""
+        self._active = True
+        profile = RequestProfile(self.mode, self.interval)
+        profile.start()
+        return profile
+
+    def finish(self, profile: RequestProfile, request_id: str) -> Path | None:
+        """
+        プロファイルを終了して保存
+
+        Args:
+            profile: start() で開始したプロファイル
+            request_id: リクエストID（ファイル名に使う）
+
+        Returns:
+            保存したファイルのパス（保存に失敗した場合はNone）
+        """
+        try:
+            profile.stop()
+        finally:
+            self._active = False
+
+        path = self.output_path / f"{request_id}{profile.suffix}"
+        try:
+            self.output_path.mkdir(parents=True, exist_ok=True)
+            profile.write(path)
+        except OSError as e:
+            logger.error(f"Failed to write profile {path}: {e}")
+            return None
+        self.profiled += 1
+        return path
+
+    def stats(self) -> dict[str, int]:
+        """判定したリクエスト数・プロファイルした数・実行中のため省略した数"""
+        return {
+            "requests": self.requests,
+            "profiled": self.profiled,
+            "skipped_busy": self.skipped_busy,
+        }
+
+
+def request_id_from(headers: dict[str, str]) -> str:
+    """X-Request-ID（形式が正しい場合）またはランダムなリクエストID"""
+    request_id = headers.get("x-request-id", "")
+    if REQUEST_ID_PATTERN.match(request_id):
+        return request_id
+    return uuid.uuid4().hex
@@ -0,0 +1,61 @@
+"""
+リクエストごとの処理段階の所要時間
+処理段階・データベース呼び出しの所要時間を現在のリクエストに集計し、
+Server-Timing ヘッダー・ログに出力する
+"""
+
+from contextvars import ContextVar
+
+
+class RequestTimings:
+    """1リクエスト分の処理段階ごとの所要時間（同じ段階は合計する）"""
+
+    __slots__ = ("stages",)
+
+    def __init__(self) -> None:
+        self.stages: dict[str, float] = {}
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def merge(self, other: "RequestTimings") -> None:
+        """他の集計（共有された処理の所要時間など）を追加"""
+        for stage, seconds in other.stages.items():
+            self.add(stage, seconds)
+
+    def server_timing(self, total: float) -> str:
+        """
+        Server-Timing ヘッダーの値
+
+        Args:
+            total: レスポンス開始までの所要時間（秒）
+
+        Returns:
+            例: db.get_project;dur=1.20, render;dur=35.41, total;dur=40.02
+        """
+        entries = [
+            f"{stage};dur={seconds * 1000:.2f}"
+            for stage, seconds in self.stages.items()
+        ]
+        entries.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(entries)
+
+    def log_fields(self) -> str:
+        """ログ出力用（例: db.get_project:1.20,render:35.41）"""
+        return ",".join(
+            f"{stage}:{seconds * 1000:.2f}" for stage, seconds in self.stages.items()
+        )
+
+
+# 処理中のリクエストの集計（リクエスト外やServer-Timing対象外のパスではNone）
+# 子タスクはコンテキストをコピーするが、集計オブジェクトは共有されるため同じリクエストに集計される
+current_timings: ContextVar[RequestTimings | None] = ContextVar(
+    "current_timings", default=None
+)
+
+
+def record_timing(stage: str, seconds: float) -> None:
+    """処理中のリクエストに処理段階の所要時間を追加（リクエスト外では何もしない）"""
+    timings = current_timings.get()
+    if timings is not None:
+        timings.add(stage, seconds)
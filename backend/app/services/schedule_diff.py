@@ -0,0 +1,114 @@
+"""
+工程表のバージョン間の差分
+2つのバージョンの工程アイテムを比較し、追加・削除・変更された工程を求める
+"""
+
+from collections import Counter, defaultdict
+from typing import Any
+
+# 変更として比較する列（工程名は対応付けのキー、表示順は並び替えのみの変更のため除く）
+DIFF_FIELDS = (
+    "planned_start_date",
+    "planned_end_date",
+    "actual_start_date",
+    "actual_end_date",
+    "assignee",
+    "status",
+    "remarks",
+)
+
+
+def diff_schedule_items(
+    from_items: list[dict[str, Any]], to_items: list[dict[str, Any]]
+) -> dict[str, Any]:
+    """
+    2つのバージョンの工程アイテムの差分を求める
+
+    工程アイテムの行は内容のハッシュでバージョン間で共有されるため、
+    まず行ID（内容が同じ行は同じID）で一致する行を変更なしとして除き、
+    残りの行を工程名ごとに表示順で対応付けて変更された列を比較する。
+    対応する行がない工程は追加・削除として扱う
+
+    Args:
+        from_items: 比較元のバージョンの工程アイテム（表示順）
+        to_items: 比較先のバージョンの工程アイテム（表示順）
+
+    Returns:
+        summary: 追加・削除・変更・変更なしの件数
+        added / removed: 追加・削除された工程アイテム
+        modified: 変更された工程（{process_name, from, to, changes: {列: {from, to}}}）
+    """
+    # 内容が同じ行（同じ行ID）を変更なしとして除く
+    shared = Counter(str(item["id"]) for item in from_items) & Counter(
+        str(item["id"]) for item in to_items
+    )
+    unchanged = sum(shared.values())
+    from_rest = _exclude_shared(from_items, shared)
+    to_rest = _exclude_shared(to_items, shared)
+
+    # 残りの行を工程名ごとに表示順で対応付ける
+    candidates: defaultdict[str, list[dict[str, Any]]] = defaultdict(list)
+    for item in from_rest:
+        candidates[item["process_name"]].append(item)
+    positions: Counter[str] = Counter()
+
+    added: list[dict[str, Any]] = []
+    modified: list[dict[str, Any]] = []
+    for item in to_rest:
+        name = item["process_name"]
+        index = positions[name]
+        if index >= len(candidates[name]):
+            added.append(item)
+            continue
+        positions[name] += 1
+        before = candidates[name][index]
+        modified.append(
+            {
+                "process_name": name,
+                "from": before,
+                "to": item,
+                "changes": {
+                    field: {"from": before.get(field), "to": item.get(field)}
+                    for field in DIFF_FIELDS
+                    if before.get(field) != item.get(field)
+                },
+            }
+        )
+
+    removed = [
+        item for name, items in candidates.items() for item in items[positions[name] :]
+    ]
+    removed.sort(key=_order)
+
+    return {
+        "summary": {
+            "added": len(added),
+            "removed": len(removed),
+            "modified": len(modified),
+            "unchanged": unchanged,
+        },
+        "added": added,
+        "removed": removed,
+        "modified": modified,
+    }
+
+
+def _exclude_shared(
+    items: list[dict[str, Any]], shared: Counter[str]
+) -> list[dict[str, Any]]:
+    """変更なしの行（両方のバージョンにある行ID）を除いた行を表示順で返す"""
+    remaining = Counter(shared)
+    rest = []
+    for item in items:
+        key = str(item["id"])
+        if remaining[key] > 0:
+            remaining[key] -= 1
+        else:
+            rest.append(item)
+    return rest
+
+
+def _order(item: dict[str, Any]) -> int:
+    """表示順（未設定の場合は末尾）"""
+    order_index = item.get("order_index")
+    return order_index if order_index is not None else 2**31
@@ -0,0 +1,131 @@
+"""
+同時実行される同一処理の集約（シングルフライト）
+同じ処理・引数の呼び出しが実行中の場合は新たに実行せず、実行中の結果を共有する
+"""
+
+import asyncio
+import logging
+from collections import Counter
+from collections.abc import Awaitable, Callable, Hashable
+from functools import partial
+from time import perf_counter
+from typing import Any, TypeVar, cast
+
+from app.services.request_timing import RequestTimings, current_timings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """処理名と引数をキーに、同時実行中の呼び出しを1回にまとめる
+
+    共有される処理は独立したタスクとして実行するため、待機中の1リクエストが
+    キャンセルされても他のリクエストの処理は継続する。
+    結果は呼び出し元間で共有されるため、呼び出し側で変更しないこと
+
+    共有される処理の処理段階の所要時間（Server-Timing）は処理ごとに集計し、
+    完了時に実行したリクエストと結果を共有したリクエストの両方に追加する。
+    結果を共有したリクエストには、待機した時間を coalesced として追加する
+    """
+
+    def __init__(self, name: str):
+        """
+        Args:
+            name: 名前（統計表示用）
+        """
+        self.name = name
+        self._calls: dict[tuple[str, Hashable], asyncio.Future[Any]] = {}
+        self.executions: Counter[str] = Counter()
+        self.coalesced: Counter[str] = Counter()
+
+    async def do(
+        self, operation: str, key: Hashable, fn: Callable[[], Awaitable[T]]
+    ) -> T:
+        """
+        処理を実行（同じ処理・キーが実行中の場合はその結果を待つ）
+
+        Args:
+            operation: 処理名
+            key: 引数（ハッシュ可能な値）
+            fn: 実行する処理
+
+        Returns:
+            処理結果（例外も共有される）
+        """
+        call_key = (operation, key)
+        future = self._calls.get(call_key)
+        coalesced = future is not None
+
+        if future is None:
+            future = asyncio.ensure_future(self._run(fn))
+            self._calls[call_key] = future
+            future.add_done_callback(partial(self._finish, call_key))
+            self.executions[operation] += 1
+        else:
+            self.coalesced[operation] += 1
+
+        started = perf_counter()
+        value, shared_timings = await asyncio.shield(future)
+        timings = current_timings.get()
+        if timings is not None:
+            timings.merge(shared_timings)
+            if coalesced:
+                timings.add("coalesced", perf_counter() - started)
+        return cast(T, value)
+
+    @staticmethod
+    async def _run(fn: Callable[[], Awaitable[T]]) -> tuple[T, RequestTimings]:
+        """処理を実行し、結果と処理段階の所要時間を返す（タスク内で実行）"""
+        # タスクはコンテキストのコピーで実行されるため、呼び出し元の集計には影響しない
+        timings = RequestTimings()
+        current_timings.set(timings)
+        return await fn(), timings
+
+    def _finish(
+        self, call_key: tuple[str, Hashable], future: asyncio.Future[Any]
+    ) -> None:
+        """完了した処理を実行中の一覧から削除"""
+        if self._calls.get(call_key) is future:
+            del self._calls[call_key]
+        if not future.cancelled():
+            # 待機者がすべてキャンセルされた場合の未取得警告を抑止
+            future.exception()
+
+    def forget(self, operation: str, key: Hashable) -> None:
+        """
+        実行中の処理を以降の呼び出しで共有しないようにする（データ更新時）
+
+        Args:
+            operation: 処理名
+            key: 引数
+        """
+        self._calls.pop((operation, key), None)
+
+    def forget_operation(self, operation: str) -> None:
+        """
+        指定した処理の実行中の呼び出しをすべて共有しないようにする
+
+        Args:
+            operation: 処理名
+        """
+        for call_key in [
+            call_key for call_key in self._calls if call_key[0] == operation
+        ]:
+            del self._calls[call_key]
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """処理名ごとの実行回数・共有された回数・実行中の数"""
+        in_flight = Counter(operation for operation, _ in self._calls)
+        stats = {}
+        for operation in sorted(self.executions | self.coalesced):
+            executions = self.executions[operation]
+            coalesced = self.coalesced[operation]
+            stats[operation] = {
+                "executions": executions,
+                "coalesced": coalesced,
+                "coalesced_ratio": round(coalesced / (executions + coalesced), 4),
+                "in_flight": in_flight[operation],
+            }
+        return stats
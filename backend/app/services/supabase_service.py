@@ -4,30 +4,183 @@ Supabase サービスクラス
 """
 
 import logging
-from typing import Any
-
-from supabase import Client
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, TypeVar
+
+from app.config import settings
+from app.repositories.base import PROJECT_COLUMNS, ProjectCursor, ScheduleRepository
+from app.schemas.pdf import ScheduleRow
+from app.services.batch_loader import BatchLoader
+from app.services.cache import TTLCache
+from app.services.event_broker import EventBroker
+from app.services.schedule_diff import diff_schedule_items
+from app.services.single_flight import SingleFlight
+from app.services.write_batcher import ScheduleWriteBatcher
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 class SupabaseService:
-    """Supabaseデータベース操作を管理するサービスクラス"""
+    """Supabaseデータベース操作を管理するサービスクラス
+
+    読み取り結果はエンティティごとのTTL付きLRUキャッシュに保持し、
+    キャッシュにないデータの同時読み込みは1回のクエリにまとめる。
+    工程表は作成後に変更されないため、IDで取得する工程表・工程アイテムは
+    長めのTTLで保持し、プロジェクトの最新工程表は新バージョン作成時に無効化する。
+    返却値はキャッシュと共有されるため、呼び出し側で変更しないこと
+    """
 
-    def __init__(self, client: Client):
+    def __init__(self, repository: ScheduleRepository):
         """
         Args:
-            client: Supabaseクライアントインスタンス
+            repository: データベースアクセスのリポジトリ（Supabase / PostgreSQL）
         """
-        self.client = client
+        self.repository = repository
+
+        max_size = settings.cache_max_entries
+        self.project_cache: TTLCache[str, dict[str, Any]] = TTLCache(
+            "projects", settings.cache_project_ttl, max_size
+        )
+        self.project_list_cache: TTLCache[
+            tuple[int, int, ProjectCursor | None, tuple[str, ...]],
+            list[dict[str, Any]],
+        ] = TTLCache("project_lists", settings.cache_project_list_ttl, max_size)
+        self.latest_schedule_cache: TTLCache[str, dict[str, Any]] = TTLCache(
+            "latest_schedules", settings.cache_latest_schedule_ttl, max_size
+        )
+        self.schedule_items_cache: TTLCache[str, list[dict[str, Any]]] = TTLCache(
+            "schedule_items", settings.cache_schedule_ttl, max_size
+        )
+        self.schedule_details_cache: TTLCache[str, dict[str, Any]] = TTLCache(
+            "schedule_details", settings.cache_schedule_ttl, max_size
+        )
+        self.schedule_cache: TTLCache[str, dict[str, Any]] = TTLCache(
+            "schedules", settings.cache_schedule_ttl, max_size
+        )
+        # 工程表のバージョン間の差分（工程表IDの組で保持、工程表は変更されないため長め）
+        self.schedule_diff_cache: TTLCache[tuple[str, str], dict[str, Any]] = TTLCache(
+            "schedule_diffs", settings.cache_schedule_ttl, max_size
+        )
+        self.project_status_cache: TTLCache[str, dict[str, Any]] = TTLCache(
+            "project_statuses", settings.cache_latest_schedule_ttl, max_size
+        )
+        self.dashboard_cache: TTLCache[int, dict[str, Any]] = TTLCache(
+            "dashboard", settings.cache_dashboard_ttl, max_size
+        )
+        self._caches: list[TTLCache[Any, Any]] = [
+            self.project_cache,
+            self.project_list_cache,
+            self.latest_schedule_cache,
+            self.schedule_items_cache,
+            self.schedule_details_cache,
+            self.schedule_cache,
+            self.schedule_diff_cache,
+            self.project_status_cache,
+            self.dashboard_cache,
+        ]
+
+        # キャッシュ名・キーが同じ読み込みの同時実行を1回にまとめる
+        self.single_flight = SingleFlight("reads")
+
+        # 工程表の変更通知（このサービス経由の書き込み時に発行）
+        self.events = EventBroker(settings.events_queue_size)
+
+        # 同時に届いた取り込みの工程表書き込みをまとめる（無効時は要求ごとに書き込む）
+        self.write_batcher: ScheduleWriteBatcher | None = None
+        if settings.write_batch_enabled:
+            self.write_batcher = ScheduleWriteBatcher(
+                repository,
+                window=settings.write_batch_window_ms / 1000,
+                max_rows=settings.write_batch_max_rows,
+            )
+
+        # ID一覧による一括取得（同時リクエスト間で同じIDの読み込みを共有）
+        self.project_loader: BatchLoader[dict[str, Any]] = BatchLoader(
+            "projects_batch",
+            lambda ids: self._load_by_ids(
+                self.project_cache, self.repository.get_projects_by_ids, ids
+            ),
+        )
+        self.schedule_loader: BatchLoader[dict[str, Any]] = BatchLoader(
+            "schedules_batch",
+            lambda ids: self._load_by_ids(
+                self.schedule_cache,
+                self.repository.get_schedules_with_items_by_ids,
+                ids,
+            ),
+        )
         logger.info("SupabaseService initialized")
 
-    async def get_project(self, project_id: str) -> dict[str, Any] | None:
+    async def _read_through(
+        self,
+        cache: TTLCache[Any, T],
+        key: Hashable,
+        loader: Callable[[], Awaitable[T | None]],
+        refresh: bool = False,
+    ) -> T | None:
+        """
+        キャッシュになければリポジトリから読み込んで登録（Noneは登録しない）
+
+        refresh=True の場合はキャッシュを使わずに読み込み、キャッシュを更新する
+        """
+        if not refresh:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+
+        async def load() -> T | None:
+            value = await loader()
+            if value is not None:
+                cache.set(key, value)
+            return value
+
+        return await self.single_flight.do(cache.name, key, load)
+
+    async def _load_by_ids(
+        self,
+        cache: TTLCache[str, dict[str, Any]],
+        fetch: Callable[[list[str]], Awaitable[list[dict[str, Any]]]],
+        ids: list[str],
+    ) -> dict[str, dict[str, Any]]:
+        """IDの一覧をまとめて取得し、ID→行のdictとしてキャッシュに登録"""
+        rows = {str(row["id"]): row for row in await fetch(ids)}
+        for key, row in rows.items():
+            cache.set(key, row)
+        return rows
+
+    async def _read_many(
+        self,
+        cache: TTLCache[str, dict[str, Any]],
+        loader: BatchLoader[dict[str, Any]],
+        ids: list[str],
+    ) -> dict[str, dict[str, Any] | None]:
+        """キャッシュにないIDだけをローダーでまとめて読み込む（要求順のdictを返す）"""
+        found: dict[str, dict[str, Any] | None] = {}
+        missing = []
+        for key in dict.fromkeys(ids):
+            cached = cache.get(key)
+            if cached is not None:
+                found[key] = cached
+            else:
+                missing.append(key)
+
+        if missing:
+            found.update(await loader.load_many(missing))
+
+        return {key: found[key] for key in dict.fromkeys(ids)}
+
+    async def get_project(
+        self, project_id: str, use_cache: bool = True
+    ) -> dict[str, Any] | None:
         """
         プロジェクト情報を取得
 
         Args:
             project_id: 取得するプロジェクトのID
+            use_cache: Falseの場合はキャッシュを使わずにデータベースから読み込む
+                （フロントエンドがSupabaseで直接更新した行もすぐに反映する）
 
         Returns:
             プロジェクト情報のdict、存在しない場合はNone
@@ -36,52 +189,47 @@ class SupabaseService:
             Exception: データベースエラーが発生した場合
         """
         try:
-            result = (
-                self.client.table("projects")
-                .select("*")
-                .eq("id", project_id)
-                .single()
-                .execute()
+            project = await self._read_through(
+                self.project_cache,
+                project_id,
+                lambda: self.repository.get_project(project_id),
+                refresh=not use_cache,
             )
 
-            return result.data
-
-        except Exception as e:
-            if "404" in str(e) or "not found" in str(e).lower():
+            if project is None:
                 logger.info(f"Project {project_id} not found")
-                return None
 
+            return project
+
+        except Exception as e:
             logger.error(f"Error fetching project: {e}")
             raise
 
-    async def get_latest_schedule(self, project_id: str) -> dict[str, Any] | None:
+    async def get_latest_schedule_with_items(
+        self, project_id: str
+    ) -> dict[str, Any] | None:
         """
-        プロジェクトの最新工程表を取得
+        プロジェクトと最新工程表（工程アイテム付き）を取得
+
+        最新工程表ポインタを使った1回のクエリで取得する
 
         Args:
             project_id: プロジェクトID
 
         Returns:
-            最新の工程表情報、存在しない場合はNone
+            {project: {...}, schedule: {..., items: [...]} | None}、
+            プロジェクトが存在しない場合はNone
 
         Raises:
             Exception: データベースエラーが発生した場合
         """
         try:
-            result = (
-                self.client.table("project_schedules")
-                .select("*")
-                .eq("project_id", project_id)
-                .order("version", desc=True)
-                .limit(1)
-                .execute()
+            return await self._read_through(
+                self.latest_schedule_cache,
+                project_id,
+                lambda: self.repository.get_latest_schedule_with_items(project_id),
             )
 
-            if result.data and len(result.data) > 0:
-                return result.data[0]
-
-            return None
-
         except Exception as e:
             logger.error(f"Error fetching latest schedule: {e}")
             raise
@@ -100,29 +248,58 @@ class SupabaseService:
             Exception: データベースエラーが発生した場合
         """
         try:
-            result = (
-                self.client.table("schedule_items")
-                .select("*")
-                .eq("schedule_id", schedule_id)
-                .order("order_index")
-                .execute()
+            items = await self._read_through(
+                self.schedule_items_cache,
+                schedule_id,
+                lambda: self.repository.get_schedule_items(schedule_id),
             )
-
-            return result.data or []
+            return items or []
 
         except Exception as e:
             logger.error(f"Error fetching schedule items: {e}")
             raise
 
+    async def get_schedule_with_details(
+        self, schedule_id: str
+    ) -> dict[str, Any] | None:
+        """
+        工程表をプロジェクト情報・工程アイテム付きで取得（PDF生成用）
+
+        Args:
+            schedule_id: 工程表ID
+
+        Returns:
+            工程表データ、存在しない場合はNone
+
+        Raises:
+            Exception: データベースエラーが発生した場合
+        """
+        try:
+            return await self._read_through(
+                self.schedule_details_cache,
+                schedule_id,
+                lambda: self.repository.get_schedule_with_details(schedule_id),
+            )
+
+        except Exception as e:
+            logger.error(f"Error fetching schedule details: {e}")
+            raise
+
     async def list_projects(
-        self, limit: int = 100, offset: int = 0
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        cursor: ProjectCursor | None = None,
+        columns: tuple[str, ...] = PROJECT_COLUMNS,
     ) -> list[dict[str, Any]]:
         """
         プロジェクト一覧を取得
 
         Args:
             limit: 取得する最大件数
-            offset: オフセット（ページネーション用）
+            offset: オフセット（cursor 未指定時のみ）
+            cursor: 前ページ最後の行の位置（キーセットページネーション）
+            columns: 取得する列
 
         Returns:
             プロジェクトのリスト
@@ -131,17 +308,269 @@ class SupabaseService:
             Exception: データベースエラーが発生した場合
         """
         try:
-            result = (
-                self.client.table("projects")
-                .select("*")
-                .order("created_at", desc=True)
-                .limit(limit)
-                .offset(offset)
-                .execute()
+            projects = await self._read_through(
+                self.project_list_cache,
+                (limit, offset, cursor, columns),
+                lambda: self.repository.list_projects(
+                    limit=limit, offset=offset, cursor=cursor, columns=columns
+                ),
             )
-
-            return result.data or []
+            return projects or []
 
         except Exception as e:
             logger.error(f"Error listing projects: {e}")
             raise
+
+    async def get_dashboard_summary(self, recent_limit: int) -> dict[str, Any]:
+        """
+        ダッシュボードの集計を取得
+
+        Args:
+            recent_limit: 最近のプロジェクトの件数
+
+        Returns:
+            {status_counts: {ステータス: プロジェクト数}, recent_projects: [...]}
+
+        Raises:
+            Exception: データベースエラーが発生した場合
+        """
+        try:
+            summary = await self._read_through(
+                self.dashboard_cache,
+                recent_limit,
+                lambda: self.repository.get_dashboard_summary(recent_limit),
+            )
+            return summary or {"status_counts": {}, "recent_projects": []}
+
+        except Exception as e:
+            logger.error(f"Error fetching dashboard summary: {e}")
+            raise
+
+    async def get_project_status(self, project_id: str) -> dict[str, Any] | None:
+        """
+        プロジェクトの進捗集計を取得
+
+        Args:
+            project_id: プロジェクトID
+
+        Returns:
+            ステータス・ステータス別の工程アイテム数、存在しない場合はNone
+
+        Raises:
+            Exception: データベースエラーが発生した場合
+        """
+        try:
+            return await self._read_through(
+                self.project_status_cache,
+                project_id,
+                lambda: self.repository.get_project_status(project_id),
+            )
+
+        except Exception as e:
+            logger.error(f"Error fetching project status: {e}")
+            raise
+
+    async def get_projects_by_ids(
+        self, project_ids: list[str]
+    ) -> dict[str, dict[str, Any] | None]:
+        """
+        IDの一覧に該当するプロジェクトをまとめて取得
+
+        Args:
+            project_ids: プロジェクトIDの一覧
+
+        Returns:
+            プロジェクトID→プロジェクト情報のdict（存在しない場合はNone）
+
+        Raises:
+            Exception: データベースエラーが発生した場合
+        """
+        try:
+            return await self._read_many(
+                self.project_cache, self.project_loader, project_ids
+            )
+
+        except Exception as e:
+            logger.error(f"Error fetching projects by ids: {e}")
+            raise
+
+    async def get_schedules_by_ids(
+        self, schedule_ids: list[str]
+    ) -> dict[str, dict[str, Any] | None]:
+        """
+        IDの一覧に該当する工程表を工程アイテム付きでまとめて取得
+
+        Args:
+            schedule_ids: 工程表IDの一覧
+
+        Returns:
+            工程表ID→工程表（items 付き）のdict（存在しない場合はNone）
+
+        Raises:
+            Exception: データベースエラーが発生した場合
+        """
+        try:
+            return await self._read_many(
+                self.schedule_cache, self.schedule_loader, schedule_ids
+            )
+
+        except Exception as e:
+            logger.error(f"Error fetching schedules by ids: {e}")
+            raise
+
+    async def get_schedule_diff(
+        self, project_id: str, from_version: int, to_version: int
+    ) -> dict[str, Any] | None:
+        """
+        プロジェクトの2つのバージョンの工程表の差分を取得
+
+        バージョン番号は最新の工程表が削除されると再利用されるため、
+        差分は工程表IDの組をキーにキャッシュする
+
+        Args:
+            project_id: プロジェクトID
+            from_version: 比較元のバージョン
+            to_version: 比較先のバージョン
+
+        Returns:
+            差分（diff_schedule_items の結果に project_id・from・to を追加）、
+            いずれかのバージョンが存在しない場合はNone
+
+        Raises:
+            Exception: データベースエラーが発生した場合
+        """
+        try:
+            schedules = {
+                schedule["version"]: schedule
+                for schedule in await self.repository.get_schedules_by_versions(
+                    project_id, [from_version, to_version]
+                )
+            }
+            if from_version not in schedules or to_version not in schedules:
+                return None
+
+            key = (str(schedules[from_version]["id"]), str(schedules[to_version]["id"]))
+
+            async def load() -> dict[str, Any] | None:
+                loaded = await self.get_schedules_by_ids(list(key))
+                source, target = loaded[key[0]], loaded[key[1]]
+                if source is None or target is None:
+                    return None
+                return {
+                    "project_id": project_id,
+                    "from": {k: source[k] for k in ("id", "version", "created_at")},
+                    "to": {k: target[k] for k in ("id", "version", "created_at")},
+                    **diff_schedule_items(source["items"], target["items"]),
+                }
+
+            return await self._read_through(self.schedule_diff_cache, key, load)
+
+        except Exception as e:
+            logger.error(f"Error fetching schedule diff: {e}")
+            raise
+
+    async def create_schedule_version(
+        self, project_id: str, items: list[ScheduleRow]
+    ) -> dict[str, Any]:
+        """
+        工程表の新バージョンを作成し、関連するキャッシュを無効化して変更を通知
+
+        書き込みのまとめが有効な場合は、同時に届いた他の取り込みと
+        1回の呼び出しにまとめて書き込む（結果は呼び出しごとに返る）
+
+        Args:
+            project_id: プロジェクトID
+            items: 工程アイテム一覧
+
+        Returns:
+            {id, version, new_item_count}
+
+        Raises:
+            ProjectNotFoundError: プロジェクトが見つからない場合
+            Exception: データベースエラーが発生した場合
+        """
+        try:
+            if self.write_batcher is not None:
+                created = await self.write_batcher.submit(project_id, items)
+            else:
+                created = await self.repository.create_schedule_version(
+                    project_id, items
+                )
+        finally:
+            # 失敗時も作成済みの可能性があるため無効化する
+            self.invalidate_project(project_id)
+
+        self.events.publish(
+            "schedule_created",
+            project_id,
+            {
+                "schedule_id": str(created["id"]),
+                "version": created["version"],
+                "item_count": len(items),
+            },
+        )
+        return created
+
+    def invalidate_project(self, project_id: str) -> None:
+        """
+        プロジェクトに関するキャッシュを無効化
+
+        Args:
+            project_id: プロジェクトID
+        """
+        self.project_cache.invalidate(project_id)
+        self.latest_schedule_cache.invalidate(project_id)
+        self.project_status_cache.invalidate(project_id)
+        self.project_list_cache.clear()
+        self.dashboard_cache.clear()
+
+        # 更新前に開始した読み込みの結果を、以降のリクエストで共有しない
+        for cache in (
+            self.project_cache,
+            self.latest_schedule_cache,
+            self.project_status_cache,
+        ):
+            self.single_flight.forget(cache.name, project_id)
+        self.single_flight.forget_operation(self.project_list_cache.name)
+        self.single_flight.forget_operation(self.dashboard_cache.name)
+        logger.info(f"Cache invalidated for project: {project_id}")
+
+    def cache_stats(self) -> dict[str, dict[str, Any]]:
+        """
+        キャッシュの統計情報
+
+        Returns:
+            キャッシュ名ごとのヒット数・ミス数・サイズなど
+        """
+        return {cache.name: cache.stats() for cache in self._caches}
+
+    def single_flight_stats(self) -> dict[str, dict[str, Any]]:
+        """
+        読み込みの集約の統計情報
+
+        Returns:
+            キャッシュ名ごとの実行回数・共有された回数
+        """
+        return self.single_flight.stats()
+
+    def batch_stats(self) -> dict[str, dict[str, Any]]:
+        """
+        一括取得・一括書き込みの統計情報
+
+        Returns:
+            ローダー名ごとのクエリ回数・読み込んだID数・共有されたID数
+            （書き込みのまとめが有効な場合は schedule_writes も含む）
+        """
+        stats = {
+            loader.name: loader.stats()
+            for loader in (self.project_loader, self.schedule_loader)
+        }
+        if self.write_batcher is not None:
+            stats["schedule_writes"] = self.write_batcher.stats()
+        return stats
+
+    async def close(self) -> None:
+        """終了処理（書き込み待ちの工程表をすべて書き込み、変更通知の購読を終了）"""
+        if self.write_batcher is not None:
+            await self.write_batcher.drain()
+        self.events.close()
@@ -0,0 +1,247 @@
+"""
+罫線ベースの表検出エンジン
+ページのベクター描画（罫線）からグリッドを復元し、テキストをセルに割り当てる
+
+`page.find_tables()` よりも軽量で、罫線で囲まれていないタイトル部を
+表として誤検出しない
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any
+
+import fitz  # PyMuPDF
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 同一の罫線とみなす座標の許容誤差（pt）
+SNAP_TOLERANCE = 3.0
+
+# 表の罫線として採用する最小の長さ比率（最長の罫線に対する比率）
+MIN_SPAN_RATIO = 0.5
+
+
+@dataclass
+class DetectedTable:
+    """検出された表（データと配置情報）"""
+
+    data: list[list[str]]  # 表データ（ヘッダー行を含む）
+    bbox: tuple[float, float, float, float]  # 表全体の矩形 (x0, y0, x1, y1)
+    column_bounds: list[float]  # 列境界のx座標（昇順）
+
+
+def collect_segments(
+    drawings: list[dict[str, Any]],
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    描画パスから水平・垂直の線分を抽出
+
+    Args:
+        drawings: `page.get_drawings()` の結果
+
+    Returns:
+        (水平線分 [y, x0, x1] の配列, 垂直線分 [x, y0, y1] の配列)
+    """
+    horizontal: list[tuple[float, float, float]] = []
+    vertical: list[tuple[float, float, float]] = []
+
+    for path in drawings:
+        stroked = path.get("color") is not None
+        for item in path["items"]:
+            kind = item[0]
+
+            if kind == "l":
+                p1, p2 = item[1], item[2]
+                if abs(p1.y - p2.y) <= SNAP_TOLERANCE:
+                    horizontal.append(((p1.y + p2.y) / 2, p1.x, p2.x))
+                elif abs(p1.x - p2.x) <= SNAP_TOLERANCE:
+                    vertical.append(((p1.x + p2.x) / 2, p1.y, p2.y))
+                continue
+
+            if kind == "re":
+                rect = item[1]
+            elif kind == "qu":
+                rect = item[1].rect
+            else:
+                continue
+
+            # 細い塗りつぶし矩形は罫線として扱う（Excel等の出力で多い）
+            if rect.height <= SNAP_TOLERANCE:
+                horizontal.append(((rect.y0 + rect.y1) / 2, rect.x0, rect.x1))
+            elif rect.width <= SNAP_TOLERANCE:
+                vertical.append(((rect.x0 + rect.x1) / 2, rect.y0, rect.y1))
+            elif stroked:
+                horizontal.append((rect.y0, rect.x0, rect.x1))
+                horizontal.append((rect.y1, rect.x0, rect.x1))
+                vertical.append((rect.x0, rect.y0, rect.y1))
+                vertical.append((rect.x1, rect.y0, rect.y1))
+
+    def to_array(segments: list[tuple[float, float, float]]) -> np.ndarray:
+        array = np.array(segments, dtype=float).reshape(-1, 3)
+        # 始点・終点の向きを揃える
+        array[:, 1:] = np.sort(array[:, 1:], axis=1)
+        return array
+
+    return to_array(horizontal), to_array(vertical)
+
+
+def cluster_lines(
+    segments: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    位置の近い線分を1本の罫線にまとめる
+
+    Args:
+        segments: [位置, 始点, 終点] の配列
+
+    Returns:
+        (罫線の位置, 始点の最小値, 終点の最大値, 線分長の合計)
+    """
+    order = np.argsort(segments[:, 0], kind="stable")
+    ordered = segments[order]
+
+    breaks = np.diff(ordered[:, 0]) > SNAP_TOLERANCE
+    starts = np.concatenate(([0], np.flatnonzero(breaks) + 1))
+    labels = np.cumsum(np.concatenate(([False], breaks)))
+
+    positions = np.bincount(labels, weights=ordered[:, 0]) / np.bincount(labels)
+    min_starts = np.minimum.reduceat(ordered[:, 1], starts)
+    max_ends = np.maximum.reduceat(ordered[:, 2], starts)
+    lengths = np.bincount(labels, weights=ordered[:, 2] - ordered[:, 1])
+
+    return positions, min_starts, max_ends, lengths
+
+
+def detect_grid(
+    page: fitz.Page, segments: tuple[np.ndarray, np.ndarray] | None = None
+) -> tuple[np.ndarray, np.ndarray] | None:
+    """
+    罫線から表のグリッドを検出
+
+    Args:
+        page: 対象ページ
+        segments: 抽出済みの (水平線分, 垂直線分)。未指定時はページから抽出
+
+    Returns:
+        (行境界のy座標, 列境界のx座標)、グリッドが見つからない場合はNone
+    """
+    if segments is None:
+        segments = collect_segments(page.get_drawings())
+    horizontal, vertical = segments
+    if len(horizontal) < 2 or len(vertical) < 2:
+        return None
+
+    # 表の幅に近い水平罫線を行境界として採用
+    h_pos, h_start, h_end, _ = cluster_lines(horizontal)
+    h_span = h_end - h_start
+    row_mask = h_span >= h_span.max() * MIN_SPAN_RATIO
+    row_bounds = h_pos[row_mask]
+    if len(row_bounds) < 3:  # ヘッダー + 最低1行
+        return None
+
+    left = h_start[row_mask].min() - SNAP_TOLERANCE
+    right = h_end[row_mask].max() + SNAP_TOLERANCE
+    top, bottom = row_bounds[0], row_bounds[-1]
+
+    # 表の範囲内にある垂直線分のみを対象にする
+    inside = (
+        (vertical[:, 0] >= left)
+        & (vertical[:, 0] <= right)
+        & (vertical[:, 2] > top + SNAP_TOLERANCE)
+        & (vertical[:, 1] < bottom - SNAP_TOLERANCE)
+    )
+    vertical = vertical[inside]
+    if len(vertical) < 2:
+        return None
+
+    # 表の高さの大部分を覆う垂直罫線を列境界として採用
+    v_pos, _, _, v_length = cluster_lines(vertical)
+    col_bounds = v_pos[v_length >= (bottom - top) * MIN_SPAN_RATIO]
+    if len(col_bounds) < 2:
+        return None
+
+    return row_bounds, col_bounds
+
+
+def extract_cells(
+    page: fitz.Page, row_bounds: np.ndarray, col_bounds: np.ndarray
+) -> list[list[str]]:
+    """
+    グリッドの各セルにテキストを割り当てる
+
+    Args:
+        page: 対象ページ
+        row_bounds: 行境界のy座標（昇順）
+        col_bounds: 列境界のx座標（昇順）
+
+    Returns:
+        表データ（行 × 列のテキスト）
+    """
+    n_rows = len(row_bounds) - 1
+    n_cols = len(col_bounds) - 1
+    cells: list[list[list[str]]] = [[[] for _ in range(n_cols)] for _ in range(n_rows)]
+
+    clip = fitz.Rect(col_bounds[0], row_bounds[0], col_bounds[-1], row_bounds[-1])
+    words = page.get_text("words", clip=clip)
+
+    if words:
+        boxes = np.array([word[:4] for word in words], dtype=float)
+        center_x = (boxes[:, 0] + boxes[:, 2]) / 2
+        center_y = (boxes[:, 1] + boxes[:, 3]) / 2
+        col_index = np.searchsorted(col_bounds, center_x, side="right") - 1
+        row_index = np.searchsorted(row_bounds, center_y, side="right") - 1
+        valid = (
+            (col_index >= 0)
+            & (col_index < n_cols)
+            & (row_index >= 0)
+            & (row_index < n_rows)
+        )
+
+        last_line: dict[tuple[int, int], tuple[int, int]] = {}
+        for word_index in np.flatnonzero(valid):
+            word = words[word_index]
+            row, col = int(row_index[word_index]), int(col_index[word_index])
+            line_key = (word[5], word[6])  # (block_no, line_no)
+            cell = cells[row][col]
+            if cell:
+                cell.append(" " if last_line[(row, col)] == line_key else "\n")
+            cell.append(word[4])
+            last_line[(row, col)] = line_key
+
+    return [["".join(cell) for cell in row] for row in cells]
+
+
+def detect_ruled_table(
+    page: fitz.Page, segments: tuple[np.ndarray, np.ndarray] | None = None
+) -> DetectedTable | None:
+    """
+    罫線で描画された表を検出してデータを抽出
+
+    Args:
+        page: 対象ページ
+        segments: 抽出済みの (水平線分, 垂直線分)。未指定時はページから抽出
+
+    Returns:
+        検出された表、罫線の表が見つからない場合はNone
+    """
+    grid = detect_grid(page, segments)
+    if grid is None:
+        logger.info("No ruled table grid found on page")
+        return None
+
+    row_bounds, col_bounds = grid
+    logger.info(
+        f"Ruled table grid detected: {len(row_bounds) - 1} rows, "
+        f"{len(col_bounds) - 1} columns"
+    )
+    return DetectedTable(
+        data=extract_cells(page, row_bounds, col_bounds),
+        bbox=(
+            float(col_bounds[0]),
+            float(row_bounds[0]),
+            float(col_bounds[-1]),
+            float(row_bounds[-1]),
+        ),
+        column_bounds=[float(x) for x in col_bounds],
+    )
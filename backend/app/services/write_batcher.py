@@ -0,0 +1,168 @@
+"""
+工程表書き込みのマイクロバッチ
+同時に届いた取り込みの工程表作成を短い待ち時間の間まとめ、1回の呼び出しで書き込む
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any
+
+from app.repositories.base import PROJECT_NOT_FOUND_SQLSTATE, ScheduleRepository
+from app.schemas.pdf import ProjectNotFoundError, ScheduleRow
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingWrite:
+    """書き込み待ちの工程表"""
+
+    project_id: str
+    items: list[ScheduleRow]
+    future: asyncio.Future[dict[str, Any]]
+
+
+class ScheduleWriteBatcher:
+    """工程表の新バージョン作成をまとめて書き込む
+
+    最初の書き込み要求から window 秒経過するか、待機中の工程アイテム数が
+    max_rows 以上になった時点で、待機中の要求を create_schedule_versions の
+    1回の呼び出しで書き込む。要求ごとにデータベース側で個別に処理されるため、
+    成功・失敗は呼び出し元ごとに返る
+    """
+
+    def __init__(self, repository: ScheduleRepository, window: float, max_rows: int):
+        """
+        Args:
+            repository: データベースアクセスのリポジトリ
+            window: 書き込みをまとめる最大の待ち時間（秒）
+            max_rows: 1回にまとめる工程アイテム数の上限（到達時は待たずに書き込む）
+        """
+        self.repository = repository
+        self.window = window
+        self.max_rows = max_rows
+        self._pending: list[_PendingWrite] = []
+        self._pending_rows = 0
+        self._timer: asyncio.TimerHandle | None = None
+        self._flushes: set[asyncio.Task[None]] = set()
+        self.batches = 0
+        self.writes = 0
+        self.rows = 0
+        self.failed_writes = 0
+        self.max_batch_writes = 0
+
+    async def submit(self, project_id: str, items: list[ScheduleRow]) -> dict[str, Any]:
+        """
+        工程表の新バージョン作成を要求し、書き込み完了まで待つ
+
+        Args:
+            project_id: プロジェクトID
+            items: 工程アイテム一覧
+
+        Returns:
+            {id, version, new_item_count}
+
+        Raises:
+            ProjectNotFoundError: プロジェクトが見つからない場合
+            RuntimeError: この要求の書き込みに失敗した場合
+            Exception: 一括書き込みの呼び出し自体が失敗した場合
+        """
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[dict[str, Any]] = loop.create_future()
+        self._pending.append(_PendingWrite(project_id, items, future))
+        self._pending_rows += len(items)
+
+        if self._pending_rows >= self.max_rows:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+
+        # 呼び出し元がキャンセルされても、まとめた書き込みは継続する
+        return await asyncio.shield(future)
+
+    def _flush(self) -> None:
+        """待機中の要求を1回の書き込みとして開始"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+
+        batch, self._pending, self._pending_rows = self._pending, [], 0
+        task = asyncio.ensure_future(self._write(batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _write(self, batch: list[_PendingWrite]) -> None:
+        """まとめた要求を書き込み、各呼び出し元に結果を渡す"""
+        self.batches += 1
+        self.writes += len(batch)
+        self.rows += sum(len(write.items) for write in batch)
+        self.max_batch_writes = max(self.max_batch_writes, len(batch))
+
+        try:
+            results = await self.repository.create_schedule_versions(
+                [(write.project_id, write.items) for write in batch]
+            )
+        except BaseException as e:
+            logger.error(f"Batched schedule write failed ({len(batch)} writes): {e}")
+            self.failed_writes += len(batch)
+            for write in batch:
+                if isinstance(e, Exception):
+                    self._set_exception(write.future, e)
+                else:
+                    write.future.cancel()
+            if not isinstance(e, Exception):
+                raise
+            return
+
+        for write, result in zip(batch, results, strict=True):
+            if "id" in result:
+                if not write.future.done():
+                    write.future.set_result(result)
+            else:
+                self.failed_writes += 1
+                self._set_exception(
+                    write.future, _write_error(write.project_id, result)
+                )
+
+    @staticmethod
+    def _set_exception(future: asyncio.Future[Any], error: Exception) -> None:
+        """呼び出し元に例外を渡す"""
+        if future.done():
+            return
+        future.set_exception(error)
+        # 呼び出し元がキャンセル済みの場合の未取得警告を抑止（例外は呼び出し元で送出）
+        future.exception()
+
+    async def drain(self) -> None:
+        """待機中・書き込み中の要求をすべて書き込む（終了時）"""
+        self._flush()
+        while self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+    def stats(self) -> dict[str, Any]:
+        """書き込み回数・まとめた要求数などの統計情報"""
+        return {
+            "batches": self.batches,
+            "writes": self.writes,
+            "rows": self.rows,
+            "failed_writes": self.failed_writes,
+            "max_batch_writes": self.max_batch_writes,
+            "avg_batch_writes": (
+                round(self.writes / self.batches, 2) if self.batches else 0
+            ),
+            "pending": len(self._pending),
+            "in_flight": len(self._flushes),
+        }
+
+
+def _write_error(project_id: str, result: dict[str, Any]) -> Exception:
+    """一括書き込みで失敗した要求の結果を例外に変換"""
+    if result["error_code"] == PROJECT_NOT_FOUND_SQLSTATE:
+        return ProjectNotFoundError(f"Project {project_id} not found")
+    return RuntimeError(
+        f"create_schedule_version failed ({result['error_code']}): "
+        f"{result['error_message']}"
+    )
@@ -0,0 +1,161 @@
+"""
+テスト共通のフィクスチャ
+
+データベースを使うテストはローカルのPostgreSQL（TEST_DATABASE_URL）・
+Supabase（TEST_SUPABASE_URL / TEST_SUPABASE_SERVICE_ROLE_KEY）に接続し、
+未設定・接続できない場合はスキップする。
+PostgreSQLには sql/schema.sql を適用してから実行する（スキーマは再適用可能）
+"""
+
+import os
+import uuid
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, cast
+
+import asyncpg
+import httpx
+import pytest
+from supabase import AsyncClientOptions, acreate_client
+
+from app.repositories.base import ScheduleRepository
+from app.repositories.postgres import PostgresRepository, create_pool
+from app.repositories.supabase import SupabaseRepository
+
+SCHEMA_PATH = Path(__file__).resolve().parents[2] / "sql" / "schema.sql"
+
+# テストで作成したプロジェクトの名前の接頭辞（終了時にまとめて削除する）
+TEST_PROJECT_PREFIX = "pytest "
+
+
+@dataclass
+class RepositoryBackend:
+    """テスト対象のリポジトリとテストデータの作成・削除"""
+
+    name: str
+    repository: ScheduleRepository
+    insert_project: Callable[[str], Awaitable[str]]
+    delete_projects: Callable[[list[str]], Awaitable[None]]
+    project_ids: list[str] = field(default_factory=list)
+
+    async def create_project(self, label: str = "project") -> str:
+        """
+        テスト用のプロジェクトを作成
+
+        Returns:
+            作成したプロジェクトのID
+        """
+        name = f"{TEST_PROJECT_PREFIX}{label} {uuid.uuid4().hex[:8]}"
+        project_id = await self.insert_project(name)
+        self.project_ids.append(project_id)
+        return project_id
+
+    async def cleanup(self) -> None:
+        """作成したプロジェクトを削除（工程表・工程アイテムも削除される）"""
+        if self.project_ids:
+            await self.delete_projects(self.project_ids)
+            self.project_ids.clear()
+
+
+_schema_applied = False
+
+
+@pytest.fixture
+def test_database_url() -> str:
+    """テスト用のPostgreSQLの接続先（未設定の場合はスキップ）"""
+    dsn = os.getenv("TEST_DATABASE_URL", "")
+    if not dsn:
+        pytest.skip("TEST_DATABASE_URL が未設定のためスキップ")
+    return dsn
+
+
+@pytest.fixture
+async def postgres_pool(test_database_url: str) -> AsyncIterator[asyncpg.Pool]:
+    """ローカルのPostgreSQLのコネクションプール（スキーマ適用済み）"""
+    global _schema_applied
+    dsn = test_database_url
+    try:
+        pool = await create_pool(
+            dsn, min_size=1, max_size=4, statement_cache_size=100, command_timeout=30
+        )
+    except (OSError, asyncpg.PostgresError) as e:
+        pytest.skip(f"PostgreSQLに接続できないためスキップ: {e}")
+
+    try:
+        if not _schema_applied:
+            await pool.execute(SCHEMA_PATH.read_text(encoding="utf-8"))
+            _schema_applied = True
+        yield pool
+    finally:
+        await pool.close()
+
+
+@pytest.fixture
+async def postgres_repository(
+    postgres_pool: asyncpg.Pool,
+) -> AsyncIterator[RepositoryBackend]:
+    """ローカルのPostgreSQLに直接接続するリポジトリ"""
+
+    async def insert_project(name: str) -> str:
+        project_id = await postgres_pool.fetchval(
+            "INSERT INTO projects (project_name) VALUES ($1) RETURNING id", name
+        )
+        return str(project_id)
+
+    async def delete_projects(project_ids: list[str]) -> None:
+        await postgres_pool.execute(
+            "DELETE FROM projects WHERE id = ANY($1::uuid[])", project_ids
+        )
+
+    backend = RepositoryBackend(
+        "postgres", PostgresRepository(postgres_pool), insert_project, delete_projects
+    )
+    try:
+        yield backend
+    finally:
+        await backend.cleanup()
+
+
+@pytest.fixture
+async def supabase_repository() -> AsyncIterator[RepositoryBackend]:
+    """ローカルのSupabase（PostgREST）のリポジトリ"""
+    url = os.getenv("TEST_SUPABASE_URL", "")
+    key = os.getenv("TEST_SUPABASE_SERVICE_ROLE_KEY", "")
+    if not url or not key:
+        pytest.skip("TEST_SUPABASE_URL / TEST_SUPABASE_SERVICE_ROLE_KEY が未設定")
+
+    async with httpx.AsyncClient() as http_client:
+        client = await acreate_client(
+            url, key, options=AsyncClientOptions(httpx_client=http_client)
+        )
+        try:
+            await client.table("projects").select("id").limit(1).execute()
+        except Exception as e:
+            pytest.skip(f"Supabaseに接続できないためスキップ: {e}")
+
+        async def insert_project(name: str) -> str:
+            result = (
+                await client.table("projects").insert({"project_name": name}).execute()
+            )
+            rows = cast(list[dict[str, Any]], result.data)
+            return str(rows[0]["id"])
+
+        async def delete_projects(project_ids: list[str]) -> None:
+            await client.table("projects").delete().in_("id", project_ids).execute()
+
+        backend = RepositoryBackend(
+            "supabase", SupabaseRepository(client), insert_project, delete_projects
+        )
+        try:
+            yield backend
+        finally:
+            await backend.cleanup()
+
+
+@pytest.fixture(params=["postgres", "supabase"])
+def backend(request: pytest.FixtureRequest) -> RepositoryBackend:
+    """各接続方式のリポジトリ（接続できない方式のテストはスキップ）"""
+    return cast(
+        RepositoryBackend, request.getfixturevalue(f"{request.param}_repository")
+    )
@@ -0,0 +1,99 @@
+"""
+IDによる一括読み込み（BatchLoader）のテスト
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.batch_loader import BatchLoader
+
+
+class _Source:
+    """読み込みを待たせることができるテスト用の読み込み元"""
+
+    def __init__(self) -> None:
+        self.release = asyncio.Event()
+        self.calls: list[list[str]] = []
+        self.cancelled = False
+
+    async def load(self, ids: list[str]) -> dict[str, str]:
+        self.calls.append(ids)
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return {key: f"value {key}" for key in ids if key != "missing"}
+
+
+async def test_concurrent_requests_share_pending_keys() -> None:
+    source = _Source()
+    loader = BatchLoader("test", source.load)
+
+    first = asyncio.create_task(loader.load_many(["1", "2"]))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(loader.load_many(["2", "missing"]))
+    await asyncio.sleep(0)
+    source.release.set()
+
+    assert await first == {"1": "value 1", "2": "value 2"}
+    assert await second == {"2": "value 2", "missing": None}
+    assert source.calls == [["1", "2"], ["missing"]]
+    assert loader.stats()["keys_coalesced"] == 1
+    assert loader.stats()["in_flight"] == 0
+
+
+async def test_cancelled_owner_does_not_cancel_other_waiters() -> None:
+    source = _Source()
+    loader = BatchLoader("test", source.load)
+
+    owner = asyncio.create_task(loader.load_many(["1", "2"]))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(loader.load_many(["2"]))
+    await asyncio.sleep(0)
+
+    # 読み込みを開始したリクエストがキャンセルされても（クライアントの切断など）、
+    # 同じIDを待つリクエストには読み込み結果が渡される
+    owner.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await owner
+    source.release.set()
+
+    assert await waiter == {"2": "value 2"}
+    assert not source.cancelled
+    assert source.calls == [["1", "2"]]
+
+
+async def test_load_is_cancelled_when_no_one_is_waiting() -> None:
+    source = _Source()
+    loader = BatchLoader("test", source.load)
+
+    owner = asyncio.create_task(loader.load_many(["1"]))
+    await asyncio.sleep(0)
+    owner.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await owner
+    await asyncio.sleep(0)
+
+    assert source.cancelled
+    assert loader.stats()["in_flight"] == 0
+
+
+async def test_load_errors_are_raised_to_every_waiter() -> None:
+    release = asyncio.Event()
+
+    async def fail(ids: list[str]) -> dict[str, str]:
+        await release.wait()
+        raise RuntimeError("database unavailable")
+
+    loader: BatchLoader[str] = BatchLoader("test", fail)
+    first = asyncio.create_task(loader.load_many(["1"]))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(loader.load_many(["1"]))
+    await asyncio.sleep(0)
+    release.set()
+
+    for request in (first, second):
+        with pytest.raises(RuntimeError):
+            await request
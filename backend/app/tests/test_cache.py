@@ -0,0 +1,92 @@
+"""
+TTL付きLRUキャッシュのテスト
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import cache as cache_module
+from app.services.cache import TTLCache
+
+
+class _Clock:
+    """テスト用の時計（monotonic の代わり）"""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> _Clock:
+    clock = _Clock()
+    monkeypatch.setattr(
+        cache_module, "time", SimpleNamespace(monotonic=clock.monotonic)
+    )
+    return clock
+
+
+def test_entries_expire_after_ttl(clock: _Clock) -> None:
+    cache: TTLCache[str, str] = TTLCache("test", ttl=30, max_size=10)
+    cache.set("project", "value")
+
+    clock.now += 29
+    assert cache.get("project") == "value"
+
+    clock.now += 1
+    assert cache.get("project") is None
+    assert len(cache) == 0
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 1)
+
+
+def test_least_recently_used_entry_is_evicted(clock: _Clock) -> None:
+    cache: TTLCache[str, int] = TTLCache("test", ttl=30, max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    # 参照された a は最近使われたものとして残り、b が削除される
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_setting_existing_key_refreshes_ttl_and_order(clock: _Clock) -> None:
+    cache: TTLCache[str, int] = TTLCache("test", ttl=30, max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    clock.now += 20
+    cache.set("a", 10)
+    cache.set("c", 3)
+
+    clock.now += 20
+    assert cache.get("a") == 10
+    assert cache.get("b") is None
+
+
+@pytest.mark.parametrize("ttl, max_size", [(0, 10), (30, 0)])
+def test_disabled_cache_stores_nothing(ttl: float, max_size: int) -> None:
+    cache: TTLCache[str, int] = TTLCache("test", ttl=ttl, max_size=max_size)
+    cache.set("a", 1)
+
+    assert not cache.enabled
+    assert cache.get("a") is None
+
+
+def test_invalidate_where_removes_matching_keys() -> None:
+    cache: TTLCache[tuple[str, int], int] = TTLCache("test", ttl=30, max_size=10)
+    for version in (1, 2):
+        cache.set(("project-1", version), version)
+    cache.set(("project-2", 1), 1)
+
+    cache.invalidate_where(lambda key: key[0] == "project-1")
+
+    assert len(cache) == 1
+    assert cache.get(("project-2", 1)) == 1
+    assert cache.stats()["invalidations"] == 2
@@ -0,0 +1,131 @@
+"""
+エンドポイントごとのイベントループ停止のテスト
+イベントループの停止の検出を開始して各エンドポイントにリクエストを送り、
+処理中に観測した最大停止時間がしきい値未満であることを確認する（TEST_DATABASE_URL が必要）
+"""
+
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+
+import asyncpg
+import httpx
+import pytest
+
+from app import database
+from app.api.v1.pdf import pdf_service
+from app.config import settings
+from app.main import app
+from app.services.loop_monitor import loop_monitor
+from app.utils.middleware import LoopStallMiddleware
+from benchmarks.corpus import build_corpus
+
+# 許容する最大停止時間（PDFの解析・描画はPyMuPDF専用スレッドで実行されるため、これを超えない）
+MAX_STALL_MS = 100.0
+REQUESTS_PER_ROUTE = 3
+
+
+@dataclass
+class StallClient:
+    """停止時間を記録するアプリへのクライアントとテストデータ"""
+
+    client: httpx.AsyncClient
+    project_id: str
+    schedule_id: str
+    pdf: bytes
+
+
+@pytest.fixture
+async def stall_client(
+    test_database_url: str,
+    postgres_pool: asyncpg.Pool,
+    monkeypatch: pytest.MonkeyPatch,
+) -> AsyncIterator[StallClient]:
+    """テスト用のデータベースに接続し、停止の検出を開始したアプリへのクライアント"""
+    monkeypatch.setattr(settings, "database_backend", "postgres")
+    monkeypatch.setattr(settings, "database_url", test_database_url)
+    await database.init_database()
+    project_id = str(
+        await postgres_pool.fetchval(
+            "INSERT INTO projects (project_name) VALUES ($1) RETURNING id",
+            "pytest loop stalls",
+        )
+    )
+    pdfs = [pdf for pdf, _ in build_corpus(pdf_service, size=2)]
+
+    # LOOP_MONITOR_ENABLED=false（既定）ではアプリにミドルウェアが追加されないため、ここで追加する
+    monitored = (
+        app
+        if settings.loop_monitor_enabled
+        else LoopStallMiddleware(app, monitor=loop_monitor)
+    )
+    loop_monitor.start()
+    try:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=monitored), base_url="http://test"
+        ) as client:
+            schedule_id = ""
+            for pdf in pdfs:
+                schedule_id = (await _upload(client, project_id, pdf))["schedule_id"]
+            yield StallClient(client, project_id, schedule_id, pdfs[0])
+    finally:
+        await loop_monitor.stop()
+        loop_monitor.reset()
+        await postgres_pool.execute(
+            "DELETE FROM projects WHERE id = $1::uuid", project_id
+        )
+        await database.close_database()
+
+
+async def _upload(
+    client: httpx.AsyncClient, project_id: str, pdf: bytes
+) -> dict[str, str]:
+    response = await client.post(
+        "/api/v1/pdf/upload-pdf",
+        files={"pdf": ("schedule.pdf", pdf, "application/pdf")},
+        data={"project_id": project_id},
+    )
+    response.raise_for_status()
+    return dict(response.json())
+
+
+def _assert_no_stall(route: str) -> None:
+    stats = loop_monitor.route_stats()[route]
+    assert stats["requests"] == REQUESTS_PER_ROUTE
+    assert stats["max_stall_ms"] < MAX_STALL_MS, loop_monitor.stats()["reports"]
+
+
+@pytest.mark.parametrize(
+    "route",
+    [
+        "/api/v1/pdf/export-pdf/{schedule_id}",
+        "/api/v1/projects/{project_id}",
+        "/api/v1/projects/",
+        "/api/v1/projects/{project_id}/latest-schedule",
+        "/api/v1/projects/{project_id}/schedules/diff?from_version=1&to_version=2",
+        "/api/v1/projects/batch?ids={project_id}",
+        "/api/v1/projects/schedules/batch?ids={schedule_id}",
+        "/api/v1/dashboard/",
+        "/api/v1/dashboard/projects/{project_id}",
+    ],
+)
+async def test_get_endpoints_do_not_stall_event_loop(
+    stall_client: StallClient, route: str
+) -> None:
+    path = route.format(
+        project_id=stall_client.project_id, schedule_id=stall_client.schedule_id
+    )
+    loop_monitor.reset()
+
+    for _ in range(REQUESTS_PER_ROUTE):
+        (await stall_client.client.get(path)).raise_for_status()
+
+    _assert_no_stall(f"GET {route.split('?')[0]}")
+
+
+async def test_upload_does_not_stall_event_loop(stall_client: StallClient) -> None:
+    loop_monitor.reset()
+
+    for _ in range(REQUESTS_PER_ROUTE):
+        await _upload(stall_client.client, stall_client.project_id, stall_client.pdf)
+
+    _assert_no_stall("POST /api/v1/pdf/upload-pdf")
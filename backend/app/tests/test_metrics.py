@@ -0,0 +1,76 @@
+"""
+メトリクスのエンドポイントのテスト（データベースに接続せずに実行する）
+"""
+
+from collections.abc import AsyncIterator
+
+import httpx
+import pytest
+
+from app.config import settings
+from app.main import app
+
+ADMIN_TOKEN = "test-admin-token"
+
+
+@pytest.fixture
+async def client(monkeypatch: pytest.MonkeyPatch) -> AsyncIterator[httpx.AsyncClient]:
+    monkeypatch.setattr(settings, "admin_token", ADMIN_TOKEN)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+@pytest.mark.parametrize(
+    "headers",
+    [
+        {"X-Admin-Token": ADMIN_TOKEN},
+        {"Authorization": f"Bearer {ADMIN_TOKEN}"},
+    ],
+)
+async def test_metrics_accepts_admin_token(
+    client: httpx.AsyncClient, headers: dict[str, str]
+) -> None:
+    response = await client.get("/metrics", headers=headers)
+
+    assert response.status_code == 200
+    assert "http_requests_total" in response.text
+
+
+@pytest.mark.parametrize(
+    "headers",
+    [
+        {},
+        {"X-Admin-Token": "wrong"},
+        {"Authorization": "Basic dGVzdA=="},
+    ],
+)
+async def test_metrics_rejects_missing_or_wrong_token(
+    client: httpx.AsyncClient, headers: dict[str, str]
+) -> None:
+    response = await client.get("/metrics", headers=headers)
+
+    assert response.status_code == 403
+
+
+async def test_event_loop_stats_require_admin_token(
+    client: httpx.AsyncClient,
+) -> None:
+    rejected = await client.get("/metrics/event-loop")
+    accepted = await client.get(
+        "/metrics/event-loop", headers={"X-Admin-Token": ADMIN_TOKEN}
+    )
+
+    assert rejected.status_code == 403
+    assert accepted.status_code == 200
+    assert "reports" in accepted.json()
+
+
+async def test_metrics_rejects_all_when_token_is_not_configured(
+    client: httpx.AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "admin_token", "")
+
+    response = await client.get("/metrics", headers={"X-Admin-Token": ""})
+
+    assert response.status_code == 403
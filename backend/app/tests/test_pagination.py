@@ -0,0 +1,56 @@
+"""
+カーソル（キーセット）ページネーションのトークンのテスト
+"""
+
+import base64
+import uuid
+from datetime import UTC, datetime
+
+import pytest
+
+from app.repositories.base import ProjectCursor
+from app.utils.pagination import InvalidCursorError, decode_cursor, encode_cursor
+
+ROW_ID = str(uuid.uuid4())
+CREATED_AT = datetime(2025, 4, 1, 9, 30, 15, 123456, tzinfo=UTC)
+
+
+@pytest.mark.parametrize(
+    "created_at",
+    [
+        CREATED_AT,
+        # PostgRESTはISO形式の文字列で返す
+        CREATED_AT.isoformat(),
+    ],
+)
+def test_cursor_round_trip(created_at: datetime | str) -> None:
+    token = encode_cursor({"id": uuid.UUID(ROW_ID), "created_at": created_at})
+
+    assert "=" not in token
+    assert decode_cursor(token) == ProjectCursor(created_at=CREATED_AT, id=ROW_ID)
+
+
+def test_cursor_round_trip_with_null_created_at() -> None:
+    token = encode_cursor({"id": ROW_ID, "created_at": None})
+
+    assert decode_cursor(token) == ProjectCursor(created_at=None, id=ROW_ID)
+
+
+def _token(payload: str) -> str:
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        "",
+        "not a cursor",
+        _token("{}"),
+        _token('["2025-04-01"]'),
+        _token('["not a date", "id"]'),
+        _token('[1, "id"]'),
+    ],
+)
+def test_invalid_cursor_is_rejected(token: str) -> None:
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(token)
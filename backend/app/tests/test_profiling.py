@@ -0,0 +1,48 @@
+"""
+リクエスト単位のプロファイリングのテスト
+"""
+
+import pstats
+import threading
+from pathlib import Path
+
+from app.services.pdf_worker import run_pdf_task
+from app.services.profiling import ProfilingMode, RequestProfile, current_profile
+
+
+def _render_in_worker() -> str:
+    """PyMuPDF専用スレッドで実行される処理の代わり"""
+    return threading.current_thread().name
+
+
+async def test_cprofile_includes_pdf_worker_tasks(tmp_path: Path) -> None:
+    profile = RequestProfile(ProfilingMode.CPROFILE, interval=0.001)
+    token = current_profile.set(profile)
+    profile.start()
+    try:
+        thread_name = await run_pdf_task(_render_in_worker)
+    finally:
+        profile.stop()
+        current_profile.reset(token)
+    path = tmp_path / f"request{profile.suffix}"
+    profile.write(path)
+
+    functions = {name for _, _, name in pstats.Stats(str(path)).stats}  # type: ignore[attr-defined]
+    assert thread_name.startswith("pdf-worker")
+    assert "_render_in_worker" in functions
+
+
+async def test_worker_tasks_are_not_profiled_outside_profiled_requests(
+    tmp_path: Path,
+) -> None:
+    profile = RequestProfile(ProfilingMode.CPROFILE, interval=0.001)
+    profile.start()
+    try:
+        await run_pdf_task(_render_in_worker)
+    finally:
+        profile.stop()
+    path = tmp_path / f"request{profile.suffix}"
+    profile.write(path)
+
+    functions = {name for _, _, name in pstats.Stats(str(path)).stats}  # type: ignore[attr-defined]
+    assert "_render_in_worker" not in functions
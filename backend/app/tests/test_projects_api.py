@@ -0,0 +1,92 @@
+"""
+プロジェクト・ダッシュボードのエンドポイントのテスト（TEST_DATABASE_URL が必要）
+"""
+
+from collections.abc import AsyncIterator
+
+import asyncpg
+import httpx
+import pytest
+
+from app import database
+from app.api.v1.pdf import pdf_service
+from app.config import settings
+from app.main import app
+from benchmarks.corpus import build_corpus
+
+
+@pytest.fixture
+async def client(
+    test_database_url: str,
+    postgres_pool: asyncpg.Pool,
+    monkeypatch: pytest.MonkeyPatch,
+) -> AsyncIterator[httpx.AsyncClient]:
+    """テスト用のデータベースに接続したアプリへのクライアント"""
+    monkeypatch.setattr(settings, "database_backend", "postgres")
+    monkeypatch.setattr(settings, "database_url", test_database_url)
+    await database.init_database()
+    try:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as c:
+            yield c
+    finally:
+        await database.close_database()
+
+
+@pytest.fixture
+async def project_id(postgres_pool: asyncpg.Pool) -> AsyncIterator[str]:
+    project_id = str(
+        await postgres_pool.fetchval(
+            "INSERT INTO projects (project_name) VALUES ($1) RETURNING id",
+            "pytest projects api",
+        )
+    )
+    try:
+        yield project_id
+    finally:
+        await postgres_pool.execute(
+            "DELETE FROM projects WHERE id = $1::uuid", project_id
+        )
+
+
+async def _upload(client: httpx.AsyncClient, project_id: str, pdf: bytes) -> None:
+    response = await client.post(
+        "/api/v1/pdf/upload-pdf",
+        files={"pdf": ("schedule.pdf", pdf, "application/pdf")},
+        data={"project_id": project_id},
+    )
+    response.raise_for_status()
+
+
+async def test_uppercase_project_id_sees_new_schedule(
+    client: httpx.AsyncClient, project_id: str
+) -> None:
+    pdfs = [pdf for pdf, _ in build_corpus(pdf_service, size=2)]
+    upper_id = project_id.upper()
+
+    # 大文字のIDで読み込んだキャッシュも、取り込み時の無効化の対象になる
+    await _upload(client, project_id, pdfs[0])
+    latest = await client.get(f"/api/v1/projects/{upper_id}/latest-schedule")
+    status = await client.get(f"/api/v1/dashboard/projects/{upper_id}")
+    assert (latest.json()["version"], status.json()["version"]) == (1, 1)
+
+    await _upload(client, project_id, pdfs[1])
+    latest = await client.get(f"/api/v1/projects/{upper_id}/latest-schedule")
+    status = await client.get(f"/api/v1/dashboard/projects/{upper_id}")
+    assert (latest.json()["version"], status.json()["version"]) == (2, 2)
+
+
+@pytest.mark.parametrize(
+    "route",
+    [
+        "/api/v1/projects/not-a-uuid",
+        "/api/v1/projects/not-a-uuid/latest-schedule",
+        "/api/v1/projects/not-a-uuid/schedules/diff?from_version=1&to_version=2",
+        "/api/v1/dashboard/projects/not-a-uuid",
+    ],
+)
+async def test_invalid_project_id_is_rejected(
+    client: httpx.AsyncClient, route: str
+) -> None:
+    assert (await client.get(route)).status_code == 422
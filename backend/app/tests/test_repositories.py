@@ -0,0 +1,244 @@
+"""
+リポジトリ（PostgreSQL直接接続 / Supabase）のテスト
+同じテストを両方の接続方式で実行し、結果の形式が一致することを確認する
+"""
+
+import uuid
+from datetime import date, datetime
+
+import asyncpg
+import pytest
+
+from app.repositories.base import ProjectCursor
+from app.schemas.pdf import ProjectNotFoundError, ScheduleRow
+from app.tests.conftest import RepositoryBackend
+
+
+def _items(*names: str) -> list[ScheduleRow]:
+    return [
+        ScheduleRow(
+            process_name=name,
+            planned_start_date=date(2025, 4, 1 + index),
+            planned_end_date=date(2025, 4, 10 + index),
+            assignee="山田",
+            order_index=index,
+        )
+        for index, name in enumerate(names)
+    ]
+
+
+async def test_create_schedule_version_numbers_versions(
+    backend: RepositoryBackend,
+) -> None:
+    project_id = await backend.create_project()
+    repository = backend.repository
+
+    first = await repository.create_schedule_version(
+        project_id, _items("基礎工事", "躯体工事")
+    )
+    second = await repository.create_schedule_version(
+        project_id, _items("基礎工事", "躯体工事", "内装工事")
+    )
+
+    assert (first["version"], second["version"]) == (1, 2)
+    items = await repository.get_schedule_items(str(second["id"]))
+    assert [item["process_name"] for item in items] == [
+        "基礎工事",
+        "躯体工事",
+        "内装工事",
+    ]
+    assert [item["order_index"] for item in items] == [0, 1, 2]
+    assert ScheduleRow.from_record(items[0]) == _items("基礎工事")[0]
+
+
+async def test_create_schedule_version_shares_unchanged_rows(
+    backend: RepositoryBackend,
+) -> None:
+    project_id = await backend.create_project()
+    repository = backend.repository
+
+    first = await repository.create_schedule_version(
+        project_id, _items("基礎工事", "躯体工事")
+    )
+    unchanged = await repository.create_schedule_version(
+        project_id, _items("基礎工事", "躯体工事")
+    )
+    changed = await repository.create_schedule_version(
+        project_id, _items("基礎工事", "外構工事")
+    )
+
+    assert first["new_item_count"] == 2
+    assert unchanged["new_item_count"] == 0
+    assert changed["new_item_count"] == 1
+
+
+async def test_create_schedule_version_for_missing_project(
+    backend: RepositoryBackend,
+) -> None:
+    with pytest.raises(ProjectNotFoundError):
+        await backend.repository.create_schedule_version(
+            str(uuid.uuid4()), _items("基礎工事")
+        )
+
+
+async def test_create_schedule_versions_isolates_failures(
+    backend: RepositoryBackend,
+) -> None:
+    project_id = await backend.create_project()
+    missing_project_id = str(uuid.uuid4())
+
+    results = await backend.repository.create_schedule_versions(
+        [
+            (project_id, _items("基礎工事")),
+            (missing_project_id, _items("基礎工事")),
+            (project_id, _items("基礎工事", "躯体工事")),
+        ]
+    )
+
+    assert results[0]["version"] == 1
+    assert results[1]["error_code"] is not None
+    assert results[2]["version"] == 2
+
+
+async def test_get_latest_schedule_with_items(backend: RepositoryBackend) -> None:
+    project_id = await backend.create_project()
+    repository = backend.repository
+
+    empty = await repository.get_latest_schedule_with_items(project_id)
+    assert empty is not None
+    assert empty["schedule"] is None
+
+    await repository.create_schedule_version(project_id, _items("基礎工事"))
+    created = await repository.create_schedule_version(
+        project_id, _items("基礎工事", "躯体工事")
+    )
+    latest = await repository.get_latest_schedule_with_items(project_id)
+
+    assert latest is not None
+    assert str(latest["project"]["id"]) == project_id
+    assert str(latest["schedule"]["id"]) == str(created["id"])
+    assert [item["process_name"] for item in latest["schedule"]["items"]] == [
+        "基礎工事",
+        "躯体工事",
+    ]
+    assert await repository.get_latest_schedule_with_items(str(uuid.uuid4())) is None
+
+
+async def test_get_schedules_by_ids_and_versions(backend: RepositoryBackend) -> None:
+    project_id = await backend.create_project()
+    repository = backend.repository
+    first = await repository.create_schedule_version(project_id, _items("基礎工事"))
+    second = await repository.create_schedule_version(
+        project_id, _items("基礎工事", "躯体工事")
+    )
+
+    by_versions = await repository.get_schedules_by_versions(project_id, [1, 2, 3])
+    assert sorted(schedule["version"] for schedule in by_versions) == [1, 2]
+
+    schedules = await repository.get_schedules_with_items_by_ids(
+        [str(first["id"]), str(second["id"])]
+    )
+    item_counts = {
+        str(schedule["id"]): len(schedule["items"]) for schedule in schedules
+    }
+    assert item_counts == {str(first["id"]): 1, str(second["id"]): 2}
+
+
+async def test_get_schedule_with_details(backend: RepositoryBackend) -> None:
+    project_id = await backend.create_project()
+    created = await backend.repository.create_schedule_version(
+        project_id, _items("基礎工事", "躯体工事")
+    )
+
+    details = await backend.repository.get_schedule_with_details(str(created["id"]))
+
+    assert details is not None
+    assert details["version"] == 1
+    assert details["projects"]["project_name"].startswith("pytest ")
+    assert sorted(item["process_name"] for item in details["schedule_items"]) == [
+        "基礎工事",
+        "躯体工事",
+    ]
+    assert await backend.repository.get_schedule_with_details(str(uuid.uuid4())) is None
+
+
+async def test_list_projects_cursor_continues_offset_order(
+    backend: RepositoryBackend,
+) -> None:
+    for index in range(3):
+        await backend.create_project(f"list {index}")
+    repository = backend.repository
+
+    by_offset = await repository.list_projects(limit=4)
+    first_page = await repository.list_projects(limit=2)
+    last = first_page[-1]
+    created_at = last["created_at"]
+    if isinstance(created_at, str):
+        # PostgRESTはISO形式の文字列で返す
+        created_at = datetime.fromisoformat(created_at)
+    second_page = await repository.list_projects(
+        limit=2, cursor=ProjectCursor(created_at, str(last["id"]))
+    )
+
+    assert [str(row["id"]) for row in first_page + second_page] == [
+        str(row["id"]) for row in by_offset
+    ]
+
+
+async def test_get_projects_by_ids(backend: RepositoryBackend) -> None:
+    project_ids = [await backend.create_project() for _ in range(2)]
+
+    projects = await backend.repository.get_projects_by_ids(
+        project_ids + [str(uuid.uuid4())]
+    )
+
+    assert sorted(str(project["id"]) for project in projects) == sorted(project_ids)
+
+
+async def test_project_status_follows_latest_schedule(
+    backend: RepositoryBackend,
+) -> None:
+    project_id = await backend.create_project()
+    repository = backend.repository
+    await repository.create_schedule_version(project_id, _items("基礎工事", "躯体工事"))
+
+    status = await repository.get_project_status(project_id)
+    summary = await repository.get_dashboard_summary(recent_limit=5)
+
+    assert status is not None
+    assert status["version"] == 1
+    assert status["item_count"] == 2
+    assert status["status"] == "未着手"
+    assert "status_counts" in summary
+    assert "recent_projects" in summary
+
+
+async def test_deleting_schedule_removes_unshared_rows(
+    postgres_repository: RepositoryBackend, postgres_pool: asyncpg.Pool
+) -> None:
+    project_id = await postgres_repository.create_project()
+    repository = postgres_repository.repository
+    first = await repository.create_schedule_version(
+        project_id, _items("基礎工事", "躯体工事")
+    )
+    await repository.create_schedule_version(project_id, _items("基礎工事", "外構工事"))
+
+    async def row_names() -> list[str]:
+        rows = await postgres_pool.fetch(
+            "SELECT process_name FROM schedule_item_rows WHERE project_id = $1",
+            uuid.UUID(project_id),
+        )
+        return sorted(row["process_name"] for row in rows)
+
+    assert await row_names() == ["基礎工事", "外構工事", "躯体工事"]
+
+    # 共有されている行（基礎工事）は残り、削除した工程表だけの行が削除される
+    await postgres_pool.execute(
+        "DELETE FROM project_schedules WHERE id = $1", first["id"]
+    )
+    assert await row_names() == ["基礎工事", "外構工事"]
+
+    await postgres_pool.execute(
+        "DELETE FROM projects WHERE id = $1", uuid.UUID(project_id)
+    )
+    assert await row_names() == []
@@ -0,0 +1,75 @@
+"""
+工程表のバージョン間の差分（diff_schedule_items）のテスト
+"""
+
+from typing import Any
+
+from app.services.schedule_diff import diff_schedule_items
+
+
+def _item(row_id: int, name: str, order_index: int, **fields: Any) -> dict[str, Any]:
+    return {
+        "id": f"row-{row_id}",
+        "process_name": name,
+        "order_index": order_index,
+        "assignee": "山田",
+        "status": "未着手",
+        **fields,
+    }
+
+
+def test_repeated_process_names_match_in_display_order() -> None:
+    from_items = [
+        _item(1, "基礎工事", 0),
+        _item(2, "仕上工事", 1),
+        _item(3, "仕上工事", 2, assignee="佐藤"),
+        _item(4, "外構工事", 3),
+    ]
+    to_items = [
+        _item(1, "基礎工事", 0),
+        # 内容が同じ行は行IDが同じため、位置が変わっても変更なし
+        _item(3, "仕上工事", 1, assignee="佐藤"),
+        _item(5, "仕上工事", 2, assignee="鈴木"),
+        _item(6, "仕上工事", 3),
+        _item(7, "内装工事", 4),
+    ]
+
+    diff = diff_schedule_items(from_items, to_items)
+
+    assert diff["summary"] == {
+        "added": 2,
+        "removed": 1,
+        "modified": 1,
+        "unchanged": 2,
+    }
+    # 変更なしを除いた残りの同名の行（row-2）と対応付けられる
+    (modified,) = diff["modified"]
+    assert (modified["from"]["id"], modified["to"]["id"]) == ("row-2", "row-5")
+    assert modified["changes"] == {"assignee": {"from": "山田", "to": "鈴木"}}
+    assert [item["id"] for item in diff["added"]] == ["row-6", "row-7"]
+    assert [item["id"] for item in diff["removed"]] == ["row-4"]
+
+
+def test_removed_items_are_sorted_by_display_order() -> None:
+    from_items = [
+        _item(1, "解体工事", 0),
+        _item(2, "基礎工事", 1),
+        _item(3, "解体工事", 2),
+    ]
+
+    diff = diff_schedule_items(from_items, [])
+
+    assert diff["summary"] == {
+        "added": 0,
+        "removed": 3,
+        "modified": 0,
+        "unchanged": 0,
+    }
+    assert [item["id"] for item in diff["removed"]] == ["row-1", "row-2", "row-3"]
+
+
+def test_reordered_rows_with_new_ids_have_no_changes() -> None:
+    diff = diff_schedule_items([_item(1, "基礎工事", 0)], [_item(2, "基礎工事", 5)])
+
+    assert diff["summary"]["modified"] == 1
+    assert diff["modified"][0]["changes"] == {}
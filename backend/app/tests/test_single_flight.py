@@ -0,0 +1,57 @@
+"""
+同時実行される同一処理の集約（シングルフライト）のテスト
+"""
+
+import asyncio
+
+from app.services.request_timing import RequestTimings, current_timings, record_timing
+from app.services.single_flight import SingleFlight
+
+
+async def _timed_request(
+    group: SingleFlight, release: asyncio.Event, calls: list[int]
+) -> tuple[str, RequestTimings]:
+    """1リクエスト分の集計を設定して共有される処理を呼び出す"""
+    timings = RequestTimings()
+    current_timings.set(timings)
+
+    async def load() -> str:
+        calls.append(1)
+        await release.wait()
+        record_timing("db.get_project", 0.01)
+        return "project"
+
+    return await group.do("projects", "id", load), timings
+
+
+async def test_coalesced_callers_share_result_and_timings() -> None:
+    group = SingleFlight("test")
+    release = asyncio.Event()
+    calls: list[int] = []
+
+    leader = asyncio.create_task(_timed_request(group, release, calls))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(_timed_request(group, release, calls))
+    await asyncio.sleep(0)
+    release.set()
+    (leader_value, leader_timings), (follower_value, follower_timings) = (
+        await asyncio.gather(leader, follower)
+    )
+
+    assert calls == [1]
+    assert leader_value == follower_value == "project"
+    assert leader_timings.stages == {"db.get_project": 0.01}
+    assert follower_timings.stages["db.get_project"] == 0.01
+    assert follower_timings.stages["coalesced"] >= 0
+    assert group.stats()["projects"]["coalesced"] == 1
+
+
+async def test_shared_timings_are_not_recorded_outside_requests() -> None:
+    group = SingleFlight("test")
+
+    async def load() -> int:
+        record_timing("db.get_project", 0.01)
+        return 1
+
+    assert await group.do("projects", "id", load) == 1
+    assert current_timings.get() is None
@@ -0,0 +1,43 @@
+"""
+罫線ベースの表検出エンジンのテスト
+PDFGenerationService で描画した工程表PDFから表を検出する
+"""
+
+import fitz  # PyMuPDF
+
+from app.services.pdf_service import SCHEDULE_COLUMN_COUNT, PDFGenerationService
+from app.services.table_grid import detect_grid, detect_ruled_table
+from benchmarks.corpus import build_schedule, expected_table
+
+# 状況列（日本語のみ）。日本語フォントがない環境では文字が描画されないため比較しない
+STATUS_COLUMN = 6
+
+
+def _without_status(rows: list[list[str]]) -> list[list[str]]:
+    return [row[:STATUS_COLUMN] + row[STATUS_COLUMN + 1 :] for row in rows]
+
+
+def test_detects_schedule_table_drawn_by_generator() -> None:
+    service = PDFGenerationService()
+    schedule = build_schedule(rows=6, seed=1)
+
+    with fitz.open(stream=service.generate_pdf_bytes(schedule), filetype="pdf") as doc:
+        table = detect_ruled_table(doc[0])
+
+    assert table is not None
+    header, *rows = table.data
+    assert len(header) == SCHEDULE_COLUMN_COUNT
+    assert len(table.column_bounds) == SCHEDULE_COLUMN_COUNT + 1
+    assert _without_status(rows) == _without_status(expected_table(service, schedule))
+    # 罫線で囲まれていないタイトル部は表に含めない
+    assert table.bbox[1] > service.MARGIN_TOP
+
+
+def test_page_without_ruling_lines_has_no_grid() -> None:
+    with fitz.open() as doc:
+        page = doc.new_page()
+        page.insert_text((72, 72), "工程表")
+        page.draw_line((72, 100), (500, 100))
+
+        assert detect_grid(page) is None
+        assert detect_ruled_table(page) is None
@@ -0,0 +1,59 @@
+"""
+管理者トークンによる認証
+メトリクス・プロファイルなど内部の情報を返す機能を、ADMIN_TOKEN を知っている呼び出し元
+（Prometheus・運用者）に限定する
+"""
+
+import hmac
+import logging
+from collections.abc import Mapping
+
+from fastapi import HTTPException, Request
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def admin_token_from(headers: Mapping[str, str]) -> str:
+    """
+    リクエストヘッダーから管理者トークンを取得
+
+    X-Admin-Token、なければ Authorization: Bearer（Prometheusの bearer_token）を使う
+
+    Args:
+        headers: リクエストヘッダー（ヘッダー名は小文字）
+
+    Returns:
+        管理者トークン（指定がない場合は空文字列）
+    """
+    token = headers.get("x-admin-token", "")
+    if token:
+        return token
+    scheme, _, credentials = headers.get("authorization", "").partition(" ")
+    return credentials.strip() if scheme.lower() == "bearer" else ""
+
+
+def is_admin(headers: Mapping[str, str], admin_token: str) -> bool:
+    """
+    管理者トークンが一致するか（設定されていない場合は常にFalse）
+
+    Args:
+        headers: リクエストヘッダー（ヘッダー名は小文字）
+        admin_token: 設定されている管理者トークン
+    """
+    if not admin_token:
+        return False
+    return hmac.compare_digest(admin_token_from(headers).encode(), admin_token.encode())
+
+
+async def require_admin(request: Request) -> None:
+    """
+    管理者トークンを必須にする（依存性注入用）
+
+    Raises:
+        HTTPException: ADMIN_TOKEN が未設定、またはトークンが一致しない場合は403
+    """
+    if not is_admin(request.headers, settings.admin_token):
+        logger.warning(f"Admin token rejected: path={request.url.path}")
+        raise HTTPException(status_code=403, detail="Admin token required")
@@ -0,0 +1,121 @@
+"""
+条件付きリクエスト（ETag / Last-Modified）
+If-None-Match・If-Modified-Since を検証し、変更がなければ本文なしの304を返す
+"""
+
+import hashlib
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any
+
+from fastapi import Request, Response
+
+
+def strong_etag(*parts: Any) -> str:
+    """
+    内容を一意に決める値（行のバージョン・不変なID・描画の入力など）から強いETagを作成
+
+    Args:
+        parts: ETagの元になる値
+
+    Returns:
+        ETag（ダブルクォートで囲んだ文字列）
+    """
+    source = "\x1f".join(str(part) for part in parts).encode()
+    return f'"{hashlib.blake2b(source, digest_size=16).hexdigest()}"'
+
+
+def to_datetime(value: datetime | str | None) -> datetime | None:
+    """
+    データベースの日時（datetime またはISO形式の文字列）をUTCのdatetimeに変換
+
+    Args:
+        value: 日時（タイムゾーンなしの場合はUTCとみなす）
+
+    Returns:
+        UTCのdatetime、変換できない場合はNone
+    """
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return value.astimezone(UTC)
+
+
+def validator_headers(
+    etag: str, last_modified: datetime | None, cache_control: str
+) -> dict[str, str]:
+    """
+    キャッシュ検証用のレスポンスヘッダーを作成
+
+    Args:
+        etag: ETag
+        last_modified: 最終更新日時（UTC）
+        cache_control: Cache-Control（空の場合は付与しない）
+
+    Returns:
+        ETag・Last-Modified・Cache-Control ヘッダー
+    """
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    return headers
+
+
+def is_not_modified(
+    request: Request, etag: str, last_modified: datetime | None
+) -> bool:
+    """
+    クライアントのキャッシュが最新かを判定（GET / HEAD のみ）
+
+    If-None-Match がある場合は If-Modified-Since より優先する（RFC 9110）
+
+    Args:
+        request: リクエスト
+        etag: 現在の内容のETag
+        last_modified: 現在の内容の最終更新日時（UTC）
+
+    Returns:
+        304を返してよい場合はTrue
+    """
+    if request.method not in ("GET", "HEAD"):
+        return False
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if not if_modified_since or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=UTC)
+
+    # HTTPの日時は秒単位のため、秒未満を切り捨てて比較する
+    return last_modified.replace(microsecond=0) <= since
+
+
+def not_modified_response(headers: dict[str, str]) -> Response:
+    """本文なしの304レスポンス（検証用ヘッダーのみ）"""
+    return Response(status_code=304, headers=headers)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match のいずれかのETagと一致するか（弱い比較）"""
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
@@ -0,0 +1,241 @@
+"""
+ASGIミドルウェア
+"""
+
+import logging
+from time import perf_counter
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.services.loop_monitor import REQUEST_LOOP_STALL_SECONDS, LoopMonitor
+from app.services.metrics import (
+    HTTP_REQUEST_SECONDS,
+    HTTP_REQUESTS,
+    HTTP_REQUESTS_IN_PROGRESS,
+)
+from app.services.profiling import RequestProfiler, current_profile, request_id_from
+from app.services.request_timing import RequestTimings, current_timings
+
+logger = logging.getLogger(__name__)
+
+# Server-Timing を付与するパス（PDF処理・プロジェクト）
+SERVER_TIMING_PATH_PREFIXES = ("/api/v1/pdf", "/api/v1/projects")
+# プロファイルの対象とするパス（接続し続けるSSEは対象外）
+PROFILING_PATH_PREFIXES = ("/api/v1/pdf", "/api/v1/projects", "/api/v1/dashboard")
+# 記録しないパス（接続し続けるSSEは処理時間・ループ停止の記録が接続時間になるため）
+STREAMING_PATH_PREFIXES = ("/api/v1/events",)
+
+
+class MetricsMiddleware:
+    """
+    ルートごとのリクエスト数・処理時間を記録するミドルウェア
+
+    ラベルにはURLではなくルートのパステンプレート（/api/v1/projects/{project_id} など）を使い、
+    系列数がIDの数だけ増えないようにする。ストリーミングを妨げないよう純粋なASGIで実装する
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        excluded_prefixes: tuple[str, ...] = STREAMING_PATH_PREFIXES,
+    ):
+        """
+        Args:
+            app: ASGIアプリケーション
+            excluded_prefixes: 記録しないパスのプレフィックス
+        """
+        self.app = app
+        self.excluded_prefixes = excluded_prefixes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self.excluded_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        started = perf_counter()
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_PROGRESS.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_REQUESTS_IN_PROGRESS.dec()
+            # ルーティング後に scope["route"] にマッチしたルートが設定される
+            route = scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            method = scope["method"]
+            HTTP_REQUESTS.inc(method, path, str(status))
+            HTTP_REQUEST_SECONDS.observe(perf_counter() - started, method, path)
+
+
+class ServerTimingMiddleware:
+    """
+    処理段階ごとの所要時間を Server-Timing ヘッダーとログに出力するミドルウェア
+
+    リクエストごとの集計をコンテキスト変数に設定し、StageTimer・データベース呼び出しの
+    所要時間を集める。レスポンス開始時に Server-Timing ヘッダーを付与し、
+    レスポンス終了時に同じ内訳を1行のログに出力する
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        path_prefixes: tuple[str, ...] = SERVER_TIMING_PATH_PREFIXES,
+        timing_allow_origin: str = "",
+        excluded_prefixes: tuple[str, ...] = STREAMING_PATH_PREFIXES,
+    ):
+        """
+        Args:
+            app: ASGIアプリケーション
+            path_prefixes: 対象のパスのプレフィックス
+            timing_allow_origin: 他オリジンのフロントエンドから所要時間を参照できるようにする
+                Timing-Allow-Origin ヘッダーの値（空の場合は付与しない）
+            excluded_prefixes: 対象のパスのうち記録しないパスのプレフィックス
+        """
+        self.app = app
+        self.path_prefixes = path_prefixes
+        self.timing_allow_origin = timing_allow_origin
+        self.excluded_prefixes = excluded_prefixes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        path = scope.get("path", "")
+        if (
+            scope["type"] != "http"
+            or not path.startswith(self.path_prefixes)
+            or path.startswith(self.excluded_prefixes)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        started = perf_counter()
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        status = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing", timings.server_timing(perf_counter() - started)
+                )
+                if self.timing_allow_origin:
+                    headers.append("Timing-Allow-Origin", self.timing_allow_origin)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_timings.reset(token)
+            total_ms = (perf_counter() - started) * 1000
+            logger.info(
+                f"Request completed: method={scope['method']} path={scope['path']} "
+                f"status={status} total_ms={total_ms:.2f} "
+                f"stages={timings.log_fields()}"
+            )
+
+
+class ProfilingMiddleware:
+    """
+    指定されたリクエスト・N件に1件のリクエストの処理全体をプロファイルするミドルウェア
+
+    プロファイルはレスポンスの送信完了まで（PDFの抽出・描画を含む）を対象とし、
+    リクエストID（X-Request-ID、なければ生成）をファイル名にして保存する。
+    レスポンスには X-Profile-Id ヘッダーでリクエストIDを付与する
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        profiler: RequestProfiler,
+        path_prefixes: tuple[str, ...] = PROFILING_PATH_PREFIXES,
+    ):
+        """
+        Args:
+            app: ASGIアプリケーション
+            profiler: プロファイルの判定と保存
+            path_prefixes: 対象のパスのプレフィックス
+        """
+        self.app = app
+        self.profiler = profiler
+        self.path_prefixes = path_prefixes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        headers = {
+            name.decode("latin-1"): value.decode("latin-1")
+            for name, value in scope["headers"]
+        }
+        reason = self.profiler.should_profile(headers, scope["query_string"])
+        if reason is None:
+            await self.app(scope, receive, send)
+            return
+
+        request_id = request_id_from(headers)
+
+        async def send_with_profile_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("X-Profile-Id", request_id)
+            await send(message)
+
+        profile = self.profiler.start()
+        token = current_profile.set(profile)
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            current_profile.reset(token)
+            path = self.profiler.finish(profile, request_id)
+            logger.info(
+                f"Request profiled ({reason}): method={scope['method']} "
+                f"path={scope['path']} profile={path}"
+            )
+
+
+class LoopStallMiddleware:
+    """
+    リクエストの処理中に観測したイベントループの最大停止時間をルートごとに記録するミドルウェア
+
+    同じ時間に処理中だった全リクエストに停止時間が記録されるため、
+    ブロックした処理の特定には停止時に出力されるスタックを使う
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        monitor: LoopMonitor,
+        excluded_prefixes: tuple[str, ...] = STREAMING_PATH_PREFIXES,
+    ):
+        """
+        Args:
+            app: ASGIアプリケーション
+            monitor: イベントループの停止の検出
+            excluded_prefixes: 記録しないパスのプレフィックス
+        """
+        self.app = app
+        self.monitor = monitor
+        self.excluded_prefixes = excluded_prefixes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self.excluded_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        watch = self.monitor.watch_request(f"{method} {scope['path']}")
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            route = getattr(scope.get("route"), "path", "unmatched")
+            stall = self.monitor.finish_request(watch, f"{method} {route}")
+            REQUEST_LOOP_STALL_SECONDS.observe(stall, method, route)
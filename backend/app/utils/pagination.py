@@ -0,0 +1,62 @@
+"""
+カーソル（キーセット）ページネーション
+(created_at, id) の組を不透明なトークンとしてエンコード・デコードする
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any
+
+from app.repositories.base import ProjectCursor
+
+# カーソルの作成に必要な列
+CURSOR_COLUMNS = ("id", "created_at")
+
+
+class InvalidCursorError(ValueError):
+    """カーソルトークンが不正な場合のエラー"""
+
+
+def encode_cursor(row: dict[str, Any]) -> str:
+    """
+    行の (created_at, id) からカーソルトークンを作成
+
+    Args:
+        row: 最後に返した行（created_at, id を含む）
+
+    Returns:
+        URLセーフなカーソルトークン
+    """
+    created_at = row.get("created_at")
+    if isinstance(created_at, datetime):
+        created_at = created_at.isoformat()
+
+    payload = json.dumps([created_at, str(row["id"])], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> ProjectCursor:
+    """
+    カーソルトークンを (created_at, id) に復元
+
+    Args:
+        token: encode_cursor で作成したトークン
+
+    Returns:
+        カーソル位置
+
+    Raises:
+        InvalidCursorError: トークンが不正な場合
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return ProjectCursor(
+            created_at=(
+                datetime.fromisoformat(created_at) if created_at is not None else None
+            ),
+            id=str(row_id),
+        )
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError("不正なカーソルです") from e
@@ -0,0 +1,26 @@
+"""
+JSONレスポンス
+orjsonで直接シリアライズし、FastAPIのレスポンス検証・jsonable_encoderによる値の走査を省略する
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+
+def _default(value: Any) -> Any:
+    """orjsonが直接扱えない値（Decimal・Pydanticモデルなど）はFastAPIの変換に任せる"""
+    return jsonable_encoder(value)
+
+
+class FastJSONResponse(JSONResponse):
+    """orjsonでシリアライズするJSONレスポンス
+
+    データベースの行（dict・UUID・date・datetime）をそのまま変換できるため、
+    エンドポイントからこのレスポンスを返すと、FastAPIによる戻り値の検証・変換を経由しない
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
@@ -0,0 +1,155 @@
+"""
+ダッシュボード集計のレイテンシベンチマーク
+
+ローカルのPostgreSQL（Supabaseの代替）にプロジェクト数を変えて合成データを投入し、
+従来の方法（全プロジェクト・工程表・工程アイテムを取得してアプリ側で集計）と
+集計テーブルを読む get_dashboard_summary の p50 / p99 を比較する
+
+使用方法:
+    psql "$DATABASE_URL" -f sql/schema.sql
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_dashboard \\
+        [--projects 100,1000,10000] [--items 10] [--requests 50]
+"""
+
+import argparse
+import asyncio
+import os
+from collections import Counter
+from typing import Any
+
+from app.repositories.postgres import PostgresRepository, create_pool
+from benchmarks.bench_latest_schedule import measure
+
+PROJECT_NAME = "bench dashboard"
+
+# フロントエンドの getProjectsWithSchedules と同じく、全件を取得する
+LEGACY_QUERIES = (
+    "SELECT * FROM projects ORDER BY created_at DESC",
+    "SELECT * FROM project_schedules ORDER BY version DESC",
+    "SELECT * FROM schedule_items",
+)
+
+ITEM_STATUSES = ("未着手", "進行中", "完了", "遅延")
+
+
+async def seed(repository: PostgresRepository, projects: int, items: int) -> None:
+    """合成プロジェクト（1工程表ずつ）を追加し、合計 projects 件にする"""
+    pool = repository.pool
+    existing = await pool.fetchval(
+        "SELECT count(*) FROM projects WHERE project_name = $1", PROJECT_NAME
+    )
+    if existing >= projects:
+        return
+
+    async with pool.acquire() as connection, connection.transaction():
+        await connection.execute(
+            """
+            WITH new_projects AS (
+                INSERT INTO projects (project_name)
+                SELECT $1 FROM generate_series(1, $2)
+                RETURNING id
+            ), new_schedules AS (
+                INSERT INTO project_schedules (project_id, version)
+                SELECT id, 1 FROM new_projects
+                RETURNING id, project_id
+            ), new_rows AS (
+                -- 合成データは行を共有しないため、ハッシュの代わりに乱数を使う
+                INSERT INTO schedule_item_rows (project_id, row_hash, process_name, status)
+                SELECT
+                    s.project_id,
+                    gen_random_uuid(),
+                    'Process ' || n,
+                    ($3::text[])[1 + (random() * 3)::int]
+                FROM new_schedules s, generate_series(1, $4) n
+                RETURNING id, project_id
+            )
+            INSERT INTO schedule_item_links (schedule_id, row_id, order_index)
+            SELECT s.id, r.id, row_number() OVER (PARTITION BY s.id ORDER BY r.id)
+            FROM new_schedules s
+            JOIN new_rows r ON r.project_id = s.project_id
+            """,
+            PROJECT_NAME,
+            projects - existing,
+            list(ITEM_STATUSES),
+            items,
+        )
+        # 一括投入では create_schedule_version を経由しないため集計を初期化する
+        await connection.execute("""
+            SELECT refresh_project_status(t.project_id)
+            FROM project_status_summary t
+            WHERE t.schedule_id IS NULL
+            """)
+
+    # 一括投入で集計行に残った更新前の行を回収する
+    for table in ("portfolio_status_counts", "project_status_summary", "projects"):
+        await pool.execute(f"VACUUM ANALYZE {table}")
+
+
+def legacy_status(items: list[dict[str, Any]]) -> str:
+    """フロントエンドの determineProjectStatus と同じ判定"""
+    if not items:
+        return "未着手"
+    statuses = [item["status"] for item in items]
+    if all(status == "完了" for status in statuses):
+        return "完了"
+    if "遅延" in statuses:
+        return "遅延"
+    if "進行中" in statuses:
+        return "進行中"
+    return "未着手"
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    pool = await create_pool(
+        args.dsn, min_size=1, max_size=2, statement_cache_size=100, command_timeout=300
+    )
+    repository = PostgresRepository(pool)
+
+    async def legacy() -> None:
+        async with pool.acquire() as connection:
+            projects = await connection.fetch(LEGACY_QUERIES[0])
+            schedules = await connection.fetch(LEGACY_QUERIES[1])
+            items = await connection.fetch(LEGACY_QUERIES[2])
+
+        latest: dict[Any, Any] = {}
+        for schedule in schedules:
+            latest.setdefault(schedule["project_id"], schedule["id"])
+        items_by_schedule: dict[Any, list[dict[str, Any]]] = {}
+        for item in items:
+            items_by_schedule.setdefault(item["schedule_id"], []).append(dict(item))
+        Counter(
+            legacy_status(items_by_schedule.get(latest.get(project["id"]), []))
+            for project in projects
+        )
+
+    async def summary() -> None:
+        await repository.get_dashboard_summary(5)
+
+    try:
+        for projects in sorted(int(value) for value in args.projects.split(",")):
+            await seed(repository, projects, args.items)
+            print(f"projects={projects} items_per_project={args.items}")
+            await measure("before", legacy, args.requests)
+            await measure("after", summary, args.requests)
+
+    finally:
+        await pool.execute("DELETE FROM projects WHERE project_name = $1", PROJECT_NAME)
+        await pool.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dsn", default=os.getenv("DATABASE_URL", ""))
+    parser.add_argument("--projects", default="100,1000,10000")
+    parser.add_argument("--items", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    if not args.dsn:
+        parser.error("DATABASE_URL または --dsn を指定してください")
+
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
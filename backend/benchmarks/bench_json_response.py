@@ -0,0 +1,119 @@
+"""
+JSONレスポンスのシリアライズのベンチマーク
+
+工程アイテム --items 件の工程表（最新工程表の取得と同じ形）を返すエンドポイントで、
+以下の方法の応答時間 p50 と1リクエストあたりのCPU時間を比較する
+    encoder    : 戻り値の型注釈なし（jsonable_encoder で走査して json.dumps）
+    annotated  : 戻り値の型注釈あり（FastAPI が Pydantic で検証・シリアライズ）
+    orjson     : FastJSONResponse を直接返す（検証・変換なしで orjson）
+
+値は Supabase（PostgREST）経由の文字列と、asyncpg の UUID・date・datetime の両方で測定する
+
+使用方法:
+    python -m benchmarks.bench_json_response [--items 5000] [--requests 50]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from datetime import UTC, date, datetime
+from typing import Any
+
+import httpx
+from fastapi import FastAPI
+
+from app.utils.responses import FastJSONResponse
+
+
+def build_schedule(items: int, typed: bool) -> dict[str, Any]:
+    """工程表（items 付き）を作成（typed=False の場合は値を文字列にする）"""
+
+    def value(raw: Any) -> Any:
+        return raw if typed else str(raw)
+
+    schedule_id = uuid.uuid4()
+    return {
+        "id": value(schedule_id),
+        "project_id": value(uuid.uuid4()),
+        "version": 3,
+        "created_at": value(datetime.now(UTC)),
+        "items": [
+            {
+                "id": value(uuid.uuid4()),
+                "schedule_id": value(schedule_id),
+                "process_name": f"工程 {index}",
+                "planned_start_date": value(date(2026, 1 + index % 12, 1)),
+                "planned_end_date": value(date(2026, 1 + index % 12, 28)),
+                "actual_start_date": None,
+                "actual_end_date": None,
+                "assignee": "担当者",
+                "status": "進行中",
+                "remarks": None,
+                "order_index": index,
+            }
+            for index in range(items)
+        ],
+    }
+
+
+def build_app(schedule: dict[str, Any]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/encoder")
+    async def encoder():  # type: ignore[no-untyped-def]
+        return schedule
+
+    @app.get("/annotated")
+    async def annotated() -> dict[str, Any]:
+        return schedule
+
+    @app.get("/orjson", response_model=dict[str, Any])
+    async def fast() -> FastJSONResponse:
+        return FastJSONResponse(schedule)
+
+    return app
+
+
+async def measure(client: httpx.AsyncClient, path: str, requests: int) -> None:
+    """指定回数リクエストして p50 と1リクエストあたりのCPU時間を表示"""
+    response = await client.get(path)  # ウォームアップ
+    response.raise_for_status()
+
+    latencies = []
+    cpu_started = time.process_time()
+    for _ in range(requests):
+        started = time.perf_counter()
+        await client.get(path)
+        latencies.append((time.perf_counter() - started) * 1000)
+    cpu = (time.process_time() - cpu_started) / requests * 1000
+
+    print(
+        f"  {path.lstrip('/'):<10} p50={statistics.median(latencies):.2f}ms "
+        f"cpu={cpu:.2f}ms/request size={len(response.content)}"
+    )
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    for typed in (False, True):
+        app = build_app(build_schedule(args.items, typed))
+        print(f"items={args.items} values={'asyncpg' if typed else 'supabase'}")
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://bench"
+        ) as client:
+            for path in ("/encoder", "/annotated", "/orjson"):
+                await measure(client, path, args.requests)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
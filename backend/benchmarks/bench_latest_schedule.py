@@ -0,0 +1,137 @@
+"""
+最新工程表取得のレイテンシベンチマーク
+
+ローカルのPostgreSQL（Supabaseの代替）に合成データを投入し、
+従来の3回のクエリ（プロジェクト取得 → バージョン降順で最新工程表 → 工程アイテム）と
+最新工程表ポインタを使った1回のクエリの p50 / p99 を比較する
+
+--rtt-ms を指定すると、クエリ1回ごとにネットワーク往復の遅延を加算して
+リモートのデータベースを模擬する
+
+使用方法:
+    psql "$DATABASE_URL" -f sql/schema.sql
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_latest_schedule \\
+        [--versions 50] [--items 80] [--requests 500] [--rtt-ms 0]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from app.repositories.postgres import PostgresRepository, create_pool
+from app.schemas.pdf import ScheduleRow
+
+# 従来の取得方法（get_project → get_latest_schedule → get_schedule_items）
+LEGACY_QUERIES = (
+    "SELECT * FROM projects WHERE id = $1",
+    """
+    SELECT * FROM project_schedules
+    WHERE project_id = $1
+    ORDER BY version DESC
+    LIMIT 1
+    """,
+    """
+    SELECT * FROM schedule_items
+    WHERE schedule_id = $1
+    ORDER BY order_index
+    """,
+)
+
+
+async def seed(repository: PostgresRepository, versions: int, items: int) -> str:
+    """合成プロジェクトと工程表を作成し、プロジェクトIDを返す"""
+    project_id = await repository.pool.fetchval(
+        "INSERT INTO projects (project_name) VALUES ('bench latest schedule') "
+        "RETURNING id"
+    )
+    schedule_items = [
+        ScheduleRow(process_name=f"Process {index}", order_index=index)
+        for index in range(items)
+    ]
+    for _ in range(versions):
+        await repository.create_schedule_version(str(project_id), schedule_items)
+    return str(project_id)
+
+
+async def measure(name: str, call: Callable[[], Awaitable[Any]], requests: int) -> None:
+    """指定回数呼び出して p50 / p99 を表示"""
+    await call()  # ウォームアップ（プリペアドステートメントの作成）
+
+    latencies = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        await call()
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(
+        f"{name:<8} p50={statistics.median(latencies):.2f}ms p99={p99:.2f}ms "
+        f"({requests} requests)"
+    )
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    pool = await create_pool(
+        args.dsn, min_size=1, max_size=2, statement_cache_size=100, command_timeout=30
+    )
+    repository = PostgresRepository(pool)
+    rtt = args.rtt_ms / 1000
+
+    try:
+        project_id = await seed(repository, args.versions, args.items)
+
+        async def round_trip() -> None:
+            if rtt:
+                await asyncio.sleep(rtt)
+
+        async def legacy() -> None:
+            async with pool.acquire() as connection:
+                await round_trip()
+                await connection.fetchrow(LEGACY_QUERIES[0], project_id)
+                await round_trip()
+                schedule = await connection.fetchrow(LEGACY_QUERIES[1], project_id)
+                await round_trip()
+                await connection.fetch(LEGACY_QUERIES[2], schedule["id"])
+
+        async def pointer() -> None:
+            await round_trip()
+            await repository.get_latest_schedule_with_items(project_id)
+
+        print(
+            f"versions={args.versions} items={args.items} "
+            f"simulated_rtt={args.rtt_ms:.1f}ms"
+        )
+        await measure("before", legacy, args.requests)
+        await measure("after", pointer, args.requests)
+
+    finally:
+        await pool.execute(
+            "DELETE FROM projects WHERE project_name = $1", "bench latest schedule"
+        )
+        await pool.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dsn", default=os.getenv("DATABASE_URL", ""))
+    parser.add_argument("--versions", type=int, default=50)
+    parser.add_argument("--items", type=int, default=80)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument(
+        "--rtt-ms", type=float, default=0, help="クエリ1回あたりの模擬往復遅延（ms）"
+    )
+    args = parser.parse_args()
+
+    if not args.dsn:
+        parser.error("DATABASE_URL または --dsn を指定してください")
+
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+エンドポイントごとのイベントループ停止の確認
+
+アプリをプロセス内で起動してイベントループの停止の検出を開始し、
+各エンドポイント（PDFの取り込み・エクスポート、プロジェクト・最新工程表の取得、ダッシュボード）に
+リクエストを送って、処理中に観測した最大停止時間をルートごとに出力する。
+--max-stall-ms を超えたルートがある場合は終了コード1で終了する（CIでの確認用）
+
+使用方法:
+    psql "$DATABASE_URL" -f sql/schema.sql
+    DATABASE_BACKEND=postgres DATABASE_URL=postgresql://... \\
+        python -m benchmarks.bench_loop_stalls [--requests 10] [--max-stall-ms 100]
+"""
+
+import argparse
+import asyncio
+import sys
+
+import httpx
+
+from app import database
+from app.api.v1.pdf import pdf_service
+from app.config import settings
+from app.main import app
+from app.services.loop_monitor import loop_monitor
+from app.utils.middleware import LoopStallMiddleware
+from benchmarks.corpus import build_corpus
+
+PROJECT_NAME = "bench loop stalls"
+
+
+async def main_async(args: argparse.Namespace) -> bool:
+    await database.init_database()
+    if database.postgres_pool is None:
+        raise SystemExit("DATABASE_BACKEND=postgres を指定してください")
+    pool = database.postgres_pool
+    project_id = await pool.fetchval(
+        "INSERT INTO projects (project_name) VALUES ($1) RETURNING id", PROJECT_NAME
+    )
+    corpus = build_corpus(pdf_service, size=args.requests)
+
+    loop_monitor.start()
+    loop_monitor.reset()
+    # LOOP_MONITOR_ENABLED=false（既定）ではアプリにミドルウェアが追加されないため、ここで追加する
+    monitored = (
+        app
+        if settings.loop_monitor_enabled
+        else LoopStallMiddleware(app, monitor=loop_monitor)
+    )
+    transport = httpx.ASGITransport(app=monitored)
+    try:
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+            schedule_id = None
+            for pdf, _ in corpus:
+                response = await client.post(
+                    "/api/v1/pdf/upload-pdf",
+                    files={"pdf": ("schedule.pdf", pdf, "application/pdf")},
+                    data={"project_id": str(project_id)},
+                )
+                response.raise_for_status()
+                schedule_id = response.json()["schedule_id"]
+
+            for _ in range(args.requests):
+                for path in (
+                    f"/api/v1/pdf/export-pdf/{schedule_id}",
+                    f"/api/v1/projects/{project_id}",
+                    f"/api/v1/projects/{project_id}/latest-schedule",
+                    "/api/v1/dashboard/",
+                ):
+                    (await client.get(path)).raise_for_status()
+    finally:
+        await loop_monitor.stop()
+        await pool.execute("DELETE FROM projects WHERE project_name = $1", PROJECT_NAME)
+        await database.close_database()
+
+    passed = True
+    print(f"{'route':<60} {'requests':>8} {'max_stall_ms':>12}")
+    for route, stats in loop_monitor.route_stats().items():
+        exceeded = stats["max_stall_ms"] > args.max_stall_ms
+        passed = passed and not exceeded
+        mark = "  NG" if exceeded else ""
+        print(
+            f"{route:<60} {stats['requests']:>8.0f} {stats['max_stall_ms']:>12.2f}"
+            f"{mark}"
+        )
+    stats = loop_monitor.stats()
+    print(f"stalls over {stats['stall_threshold_ms']:.0f} ms: {stats['stalls']}")
+    return passed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=10)
+    parser.add_argument("--max-stall-ms", type=float, default=100.0)
+    args = parser.parse_args()
+
+    if not asyncio.run(main_async(args)):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
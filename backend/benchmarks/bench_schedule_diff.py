@@ -0,0 +1,91 @@
+"""
+工程表のバージョン間の差分（diff_schedule_items）のベンチマーク
+
+合成した工程表（--rows 行）の一部の行を変更・追加・削除した次のバージョンを作り、
+差分の計算時間の p50 / p99 を表示する（データベースの読み込みは含まない）
+
+使用方法:
+    python -m benchmarks.bench_schedule_diff [--rows 1000] [--changes 20] [--runs 200]
+"""
+
+import argparse
+import random
+import statistics
+import time
+import uuid
+from typing import Any
+
+from app.services.schedule_diff import diff_schedule_items
+
+STATUSES = ("未着手", "進行中", "完了", "遅延")
+
+
+def build_versions(
+    rows: int, changes: int, seed: int = 0
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """比較元と、changes 件ずつ変更・追加・削除した比較先の工程アイテムを作成"""
+    rng = random.Random(seed)
+    source = [
+        {
+            "id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "process_name": f"工程 {index % (rows // 2)}",
+            "planned_start_date": f"2026-{1 + index % 12:02d}-01",
+            "planned_end_date": f"2026-{1 + index % 12:02d}-28",
+            "actual_start_date": None,
+            "actual_end_date": None,
+            "assignee": f"担当 {index % 7}",
+            "status": STATUSES[index % 4],
+            "remarks": None,
+            "order_index": index,
+        }
+        for index in range(rows)
+    ]
+
+    target = list(source)
+    for index in rng.sample(range(rows), changes):
+        # 内容が変わった行は新しい行IDになる
+        target[index] = {
+            **target[index],
+            "id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "status": "完了",
+        }
+    for index in sorted(rng.sample(range(rows), changes), reverse=True):
+        del target[index]
+    for index in range(changes):
+        target.append(
+            {
+                **source[0],
+                "id": str(uuid.UUID(int=rng.getrandbits(128))),
+                "process_name": f"追加工程 {index}",
+            }
+        )
+    return source, target
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--changes", type=int, default=20)
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    source, target = build_versions(args.rows, args.changes)
+    summary = diff_schedule_items(source, target)["summary"]
+
+    latencies = []
+    for _ in range(args.runs):
+        started = time.perf_counter()
+        diff_schedule_items(source, target)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"rows={args.rows} changes={args.changes} summary={summary}")
+    print(
+        f"diff     p50={statistics.median(latencies):.2f}ms p99={p99:.2f}ms "
+        f"({args.runs} runs)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+工程アイテムの内部表現のベンチマーク
+
+データベースから取得した工程アイテム（--items 件）を、行ごとのPydanticモデル
+（ScheduleItemForPDF）と軽量な行型（ScheduleRow）に変換し、
+変換時間と保持に必要なメモリ（10,000件あたり）を比較する
+
+使用方法:
+    python -m benchmarks.bench_schedule_rows [--items 10000] [--repeat 5]
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+import uuid
+from collections.abc import Callable
+from datetime import date, timedelta
+from typing import Any
+
+from app.schemas.pdf import ScheduleItemForPDF, ScheduleRow
+
+STATUSES = ("未着手", "進行中", "完了", "遅延")
+
+
+def build_records(items: int) -> list[dict[str, Any]]:
+    """PostgREST / jsonb と同じ形（日付はISO形式の文字列）の工程アイテムを作成"""
+    start = date(2026, 1, 5)
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "process_name": f"工程 {index}",
+            "planned_start_date": (start + timedelta(days=index % 300)).isoformat(),
+            "planned_end_date": (start + timedelta(days=index % 300 + 7)).isoformat(),
+            "actual_start_date": (
+                (start + timedelta(days=index % 300)).isoformat() if index % 2 else None
+            ),
+            "actual_end_date": None,
+            "assignee": f"担当 {index % 7}",
+            "status": STATUSES[index % 4],
+            "remarks": None,
+            "order_index": index,
+        }
+        for index in range(items)
+    ]
+
+
+def to_models(records: list[dict[str, Any]]) -> list[Any]:
+    """従来の変換（行ごとにPydanticモデルを生成・検証）"""
+    return [
+        ScheduleItemForPDF(
+            process_name=record["process_name"],
+            planned_start_date=record.get("planned_start_date"),
+            planned_end_date=record.get("planned_end_date"),
+            actual_start_date=record.get("actual_start_date"),
+            actual_end_date=record.get("actual_end_date"),
+            assignee=record.get("assignee"),
+            status=record.get("status", "未着手"),
+            remarks=record.get("remarks"),
+            order_index=record.get("order_index", 0),
+        )
+        for record in records
+    ]
+
+
+def to_rows(records: list[dict[str, Any]]) -> list[Any]:
+    """軽量な行型への変換"""
+    return list(map(ScheduleRow.from_record, records))
+
+
+def measure(
+    name: str,
+    convert: Callable[[list[dict[str, Any]]], list[Any]],
+    records: list[dict[str, Any]],
+    repeat: int,
+) -> None:
+    """変換時間（最良値）と変換結果が保持するメモリを表示"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        convert(records)
+        best = min(best, time.perf_counter() - started)
+
+    gc.collect()
+    tracemalloc.start()
+    converted = convert(records)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    per_10k = retained / len(converted) * 10_000 / 1024 / 1024
+    print(
+        f"  {name:<8} best={best * 1000:.1f}ms "
+        f"memory={retained / 1024 / 1024:.2f}MB ({per_10k:.2f}MB per 10,000 items)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    records = build_records(args.items)
+    print(f"items={args.items}")
+    measure("pydantic", to_models, records, args.repeat)
+    measure("rows", to_rows, records, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
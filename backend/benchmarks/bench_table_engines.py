@@ -0,0 +1,70 @@
+"""
+表検出エンジンの比較ベンチマーク
+
+共通コーパスに対して `find_tables` と罫線グリッド検出の
+処理時間とセル単位の正解率を比較する
+
+使用方法:
+    python -m benchmarks.bench_table_engines [--size 30]
+"""
+
+import argparse
+import logging
+import statistics
+import time
+
+import fitz  # PyMuPDF
+
+from app.schemas.pdf import TableEngine
+from app.services.pdf_service import PDFGenerationService
+from benchmarks.corpus import build_corpus
+
+
+def cell_accuracy(actual: list[list[str]] | None, expected: list[list[str]]) -> float:
+    """データ行のセル一致率"""
+    total = sum(len(row) for row in expected)
+    if not actual:
+        return 0.0
+
+    data_rows = actual[1:]  # ヘッダー行を除外
+    matched = 0
+    for expected_row, actual_row in zip(expected, data_rows, strict=False):
+        for expected_cell, actual_cell in zip(expected_row, actual_row, strict=False):
+            if (actual_cell or "").strip() == expected_cell:
+                matched += 1
+    return matched / total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=30)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    service = PDFGenerationService()
+    corpus = build_corpus(service, args.size)
+
+    print(f"corpus: {len(corpus)} PDFs")
+    for engine in (TableEngine.FIND_TABLES, TableEngine.GRID):
+        timings = []
+        accuracies = []
+        for pdf_bytes, expected in corpus:
+            doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+            page = doc[0]
+            started = time.perf_counter()
+            detected = service._detect_table(page, engine)
+            timings.append((time.perf_counter() - started) * 1000)
+            actual = detected.data if detected is not None else None
+            accuracies.append(cell_accuracy(actual, expected))
+            doc.close()
+
+        print(
+            f"{engine.value:>12}: "
+            f"median={statistics.median(timings):.2f}ms "
+            f"max={max(timings):.2f}ms "
+            f"accuracy={statistics.mean(accuracies) * 100:.1f}%"
+        )
+
+
+if __name__ == "__main__":
+    main()
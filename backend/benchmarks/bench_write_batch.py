@@ -0,0 +1,146 @@
+"""
+工程表書き込みのまとめ（ScheduleWriteBatcher）のベンチマーク
+
+ローカルのPostgreSQL（Supabaseの代替）で、同時に届いた取り込みの工程表作成を
+要求ごとに書き込む場合と、ScheduleWriteBatcher でまとめて書き込む場合の
+所要時間・データベース呼び出し回数を比較する
+
+--rtt-ms を指定すると、呼び出し1回ごとにネットワーク往復の遅延を加算して
+リモートのデータベースを模擬する
+
+使用方法:
+    psql "$DATABASE_URL" -f sql/schema.sql
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_write_batch \\
+        [--imports 200] [--projects 20] [--items 40] [--rtt-ms 0]
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from app.repositories.postgres import PostgresRepository, create_pool
+from app.schemas.pdf import ScheduleRow
+from app.services.write_batcher import ScheduleWriteBatcher
+
+PROJECT_NAME = "bench write batch"
+
+
+async def run(
+    name: str,
+    write: Callable[[str], Awaitable[Any]],
+    project_ids: list[str],
+    imports: int,
+    calls: Callable[[], int],
+) -> None:
+    """imports 件の取り込みを同時に書き込み、所要時間と呼び出し回数を表示"""
+    before = calls()
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(write(project_ids[index % len(project_ids)]) for index in range(imports))
+    )
+    elapsed = (time.perf_counter() - started) * 1000
+    print(
+        f"{name:<8} total={elapsed:.1f}ms "
+        f"throughput={imports / elapsed * 1000:.0f} imports/s "
+        f"db_calls={calls() - before}"
+    )
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    pool = await create_pool(
+        args.dsn,
+        min_size=1,
+        max_size=args.pool_size,
+        statement_cache_size=100,
+        command_timeout=300,
+    )
+    repository = PostgresRepository(pool)
+    rtt = args.rtt_ms / 1000
+    db_calls = 0
+
+    async def round_trip() -> None:
+        nonlocal db_calls
+        db_calls += 1
+        if rtt:
+            await asyncio.sleep(rtt)
+
+    # 呼び出し1回ごとに往復遅延を加算するリポジトリ
+    class RemoteRepository(PostgresRepository):
+        async def create_schedule_version(
+            self, project_id: str, items: list[ScheduleRow]
+        ) -> dict[str, Any]:
+            await round_trip()
+            return await super().create_schedule_version(project_id, items)
+
+        async def create_schedule_versions(
+            self, writes: list[tuple[str, list[ScheduleRow]]]
+        ) -> list[dict[str, Any]]:
+            await round_trip()
+            return await super().create_schedule_versions(writes)
+
+    remote = RemoteRepository(pool)
+    batcher = ScheduleWriteBatcher(
+        remote, window=args.window_ms / 1000, max_rows=args.max_rows
+    )
+    items = [
+        ScheduleRow(process_name=f"Process {index}", order_index=index)
+        for index in range(args.items)
+    ]
+
+    try:
+        project_ids = [
+            str(record["id"])
+            for record in await repository.pool.fetch(
+                "INSERT INTO projects (project_name) "
+                "SELECT $1 FROM generate_series(1, $2) RETURNING id",
+                PROJECT_NAME,
+                args.projects,
+            )
+        ]
+
+        async def single(project_id: str) -> None:
+            await remote.create_schedule_version(project_id, items)
+
+        async def batched(project_id: str) -> None:
+            await batcher.submit(project_id, items)
+
+        print(
+            f"imports={args.imports} projects={args.projects} items={args.items} "
+            f"pool={args.pool_size} window={args.window_ms}ms "
+            f"max_rows={args.max_rows} simulated_rtt={args.rtt_ms:.1f}ms"
+        )
+        for name, write in (("before", single), ("after", batched)):
+            await write(project_ids[0])  # ウォームアップ
+            await run(name, write, project_ids, args.imports, lambda: db_calls)
+
+    finally:
+        await batcher.drain()
+        await pool.execute("DELETE FROM projects WHERE project_name = $1", PROJECT_NAME)
+        await pool.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dsn", default=os.getenv("DATABASE_URL", ""))
+    parser.add_argument("--imports", type=int, default=200)
+    parser.add_argument("--projects", type=int, default=20)
+    parser.add_argument("--items", type=int, default=40)
+    parser.add_argument("--pool-size", type=int, default=10)
+    parser.add_argument("--window-ms", type=float, default=5)
+    parser.add_argument("--max-rows", type=int, default=2000)
+    parser.add_argument(
+        "--rtt-ms", type=float, default=0, help="呼び出し1回あたりの模擬往復遅延（ms）"
+    )
+    args = parser.parse_args()
+
+    if not args.dsn:
+        parser.error("DATABASE_URL または --dsn を指定してください")
+
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+ベンチマーク用の工程表PDFコーパス
+
+`PDFGenerationService` で描画した工程表PDFと、その表の正解データを生成する
+"""
+
+import random
+import uuid
+from datetime import date, timedelta
+
+from app.schemas.pdf import PDFScheduleData, ProjectInfoForPDF, ScheduleRow
+from app.services.pdf_service import PDFGenerationService
+
+PROCESS_NAMES = [
+    "Survey",
+    "Foundation",
+    "Framing",
+    "Roofing",
+    "Exterior wall",
+    "Interior",
+    "Plumbing",
+    "Electrical",
+    "Inspection",
+]
+ASSIGNEES = ["Tanaka", "Sato", "Suzuki", None]
+STATUSES = ["未着手", "進行中", "完了", "遅延"]
+REMARKS = ["", "rain delay", "material check", None]
+
+
+def build_schedule(rows: int, seed: int) -> PDFScheduleData:
+    """合成スケジュールデータを作成"""
+    rng = random.Random(seed)
+    start = date(2025, 1, 6)
+    items = []
+    for index in range(rows):
+        planned_start = start + timedelta(days=7 * index)
+        items.append(
+            ScheduleRow(
+                process_name=f"{rng.choice(PROCESS_NAMES)} {index + 1}",
+                planned_start_date=planned_start,
+                planned_end_date=planned_start + timedelta(days=rng.randint(3, 20)),
+                actual_start_date=planned_start if rng.random() < 0.5 else None,
+                assignee=rng.choice(ASSIGNEES),
+                status=rng.choice(STATUSES),
+                remarks=rng.choice(REMARKS),
+                order_index=index,
+            )
+        )
+
+    return PDFScheduleData(
+        schedule_id=uuid.UUID(int=seed),
+        version=1,
+        project_info=ProjectInfoForPDF(
+            project_number=seed,
+            project_name=f"Sample Residence {seed}",
+            construction_location=None,
+            construction_company=None,
+        ),
+        schedule_items=items,
+    )
+
+
+def expected_table(
+    service: PDFGenerationService, schedule: PDFScheduleData
+) -> list[list[str]]:
+    """描画された表の正解データ（データ行のみ）"""
+    return [
+        [
+            item.process_name,
+            service._format_date_short(item.planned_start_date),
+            service._format_date_short(item.planned_end_date),
+            service._format_date_short(item.actual_start_date),
+            service._format_date_short(item.actual_end_date),
+            item.assignee or "",
+            item.status,
+            item.remarks or "",
+        ]
+        for item in schedule.schedule_items
+    ]
+
+
+def build_corpus(
+    service: PDFGenerationService, size: int = 30
+) -> list[tuple[bytes, list[list[str]]]]:
+    """(PDFバイト, 正解データ) のリストを作成"""
+    corpus = []
+    for seed in range(size):
+        schedule = build_schedule(rows=4 + seed % 12, seed=seed)
+        corpus.append(
+            (service.generate_pdf_bytes(schedule), expected_table(service, schedule))
+        )
+    return corpus
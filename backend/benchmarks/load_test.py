@@ -0,0 +1,163 @@
+"""
+API同時実行ロードテスト
+
+同時接続数を変えながら同じエンドポイントにリクエストを送り、
+スループットとレイテンシを計測する
+
+--url を指定した場合は起動中のサーバーに対して計測する。
+未指定の場合はアプリをプロセス内で起動し、Supabaseへの通信を
+固定レイテンシの模擬応答に差し替えて、DB待ちの間にイベントループが
+他のリクエストを処理できているか（同時接続数に応じてスループットが伸びるか）を確認する
+
+使用方法:
+    python -m benchmarks.load_test [--requests 200] [--concurrency 1,10,50]
+    python -m benchmarks.load_test --url http://localhost:8000/api/v1/projects/
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import time
+
+import httpx
+
+from app import database
+from app.config import settings
+from app.repositories.supabase import SupabaseRepository
+from app.services.supabase_service import SupabaseService
+
+DEFAULT_PATH = "/api/v1/projects/"
+
+
+async def run_level(
+    client: httpx.AsyncClient, url: str, total: int, concurrency: int
+) -> tuple[float, list[float], int]:
+    """
+    指定の同時接続数でリクエストを送信
+
+    Returns:
+        (経過秒数, レイテンシ一覧（ms）, エラー件数)
+    """
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for index in range(total):
+        queue.put_nowait(index)
+
+    latencies: list[float] = []
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal errors
+        while not queue.empty():
+            queue.get_nowait()
+            started = time.perf_counter()
+            try:
+                response = await client.get(url)
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - started, latencies, errors
+
+
+def report(
+    concurrency: int, elapsed: float, latencies: list[float], errors: int
+) -> None:
+    """計測結果を1行で表示"""
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(
+        f"concurrency={concurrency:>4} requests={len(latencies)} errors={errors} "
+        f"throughput={len(latencies) / elapsed:,.1f} req/s "
+        f"p50={statistics.median(ordered):.1f}ms p99={p99:.1f}ms"
+    )
+
+
+async def install_simulated_backend(
+    latency_ms: float, rows: int, use_cache: bool
+) -> None:
+    """Supabaseへの通信を固定レイテンシの模擬応答に差し替えて接続を初期化"""
+    body = json.dumps(
+        [
+            {"id": f"00000000-0000-0000-0000-{index:012d}", "project_number": index}
+            for index in range(rows)
+        ]
+    ).encode()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latency_ms / 1000)
+        return httpx.Response(
+            200, content=body, headers={"content-type": "application/json"}
+        )
+
+    settings.supabase_url = settings.supabase_url or "https://simulated.supabase.co"
+    settings.supabase_service_role_key = (
+        settings.supabase_service_role_key or "simulated-service-role-key"
+    )
+    database.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    database.supabase_client = await database.get_supabase_client(database.http_client)
+    database.repository = SupabaseRepository(database.supabase_client)
+
+    if not use_cache:
+        # DBアクセスの同時実行性を計測するため読み取りキャッシュを無効化
+        settings.cache_project_list_ttl = 0
+    database.supabase_service = SupabaseService(database.repository)
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    levels = [int(value) for value in args.concurrency.split(",")]
+
+    if args.url:
+        async with httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max(levels)), timeout=60
+        ) as client:
+            for concurrency in levels:
+                report(
+                    concurrency,
+                    *await run_level(client, args.url, args.requests, concurrency),
+                )
+        return
+
+    # プロセス内でアプリを起動（lifespanは使わず模擬バックエンドで接続を初期化）
+    from app.main import app
+
+    await install_simulated_backend(args.latency, args.rows, args.cache)
+    print(f"simulated database latency={args.latency:.0f}ms rows={args.rows}")
+    try:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://loadtest"
+        ) as client:
+            for concurrency in levels:
+                report(
+                    concurrency,
+                    *await run_level(client, DEFAULT_PATH, args.requests, concurrency),
+                )
+    finally:
+        await database.close_database()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", help="計測対象のURL（未指定時はプロセス内で計測）")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", default="1,10,50")
+    parser.add_argument(
+        "--latency", type=float, default=20, help="模擬DBレイテンシ（ms）"
+    )
+    parser.add_argument("--rows", type=int, default=20, help="模擬応答の行数")
+    parser.add_argument(
+        "--cache", action="store_true", help="読み取りキャッシュを有効にする"
+    )
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,778 @@
+-- HomeSync データベーススキーマ
+-- Supabase上のテーブル定義と同じ構成。ローカルのPostgreSQLで
+-- DATABASE_BACKEND=postgres を検証する場合に使用する
+-- （Supabaseでも工程表の作成に create_schedule_version 関数を使うため、
+--   SQL Editorで実行して関数・制約を追加しておく）
+--
+--   psql "$DATABASE_URL" -f sql/schema.sql
+
+CREATE TABLE IF NOT EXISTS projects (
+    id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    project_number integer GENERATED BY DEFAULT AS IDENTITY UNIQUE,
+    project_name text NOT NULL,
+    construction_location text,
+    construction_company text,
+    created_at timestamptz DEFAULT now(),
+    updated_at timestamptz DEFAULT now()
+);
+
+-- プロジェクト一覧のキーセットページネーション用
+CREATE INDEX IF NOT EXISTS projects_created_at_id_idx
+    ON projects (created_at DESC NULLS LAST, id DESC);
+
+-- 更新時に updated_at を更新する（APIの ETag・Last-Modified は updated_at を行のバージョンとして使う）
+CREATE OR REPLACE FUNCTION touch_project_updated_at()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF NEW IS DISTINCT FROM OLD THEN
+        NEW.updated_at := now();
+    END IF;
+    RETURN NEW;
+END;
+$$;
+
+CREATE OR REPLACE TRIGGER projects_touch_updated_at
+    BEFORE UPDATE ON projects
+    FOR EACH ROW EXECUTE FUNCTION touch_project_updated_at();
+
+CREATE TABLE IF NOT EXISTS project_schedules (
+    id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    project_id uuid REFERENCES projects (id) ON DELETE CASCADE,
+    version integer NOT NULL,
+    created_at timestamptz DEFAULT now()
+);
+
+-- 同一プロジェクト内のバージョン重複を禁止（既存テーブルにも追加できるよう個別に定義）
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint
+        WHERE conname = 'project_schedules_project_id_version_key'
+    ) THEN
+        ALTER TABLE project_schedules
+            ADD CONSTRAINT project_schedules_project_id_version_key
+            UNIQUE (project_id, version);
+    END IF;
+END $$;
+
+-- 工程アイテム
+-- 再取り込みで内容が変わらない行はバージョン間で共有する
+--   schedule_item_rows : 行の内容（プロジェクト内で内容のハッシュが同じ行は1行のみ）
+--   schedule_item_links: 工程表に含まれる行と表示順
+--   schedule_items     : 工程表ごとの工程アイテム（従来のテーブルと同じ列のビュー）
+CREATE TABLE IF NOT EXISTS schedule_item_rows (
+    id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    project_id uuid NOT NULL REFERENCES projects (id) ON DELETE CASCADE,
+    row_hash uuid NOT NULL,
+    process_name text NOT NULL,
+    planned_start_date date,
+    planned_end_date date,
+    actual_start_date date,
+    actual_end_date date,
+    assignee text,
+    status text,
+    remarks text,
+    UNIQUE (project_id, row_hash)
+);
+
+CREATE TABLE IF NOT EXISTS schedule_item_links (
+    schedule_id uuid NOT NULL REFERENCES project_schedules (id) ON DELETE CASCADE,
+    row_id uuid NOT NULL REFERENCES schedule_item_rows (id) ON DELETE CASCADE,
+    order_index integer,
+    PRIMARY KEY (schedule_id, row_id)
+);
+
+CREATE INDEX IF NOT EXISTS schedule_item_links_schedule_id_order_idx
+    ON schedule_item_links (schedule_id, order_index);
+
+CREATE INDEX IF NOT EXISTS schedule_item_links_row_id_idx
+    ON schedule_item_links (row_id);
+
+-- 工程アイテムの内容のハッシュ（表示順は含めない）
+-- p_occurrence は同じ工程表内で内容が同じ行の何番目か（同じ内容の行も別の行として扱う）
+-- （日付はJSONに変換するとDateStyleに関わらずISO形式になる）
+CREATE OR REPLACE FUNCTION schedule_item_row_hash(
+    p_process_name text,
+    p_planned_start_date date,
+    p_planned_end_date date,
+    p_actual_start_date date,
+    p_actual_end_date date,
+    p_assignee text,
+    p_status text,
+    p_remarks text,
+    p_occurrence bigint
+)
+RETURNS uuid
+LANGUAGE sql
+IMMUTABLE
+AS $$
+    SELECT md5(
+        jsonb_build_array(
+            p_process_name,
+            p_planned_start_date,
+            p_planned_end_date,
+            p_actual_start_date,
+            p_actual_end_date,
+            p_assignee,
+            p_status,
+            p_remarks,
+            p_occurrence
+        )::text
+    )::uuid;
+$$;
+
+-- 従来の schedule_items テーブルの行を共有する形式に移行する
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_class
+        WHERE oid = to_regclass('schedule_items') AND relkind = 'r'
+    ) THEN
+        WITH items AS (
+            SELECT
+                i.id,
+                i.schedule_id,
+                s.project_id,
+                i.order_index,
+                i.process_name,
+                i.planned_start_date,
+                i.planned_end_date,
+                i.actual_start_date,
+                i.actual_end_date,
+                i.assignee,
+                i.status,
+                i.remarks,
+                schedule_item_row_hash(
+                    i.process_name,
+                    i.planned_start_date,
+                    i.planned_end_date,
+                    i.actual_start_date,
+                    i.actual_end_date,
+                    i.assignee,
+                    i.status,
+                    i.remarks,
+                    row_number() OVER (
+                        PARTITION BY
+                            i.schedule_id,
+                            i.process_name,
+                            i.planned_start_date,
+                            i.planned_end_date,
+                            i.actual_start_date,
+                            i.actual_end_date,
+                            i.assignee,
+                            i.status,
+                            i.remarks
+                        ORDER BY i.order_index, i.id
+                    )
+                ) AS row_hash
+            FROM schedule_items i
+            JOIN project_schedules s ON s.id = i.schedule_id
+        ), shared AS (
+            -- 内容が同じ行は最も古いバージョンの行を残す
+            SELECT DISTINCT ON (i.project_id, i.row_hash) i.*
+            FROM items i
+            JOIN project_schedules s ON s.id = i.schedule_id
+            ORDER BY i.project_id, i.row_hash, s.version
+        ), moved AS (
+            INSERT INTO schedule_item_rows (
+                id,
+                project_id,
+                row_hash,
+                process_name,
+                planned_start_date,
+                planned_end_date,
+                actual_start_date,
+                actual_end_date,
+                assignee,
+                status,
+                remarks
+            )
+            SELECT
+                id,
+                project_id,
+                row_hash,
+                process_name,
+                planned_start_date,
+                planned_end_date,
+                actual_start_date,
+                actual_end_date,
+                assignee,
+                status,
+                remarks
+            FROM shared
+        )
+        INSERT INTO schedule_item_links (schedule_id, row_id, order_index)
+        SELECT i.schedule_id, r.id, i.order_index
+        FROM items i
+        JOIN shared r ON r.project_id = i.project_id AND r.row_hash = i.row_hash;
+
+        DROP TABLE schedule_items;
+    END IF;
+END $$;
+
+-- 工程表ごとの工程アイテム（参照側は従来どおり schedule_id で取得する）
+-- id は共有される行のIDのため、内容が変わらない行はバージョン間で同じIDになる
+CREATE OR REPLACE VIEW schedule_items AS
+    SELECT
+        r.id,
+        l.schedule_id,
+        r.process_name,
+        r.planned_start_date,
+        r.planned_end_date,
+        r.actual_start_date,
+        r.actual_end_date,
+        r.assignee,
+        r.status,
+        r.remarks,
+        l.order_index
+    FROM schedule_item_links l
+    JOIN schedule_item_rows r ON r.id = l.row_id;
+
+-- 工程表の工程アイテム（PostgRESTの計算リレーション）
+-- フロントエンドの project_schedules(*, schedule_items(*)) の埋め込みを
+-- schedule_items がビューになった後も同じ名前・同じ列で使えるようにする
+CREATE OR REPLACE FUNCTION schedule_items(project_schedules)
+RETURNS SETOF schedule_items
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT * FROM schedule_items WHERE schedule_id = $1.id ORDER BY order_index;
+$$;
+
+-- 工程表の削除で参照されなくなった工程アイテムの行を削除する
+-- （行は工程表間で共有されるため、工程表の削除では連鎖削除されない）
+-- 取り込み（create_schedule_version）と同じプロジェクト行のロックを取得してから判定し、
+-- 同時に取り込まれる工程表が共有しようとしている行は削除しない
+CREATE OR REPLACE FUNCTION delete_unreferenced_schedule_item_rows()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    PERFORM 1
+    FROM projects p
+    WHERE p.id IN (
+        SELECT r.project_id
+        FROM schedule_item_rows r
+        WHERE r.id IN (SELECT row_id FROM removed_links)
+    )
+    ORDER BY p.id
+    FOR UPDATE;
+
+    DELETE FROM schedule_item_rows r
+    WHERE r.id IN (SELECT row_id FROM removed_links)
+      AND NOT EXISTS (
+          SELECT 1 FROM schedule_item_links l WHERE l.row_id = r.id
+      );
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE TRIGGER schedule_item_links_delete_unreferenced_rows
+    AFTER DELETE ON schedule_item_links
+    REFERENCING OLD TABLE AS removed_links
+    FOR EACH STATEMENT EXECUTE FUNCTION delete_unreferenced_schedule_item_rows();
+
+-- トリガーの追加前に工程表の削除で残った行を削除する
+DELETE FROM schedule_item_rows r
+WHERE NOT EXISTS (SELECT 1 FROM schedule_item_links l WHERE l.row_id = r.id);
+
+-- 戻り値に new_item_count を追加する前の関数を置き換える
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_proc
+        WHERE proname = 'create_schedule_version'
+          AND NOT 'new_item_count' = ANY (proargnames)
+    ) THEN
+        DROP FUNCTION create_schedule_version(uuid, jsonb);
+    END IF;
+    IF EXISTS (
+        SELECT 1 FROM pg_proc
+        WHERE proname = 'create_schedule_versions'
+          AND NOT 'new_item_count' = ANY (proargnames)
+    ) THEN
+        DROP FUNCTION create_schedule_versions(jsonb);
+    END IF;
+END $$;
+
+-- 工程表の新バージョンを1回の呼び出しで作成する
+-- プロジェクト行をロックして同一プロジェクトの取り込みを直列化し、
+-- 次のバージョン番号の採番・工程表・工程アイテムの登録を1トランザクションで行う
+-- 工程アイテムは内容のハッシュがプロジェクト内にない行のみ追加し、
+-- それ以外は既存の行を共有する（new_item_count は追加した行数）
+CREATE OR REPLACE FUNCTION create_schedule_version(
+    p_project_id uuid,
+    p_items jsonb
+)
+RETURNS TABLE (schedule_id uuid, version integer, new_item_count integer)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+DECLARE
+    v_schedule_id uuid;
+    v_version integer;
+    v_new_item_count integer;
+BEGIN
+    PERFORM 1 FROM projects WHERE id = p_project_id FOR UPDATE;
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'project % not found', p_project_id
+            USING ERRCODE = 'no_data_found';
+    END IF;
+
+    -- ロック取得後の文で最新バージョンを読むため、並行した取り込みの結果も反映される
+    SELECT COALESCE(max(s.version), 0) + 1 INTO v_version
+    FROM project_schedules s
+    WHERE s.project_id = p_project_id;
+
+    INSERT INTO project_schedules (project_id, version)
+    VALUES (p_project_id, v_version)
+    RETURNING id INTO v_schedule_id;
+
+    WITH items AS (
+        SELECT
+            i.*,
+            schedule_item_row_hash(
+                i.process_name,
+                i.planned_start_date,
+                i.planned_end_date,
+                i.actual_start_date,
+                i.actual_end_date,
+                i.assignee,
+                i.status,
+                i.remarks,
+                row_number() OVER (
+                    PARTITION BY
+                        i.process_name,
+                        i.planned_start_date,
+                        i.planned_end_date,
+                        i.actual_start_date,
+                        i.actual_end_date,
+                        i.assignee,
+                        i.status,
+                        i.remarks
+                    ORDER BY e.position
+                )
+            ) AS row_hash
+        FROM jsonb_array_elements(p_items) WITH ORDINALITY AS e (value, position)
+        CROSS JOIN LATERAL jsonb_to_record(e.value) AS i (
+            process_name text,
+            planned_start_date date,
+            planned_end_date date,
+            actual_start_date date,
+            actual_end_date date,
+            assignee text,
+            status text,
+            remarks text,
+            order_index integer
+        )
+    ), new_rows AS (
+        INSERT INTO schedule_item_rows (
+            project_id,
+            row_hash,
+            process_name,
+            planned_start_date,
+            planned_end_date,
+            actual_start_date,
+            actual_end_date,
+            assignee,
+            status,
+            remarks
+        )
+        SELECT
+            p_project_id,
+            i.row_hash,
+            i.process_name,
+            i.planned_start_date,
+            i.planned_end_date,
+            i.actual_start_date,
+            i.actual_end_date,
+            i.assignee,
+            i.status,
+            i.remarks
+        FROM items i
+        ON CONFLICT (project_id, row_hash) DO NOTHING
+        RETURNING id, row_hash
+    ), links AS (
+        -- 同じ文で追加した行は既存の行として読めないため、追加結果と合わせて参照する
+        INSERT INTO schedule_item_links (schedule_id, row_id, order_index)
+        SELECT v_schedule_id, COALESCE(n.id, r.id), i.order_index
+        FROM items i
+        LEFT JOIN new_rows n ON n.row_hash = i.row_hash
+        LEFT JOIN schedule_item_rows r
+            ON r.project_id = p_project_id AND r.row_hash = i.row_hash
+    )
+    SELECT count(*) INTO v_new_item_count FROM new_rows;
+
+    -- ダッシュボードの集計を新しい最新工程表で更新
+    PERFORM refresh_project_status(p_project_id);
+
+    RETURN QUERY SELECT v_schedule_id, v_version, v_new_item_count;
+END;
+$$;
+
+-- 複数の工程表の新バージョンを1回の呼び出しで作成する（同時に届いた取り込みの一括書き込み用）
+-- p_batch: [{"project_id": uuid, "items": [...]}, ...]
+-- 要素ごとにサブトランザクションで create_schedule_version を実行し、
+-- 失敗した要素はエラーコード・メッセージを返す（他の要素の書き込みには影響しない）
+-- 戻り値の idx は p_batch 内の位置（0始まり）
+CREATE OR REPLACE FUNCTION create_schedule_versions(p_batch jsonb)
+RETURNS TABLE (
+    idx integer,
+    schedule_id uuid,
+    version integer,
+    new_item_count integer,
+    error_code text,
+    error_message text
+)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    r record;
+BEGIN
+    -- プロジェクトIDの順に処理し、並行したバッチ間で行ロックの取得順序を揃える
+    FOR r IN
+        SELECT
+            (e.ordinality - 1)::integer AS position,
+            (e.value ->> 'project_id')::uuid AS project_id,
+            e.value -> 'items' AS items
+        FROM jsonb_array_elements(p_batch) WITH ORDINALITY AS e
+        ORDER BY 2, 1
+    LOOP
+        BEGIN
+            RETURN QUERY
+                SELECT
+                    r.position,
+                    c.schedule_id,
+                    c.version,
+                    c.new_item_count,
+                    NULL::text,
+                    NULL::text
+                FROM create_schedule_version(r.project_id, r.items) c;
+        EXCEPTION WHEN OTHERS THEN
+            RETURN QUERY
+                SELECT
+                    r.position,
+                    NULL::uuid,
+                    NULL::integer,
+                    NULL::integer,
+                    SQLSTATE,
+                    SQLERRM;
+        END;
+    END LOOP;
+END;
+$$;
+
+-- プロジェクトの最新工程表へのポインタ
+-- （project_schedules への外部キーにすると既存の埋め込み取得が曖昧になるため制約は付けない）
+ALTER TABLE projects ADD COLUMN IF NOT EXISTS latest_schedule_id uuid;
+
+-- 工程表の追加・削除時に最新工程表ポインタを更新する
+CREATE OR REPLACE FUNCTION maintain_latest_schedule()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE projects p
+        SET latest_schedule_id = NEW.id
+        WHERE p.id = NEW.project_id
+          AND NOT EXISTS (
+              SELECT 1 FROM project_schedules s
+              WHERE s.id = p.latest_schedule_id AND s.version >= NEW.version
+          );
+        RETURN NEW;
+    END IF;
+
+    -- 最新の工程表が削除された場合のみ、残りの最新バージョンを指し直す
+    UPDATE projects p
+    SET latest_schedule_id = (
+        SELECT s.id FROM project_schedules s
+        WHERE s.project_id = OLD.project_id
+        ORDER BY s.version DESC
+        LIMIT 1
+    )
+    WHERE p.id = OLD.project_id AND p.latest_schedule_id = OLD.id;
+
+    IF FOUND THEN
+        PERFORM refresh_project_status(OLD.project_id);
+    END IF;
+    RETURN OLD;
+END;
+$$;
+
+CREATE OR REPLACE TRIGGER project_schedules_latest_pointer
+    AFTER INSERT OR DELETE ON project_schedules
+    FOR EACH ROW EXECUTE FUNCTION maintain_latest_schedule();
+
+-- 既存データのポインタを初期化
+UPDATE projects p
+SET latest_schedule_id = (
+    SELECT s.id FROM project_schedules s
+    WHERE s.project_id = p.id
+    ORDER BY s.version DESC
+    LIMIT 1
+)
+WHERE p.latest_schedule_id IS NULL;
+
+-- プロジェクト・最新工程表・工程アイテムを1回の呼び出しで取得する
+-- 戻り値: {"project": {...}, "schedule": {..., "items": [...]} | null}
+--         （プロジェクトが存在しない場合は NULL）
+CREATE OR REPLACE FUNCTION get_latest_schedule_with_items(p_project_id uuid)
+RETURNS json
+LANGUAGE sql
+STABLE
+AS $$
+    -- jsonbへの変換を避け、jsonのまま組み立てる（変換コストが約半分）
+    SELECT json_build_object(
+        'project', row_to_json(p),
+        'schedule', CASE WHEN s.id IS NULL THEN NULL ELSE
+            json_build_object(
+                'id', s.id,
+                'project_id', s.project_id,
+                'version', s.version,
+                'created_at', s.created_at,
+                'items', COALESCE(
+                    (
+                        SELECT json_agg(i ORDER BY i.order_index)
+                        FROM schedule_items i
+                        WHERE i.schedule_id = s.id
+                    ),
+                    '[]'::json
+                )
+            )
+        END
+    )
+    FROM projects p
+    LEFT JOIN project_schedules s ON s.id = p.latest_schedule_id
+    WHERE p.id = p_project_id;
+$$;
+
+-- プロジェクト一覧のカーソル（created_at, id）以降のページを取得する
+-- ORで条件をまとめるとインデックスの範囲検索が使えないため、
+-- created_at あり / NULL（末尾に並ぶ）の2つに分けて UNION ALL する
+-- （p_created_at が NULL の場合は NULL の行の中で id より後ろ）
+CREATE OR REPLACE FUNCTION list_projects_after(
+    p_created_at timestamptz,
+    p_id uuid,
+    p_limit integer
+)
+RETURNS SETOF projects
+LANGUAGE sql
+STABLE
+AS $$
+    (
+        SELECT * FROM projects
+        WHERE p_created_at IS NOT NULL AND (created_at, id) < (p_created_at, p_id)
+        ORDER BY created_at DESC NULLS LAST, id DESC
+        LIMIT p_limit
+    )
+    UNION ALL
+    (
+        SELECT * FROM projects
+        WHERE created_at IS NULL AND (p_created_at IS NOT NULL OR id < p_id)
+        ORDER BY id DESC
+        LIMIT p_limit
+    )
+    ORDER BY created_at DESC NULLS LAST, id DESC
+    LIMIT p_limit;
+$$;
+
+-- ダッシュボード用のプロジェクトごとの進捗集計（最新工程表の工程アイテムのステータス別件数）
+-- 工程表の新バージョン作成時に該当プロジェクトの行だけを更新する
+CREATE TABLE IF NOT EXISTS project_status_summary (
+    project_id uuid PRIMARY KEY REFERENCES projects (id) ON DELETE CASCADE,
+    schedule_id uuid,
+    version integer,
+    status text NOT NULL DEFAULT '未着手',
+    item_count integer NOT NULL DEFAULT 0,
+    in_progress_count integer NOT NULL DEFAULT 0,
+    completed_count integer NOT NULL DEFAULT 0,
+    delayed_count integer NOT NULL DEFAULT 0,
+    updated_at timestamptz NOT NULL DEFAULT now()
+);
+
+-- ステータスごとのプロジェクト数（project_status_summary の変更時に増減する）
+CREATE TABLE IF NOT EXISTS portfolio_status_counts (
+    status text PRIMARY KEY,
+    project_count bigint NOT NULL DEFAULT 0
+);
+
+INSERT INTO portfolio_status_counts (status)
+VALUES ('未着手'), ('進行中'), ('完了'), ('遅延')
+ON CONFLICT (status) DO NOTHING;
+
+-- プロジェクトの進捗集計を最新工程表から再計算する
+-- ステータスの判定はフロントエンドの determineProjectStatus と同じ
+--   アイテムなし → 未着手 / すべて完了 → 完了 / 遅延あり → 遅延 / 進行中あり → 進行中
+CREATE OR REPLACE FUNCTION refresh_project_status(p_project_id uuid)
+RETURNS void
+LANGUAGE sql
+AS $$
+    INSERT INTO project_status_summary AS t (
+        project_id,
+        schedule_id,
+        version,
+        status,
+        item_count,
+        in_progress_count,
+        completed_count,
+        delayed_count,
+        updated_at
+    )
+    SELECT
+        c.project_id,
+        c.schedule_id,
+        c.version,
+        CASE
+            WHEN c.item_count = 0 THEN '未着手'
+            WHEN c.completed_count = c.item_count THEN '完了'
+            WHEN c.delayed_count > 0 THEN '遅延'
+            WHEN c.in_progress_count > 0 THEN '進行中'
+            ELSE '未着手'
+        END,
+        c.item_count,
+        c.in_progress_count,
+        c.completed_count,
+        c.delayed_count,
+        now()
+    FROM (
+        SELECT
+            p.id AS project_id,
+            s.id AS schedule_id,
+            s.version,
+            count(i.id) AS item_count,
+            count(i.id) FILTER (WHERE i.status = '進行中') AS in_progress_count,
+            count(i.id) FILTER (WHERE i.status = '完了') AS completed_count,
+            count(i.id) FILTER (WHERE i.status = '遅延') AS delayed_count
+        FROM projects p
+        LEFT JOIN project_schedules s ON s.id = p.latest_schedule_id
+        LEFT JOIN schedule_items i ON i.schedule_id = s.id
+        WHERE p.id = p_project_id
+        GROUP BY p.id, s.id, s.version
+    ) c
+    ON CONFLICT (project_id) DO UPDATE SET
+        schedule_id = EXCLUDED.schedule_id,
+        version = EXCLUDED.version,
+        status = EXCLUDED.status,
+        item_count = EXCLUDED.item_count,
+        in_progress_count = EXCLUDED.in_progress_count,
+        completed_count = EXCLUDED.completed_count,
+        delayed_count = EXCLUDED.delayed_count,
+        updated_at = EXCLUDED.updated_at;
+$$;
+
+-- ステータスが変わった分だけプロジェクト数を増減する
+CREATE OR REPLACE FUNCTION maintain_portfolio_status_counts()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        IF OLD.status IS NOT DISTINCT FROM NEW.status THEN
+            RETURN NULL;
+        END IF;
+
+        -- 逆向きのステータス変更が並行してもデッドロックしないよう、ステータス順に行をロックする
+        PERFORM 1 FROM portfolio_status_counts
+        WHERE status IN (OLD.status, NEW.status)
+        ORDER BY status
+        FOR UPDATE;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE portfolio_status_counts
+        SET project_count = project_count - 1
+        WHERE status = OLD.status;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO portfolio_status_counts AS c (status, project_count)
+        VALUES (NEW.status, 1)
+        ON CONFLICT (status) DO UPDATE SET project_count = c.project_count + 1;
+    END IF;
+
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE TRIGGER project_status_summary_counts
+    AFTER INSERT OR DELETE OR UPDATE OF status ON project_status_summary
+    FOR EACH ROW EXECUTE FUNCTION maintain_portfolio_status_counts();
+
+-- プロジェクト作成時に未着手として集計に追加する
+CREATE OR REPLACE FUNCTION insert_project_status()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    INSERT INTO project_status_summary (project_id)
+    VALUES (NEW.id)
+    ON CONFLICT (project_id) DO NOTHING;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE TRIGGER projects_status_summary
+    AFTER INSERT ON projects
+    FOR EACH ROW EXECUTE FUNCTION insert_project_status();
+
+-- 既存データの集計を初期化（集計が最新工程表と一致しないプロジェクトのみ）
+DO $$
+BEGIN
+    PERFORM refresh_project_status(p.id)
+    FROM projects p
+    LEFT JOIN project_status_summary t ON t.project_id = p.id
+    WHERE t.project_id IS NULL
+       OR t.schedule_id IS DISTINCT FROM p.latest_schedule_id;
+END $$;
+
+-- ダッシュボードの集計を1回の呼び出しで取得する
+-- 戻り値: {"status_counts": {"未着手": n, ...}, "recent_projects": [...]}
+-- （プロジェクト数に関わらず、ステータス数の行と最近のプロジェクトのみを読む）
+-- plpgsql にするのは件数の値で実行計画を立てるため（SQL関数では LIMIT の件数が
+-- 不明なままの計画になり、プロジェクト全件のソートが選ばれることがある）
+CREATE OR REPLACE FUNCTION get_dashboard_summary(p_recent_limit integer)
+RETURNS json
+LANGUAGE plpgsql
+STABLE
+AS $$
+BEGIN
+    RETURN json_build_object(
+        'status_counts', COALESCE(
+            (
+                SELECT json_object_agg(c.status, c.project_count)
+                FROM portfolio_status_counts c
+                WHERE c.project_count > 0
+            ),
+            '{}'::json
+        ),
+        'recent_projects', COALESCE(
+            (
+                SELECT json_agg(r ORDER BY r.created_at DESC NULLS LAST, r.id DESC)
+                FROM (
+                    SELECT
+                        p.id,
+                        p.project_number,
+                        p.project_name,
+                        p.construction_location,
+                        p.construction_company,
+                        p.created_at,
+                        COALESCE(t.status, '未着手') AS status,
+                        t.version,
+                        COALESCE(t.item_count, 0) AS item_count,
+                        COALESCE(t.in_progress_count, 0) AS in_progress_count,
+                        COALESCE(t.completed_count, 0) AS completed_count,
+                        COALESCE(t.delayed_count, 0) AS delayed_count
+                    FROM projects p
+                    LEFT JOIN project_status_summary t ON t.project_id = p.id
+                    ORDER BY p.created_at DESC NULLS LAST, p.id DESC
+                    LIMIT p_recent_limit
+                ) r
+            ),
+            '[]'::json
+        )
+    );
+END;
+$$;
@@ -7,10 +7,28 @@
 const PDF_SERVICE_URL =
   process.env.NEXT_PUBLIC_PDF_SERVICE_URL || 'http://localhost:8000';
 
+export type PDFPreflightErrorCode =
+  | 'unreadable'
+  | 'encrypted'
+  | 'no_pages'
+  | 'image_only'
+  | 'no_text_layer';
+
 export interface PDFUploadError {
   detail: string;
+  code?: PDFPreflightErrorCode;
 }
 
+// 事前検査で却下された理由ごとのメッセージ
+const PREFLIGHT_ERROR_MESSAGES: Record<PDFPreflightErrorCode, string> = {
+  unreadable: 'PDFファイルとして読み込めませんでした。',
+  encrypted: 'パスワード保護されたPDFは取り込めません。',
+  no_pages: 'PDFにページが含まれていません。',
+  image_only:
+    'スキャン画像のみのPDFは取り込めません。テキストを含むPDFを使用してください。',
+  no_text_layer: 'PDFにテキストが含まれていません。',
+};
+
 export interface PDFUploadResponse {
   status: string;
   schedule_id: string;
@@ -59,7 +77,8 @@ export async function uploadPDF(
       switch (response.status) {
         case 400:
           throw new Error(
-            'ファイル形式が正しくないか、PDF解析に失敗しました。',
+            (errorData.code && PREFLIGHT_ERROR_MESSAGES[errorData.code]) ||
+              'ファイル形式が正しくないか、PDF解析に失敗しました。',
           );
         case 404:
           throw new Error('指定されたプロジェクトが見つかりません。');
@@ -167,10 +186,12 @@ export async function uploadPDFWithProgress(
           }
         } else {
           let errorMessage = 'PDFのアップロードに失敗しました';
+          let errorCode: PDFPreflightErrorCode | undefined;
 
           try {
-            const errorData = JSON.parse(xhr.responseText);
+            const errorData: PDFUploadError = JSON.parse(xhr.responseText);
             errorMessage = errorData.detail || errorMessage;
+            errorCode = errorData.code;
           } catch {
             // JSONパースに失敗した場合はデフォルトメッセージを使用
           }
@@ -178,6 +199,7 @@ export async function uploadPDFWithProgress(
           switch (xhr.status) {
             case 400:
               errorMessage =
+                (errorCode && PREFLIGHT_ERROR_MESSAGES[errorCode]) ||
                 'ファイル形式が正しくないか、PDF解析に失敗しました。';
               break;
             case 404:
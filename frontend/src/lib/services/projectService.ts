@@ -3,7 +3,7 @@ import type { Database } from '@/lib/types/database';
 
 type Project = Database['public']['Tables']['projects']['Row'];
 type ProjectSchedule = Database['public']['Tables']['project_schedules']['Row'];
-type ScheduleItem = Database['public']['Tables']['schedule_items']['Row'];
+type ScheduleItem = Database['public']['Views']['schedule_items']['Row'];
 
 export type ProjectWithSchedules = Project & {
   project_schedules: (ProjectSchedule & {
@@ -70,18 +70,51 @@ export type Database = {
         };
         Relationships: [];
       };
-      schedule_items: {
+      schedule_item_links: {
+        Row: {
+          order_index: number | null;
+          row_id: string;
+          schedule_id: string;
+        };
+        Insert: {
+          order_index?: number | null;
+          row_id: string;
+          schedule_id: string;
+        };
+        Update: {
+          order_index?: number | null;
+          row_id?: string;
+          schedule_id?: string;
+        };
+        Relationships: [
+          {
+            foreignKeyName: 'schedule_item_links_row_id_fkey';
+            columns: ['row_id'];
+            isOneToOne: false;
+            referencedRelation: 'schedule_item_rows';
+            referencedColumns: ['id'];
+          },
+          {
+            foreignKeyName: 'schedule_item_links_schedule_id_fkey';
+            columns: ['schedule_id'];
+            isOneToOne: false;
+            referencedRelation: 'project_schedules';
+            referencedColumns: ['id'];
+          },
+        ];
+      };
+      schedule_item_rows: {
         Row: {
           actual_end_date: string | null;
           actual_start_date: string | null;
           assignee: string | null;
           id: string;
-          order_index: number | null;
           planned_end_date: string | null;
           planned_start_date: string | null;
           process_name: string;
+          project_id: string;
           remarks: string | null;
-          schedule_id: string | null;
+          row_hash: string;
           status: ScheduleStatus | null;
         };
         Insert: {
@@ -89,12 +122,12 @@ export type Database = {
           actual_start_date?: string | null;
           assignee?: string | null;
           id?: string;
-          order_index?: number | null;
           planned_end_date?: string | null;
           planned_start_date?: string | null;
           process_name: string;
+          project_id: string;
           remarks?: string | null;
-          schedule_id?: string | null;
+          row_hash: string;
           status?: ScheduleStatus | null;
         };
         Update: {
@@ -102,27 +135,52 @@ export type Database = {
           actual_start_date?: string | null;
           assignee?: string | null;
           id?: string;
-          order_index?: number | null;
           planned_end_date?: string | null;
           planned_start_date?: string | null;
           process_name?: string;
+          project_id?: string;
           remarks?: string | null;
-          schedule_id?: string | null;
+          row_hash?: string;
           status?: ScheduleStatus | null;
         };
         Relationships: [
           {
-            foreignKeyName: 'schedule_items_schedule_id_fkey';
-            columns: ['schedule_id'];
+            foreignKeyName: 'schedule_item_rows_project_id_fkey';
+            columns: ['project_id'];
             isOneToOne: false;
-            referencedRelation: 'project_schedules';
+            referencedRelation: 'projects';
             referencedColumns: ['id'];
           },
         ];
       };
     };
     Views: {
-      [_ in never]: never;
+      // 工程表ごとの工程アイテム（schedule_item_rows・schedule_item_links のビュー、読み取り専用）
+      // project_schedules からの埋め込みは計算リレーション schedule_items(project_schedules) を使う
+      schedule_items: {
+        Row: {
+          actual_end_date: string | null;
+          actual_start_date: string | null;
+          assignee: string | null;
+          id: string;
+          order_index: number | null;
+          planned_end_date: string | null;
+          planned_start_date: string | null;
+          process_name: string;
+          remarks: string | null;
+          schedule_id: string;
+          status: ScheduleStatus | null;
+        };
+        Relationships: [
+          {
+            foreignKeyName: 'schedule_item_links_schedule_id_fkey';
+            columns: ['schedule_id'];
+            isOneToOne: false;
+            referencedRelation: 'project_schedules';
+            referencedColumns: ['id'];
+          },
+        ];
+      };
     };
     Functions: {
       [_ in never]: never;